@@ -0,0 +1,91 @@
+"""
+Benchmark de decodificación de capturas TRANS.
+
+Compara, sobre la misma región de datos sintética:
+
+  - loop:   struct.unpack_from + convert_row_physical por muestra
+  - plan:   ConversionPlan.convert_row por muestra
+  - vector: ColumnConversion.convert_array (aritmética numpy)
+  - lut:    decode_data_region (gather sobre LUT de 65536 entradas)
+
+Uso:
+    python -m benchmarks.bench_decoder [n_muestras]
+"""
+
+import sys
+import time
+import struct
+
+import numpy as np
+
+from graphtec.io import decoder
+
+ORDER = ["CH1", "CH2", "CH3", "CH4", "Logic", "Alarm"]
+AMP_INFO = {
+    "CH1": {"type": "VT", "input": "DC", "range": "5V"},
+    "CH2": {"type": "VT", "input": "DC", "range": "20MV"},
+    "CH3": {"type": "VT", "input": "TEMP", "range": "TCK"},
+    "CH4": {"type": "VT", "input": "DC", "range": "1-5V"},
+}
+SPANS = {ch: (-10000, 10000) for ch in AMP_INFO}
+MODULE = "GS-4VT"
+
+
+def _synthetic_region(n_samples: int) -> bytes:
+    rng = np.random.default_rng(0)
+    raw = rng.integers(-20000, 20000, size=(n_samples, len(ORDER)), dtype=np.int16)
+    raw[::97, 0] = 0x7ffc  # algunos OverFS
+    return raw.astype(">i2").tobytes()
+
+
+def _timeit(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run(n_samples: int = 200_000) -> dict:
+    data = _synthetic_region(n_samples)
+    n_items = len(ORDER)
+    bps = n_items * 2
+    fmt = f">{n_items}h"
+    plan = decoder.get_conversion_plan(ORDER, AMP_INFO, SPANS, MODULE)
+
+    def loop():
+        for i in range(n_samples):
+            raw_row = struct.unpack_from(fmt, data, i * bps)
+            decoder.convert_row_physical(MODULE, ORDER, raw_row, AMP_INFO, SPANS)
+
+    def plan_rows():
+        for raw_row in struct.iter_unpack(fmt, data):
+            plan.convert_row(raw_row)
+
+    def vector():
+        raw = np.frombuffer(data, dtype=">i2").reshape(n_samples, n_items)
+        for idx, col in enumerate(plan.columns):
+            col.convert_array(raw[:, idx])
+
+    def lut():
+        decoder.decode_data_region(data, ORDER, n_samples, AMP_INFO, SPANS, MODULE, plan=plan)
+
+    lut()  # construir las LUT fuera de la medida
+
+    results = {}
+    for name, fn in (("loop", loop), ("plan", plan_rows), ("vector", vector), ("lut", lut)):
+        elapsed = _timeit(fn)
+        results[name] = {
+            "seconds": elapsed,
+            "samples_per_s": n_samples / elapsed if elapsed else float("inf"),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    base = None
+    for name, res in run(n).items():
+        base = base or res["seconds"]
+        print(
+            f"{name:7s} {res['seconds']:8.3f} s  "
+            f"{res['samples_per_s'] / 1e6:8.2f} Msamples/s  x{base / res['seconds']:.1f}"
+        )
@@ -0,0 +1,99 @@
+"""
+Benchmark de pacing: configuración completa de un GL100 con el antiguo
+sleep(0.1) fijo frente a PacingPolicy.
+
+Simula el puerto serie (tiempo de línea a 38400 baudios + tiempo de
+proceso del equipo en cada consulta) y envía la misma secuencia de
+setters de AMP/TRIG/ALARM, con una consulta de verificación por canal.
+
+Uso:
+    python -m benchmarks.bench_pacing [setter_gap_ms] [latencia_ms]
+"""
+
+import sys
+import time
+
+from graphtec.connection.pacing import PacingPolicy
+from graphtec.connection.serial_connection import SerialConnection
+
+
+class SimSerial:
+    """Puerto serie simulado: tiempo de línea por byte + latencia de respuesta."""
+
+    def __init__(self, baudrate: int = 38400, latency: float = 0.005):
+        self.byte_time = 10 / baudrate  # 8N1
+        self.latency = latency
+        self.last = b""
+
+    def write(self, data: bytes) -> int:
+        time.sleep(len(data) * self.byte_time)
+        self.last = data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def read_until(self, terminator: bytes = b"\r\n") -> bytes:
+        resp = self.last.strip().rstrip(b"?") + b" OK\r\n"
+        time.sleep(self.latency + len(resp) * self.byte_time)
+        return resp
+
+
+def configuration_commands() -> list:
+    """Secuencia típica de configuración (setters + verificación por canal)."""
+    cmds = []
+    for ch in range(1, 5):
+        cmds += [
+            f":AMP:CH{ch}:INP DC",
+            f":AMP:CH{ch}:RANG 5V",
+            f":AMP:CH{ch}:FILT OFF",
+            f":AMP:CH{ch}:CLAMP:MODE OFF",
+            f":ALAR:CH{ch}:MODE OFF",
+            f":ALAR:CH{ch}:UPP 4.5",
+            f":ALAR:CH{ch}:LOW 0.5",
+            f":AMP:CH{ch}:RANG?",
+        ]
+    cmds += [
+        ":TRIG:STAR:SOUR OFF",
+        ":TRIG:STOP:SOUR OFF",
+        ":TRIG:COND:COMB OR",
+        ":DATA:SAMP 100MS",
+        ":DATA:DEST MEM",
+        ":MEAS:TIME?",
+    ]
+    return cmds
+
+
+def push(conn: SerialConnection, cmds: list) -> float:
+    t0 = time.perf_counter()
+    for cmd in cmds:
+        if cmd.endswith("?"):
+            conn.query(cmd)
+        else:
+            conn.send(cmd)
+    return time.perf_counter() - t0
+
+
+def run(setter_gap: float = 0.02, latency: float = 0.005) -> dict:
+    cmds = configuration_commands()
+    results = {}
+    for name, pacing in (
+        ("fixed 100ms", PacingPolicy.fixed(0.1)),
+        ("pacing", PacingPolicy(setter_gap=setter_gap)),
+    ):
+        conn = SerialConnection(pacing=pacing)
+        conn._connection = SimSerial(latency=latency)
+        results[name] = {"seconds": push(conn, cmds), "commands": len(cmds), "stats": pacing.stats()}
+    return results
+
+
+if __name__ == "__main__":
+    gap = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.02
+    lat = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+    base = None
+    for name, res in run(gap, lat).items():
+        base = base or res["seconds"]
+        print(
+            f"{name:12s} {res['seconds']:8.3f} s  x{base / res['seconds']:.2f}  "
+            f"({res['commands']} comandos, {res['stats']['waited_s']:.2f} s de espera)"
+        )
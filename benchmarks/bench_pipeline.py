@@ -0,0 +1,110 @@
+"""
+Benchmark de descarga TRANS: bucle secuencial frente a pipeline.
+
+Simula un enlace con latencia fija por petición y ancho de banda
+limitado (las esperas liberan el GIL como lo haría el puerto serie) y
+descarga el mismo archivo a .bin + .csv en los dos modos.
+
+Uso:
+    python -m benchmarks.bench_pipeline [n_muestras] [latencia_ms] [kbytes_s]
+"""
+
+import sys
+import time
+import struct
+import tempfile
+
+import numpy as np
+
+from graphtec.io.capture import GraphtecCapture
+
+ORDER = ["CH1", "CH2", "CH3", "CH4", "Logic", "Alarm"]
+CHUNK_SAMPLES = 1000
+
+
+def _header(n_samples: int) -> bytes:
+    return (
+        "$Header\r\n"
+        "HeaderSiz  = 2048\r\n"
+        "$$Data\r\n"
+        f"Order      = {', '.join(ORDER)}\r\n"
+        f"Counts     = {n_samples}\r\n"
+        "Sample     = 10ms\r\n"
+        "Start      = 2024-01-01, 00:00:00\r\n"
+        "$Amp\r\n"
+        "CH1        = VT   , DC   ,       5V, Off   ,    Off,      +0\r\n"
+        "CH2        = VT   , DC   ,     20MV, Off   ,    Off,      +0\r\n"
+        "CH3        = VT   , TEMP ,      TCK, Off   ,    Off,      +0\r\n"
+        "CH4        = VT   , DC   ,     1-5V, Off   ,    Off,      +0\r\n"
+        "UnitOrder  = 4VT\r\n"
+        "$EndHeader\r\n"
+    ).encode("ascii")
+
+
+class LinkConnection:
+    """Conexión simulada: latency por petición + bytes / bandwidth."""
+
+    def __init__(self, data: bytes, latency: float, bandwidth: float):
+        self.data = data
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.head = _header(len(data) // (len(ORDER) * 2))
+        self.range = (1, 1)
+
+    def send(self, command: str) -> None:
+        if command.startswith(":TRANS:OUTP:DATA "):
+            first, last = (int(x) for x in command.split()[-1].split(","))
+            self.range = (first, last)
+
+    def query(self, command: str) -> bytes:
+        if command == ":TRANS:OPEN?":
+            return b"\x00\x00\x00"
+        if command == ":TRANS:OUTP:HEAD?":
+            return b"#6%06d" % len(self.head) + self.head
+        if command == ":TRANS:OUTP:DATA?":
+            bps = len(ORDER) * 2
+            first, last = self.range
+            payload = self.data[(first - 1) * bps:last * bps]
+            time.sleep(self.latency + len(payload) / self.bandwidth)
+            body = b"\x00\x00" + payload + struct.pack(">H", sum(payload) & 0xFFFF)
+            return b"#6%06d" % (len(body) - 4) + body
+        return b""
+
+    def read_ascii(self) -> str:
+        return "OK"
+
+
+def run(n_samples: int = 50_000, latency: float = 0.02, bandwidth: float = 1e6) -> dict:
+    rng = np.random.default_rng(0)
+    data = rng.integers(-20000, 20000, size=(n_samples, len(ORDER)), dtype=np.int16)
+    data = data.astype(">i2").tobytes()
+
+    results = {}
+    for name, pipeline in (("sequential", False), ("pipeline", True)):
+        cap = GraphtecCapture(
+            LinkConnection(data, latency, bandwidth),
+            chunk_samples=CHUNK_SAMPLES,
+            pipeline=pipeline,
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            cap.download("TEST.GBD", tmp, formats=("csv",))
+            elapsed = time.perf_counter() - t0
+        results[name] = {"seconds": elapsed, "stats": cap.last_stats}
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    lat = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+    bw = float(sys.argv[3]) * 1000 if len(sys.argv) > 3 else 1e6
+    base = None
+    for name, res in run(n, lat, bw).items():
+        base = base or res["seconds"]
+        extra = ""
+        if res["stats"].get("pipelined"):
+            extra = (
+                f"  (lector esperando {res['stats']['reader_wait_s']:.2f} s, "
+                f"escritores esperando {res['stats']['consumer_wait_s']:.2f} s)"
+            )
+        print(f"{name:10s} {res['seconds']:8.3f} s  x{base / res['seconds']:.2f}{extra}")
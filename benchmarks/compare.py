@@ -0,0 +1,52 @@
+"""
+Compara dos ejecuciones de la suite de benchmarks (JSON de conftest.py).
+
+Uso:
+    python -m benchmarks.compare base.json nuevo.json [--threshold 0.10]
+
+Muestra, por etapa/módulo/tamaño, la relación de muestras/s (nuevo/base)
+y termina con código 1 si alguna etapa cae más de --threshold.
+"""
+
+import sys
+import json
+import argparse
+from typing import Dict, Tuple
+
+
+def _load(path: str) -> Dict[Tuple[str, str, int], dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["stage"], r["module"], r["samples"]): r for r in report["results"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="caída relativa tolerada (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    base, new = _load(args.base), _load(args.new)
+    regressions = 0
+    print(f"{'etapa':22s} {'módulo':7s} {'muestras':>9s} {'base/s':>12s} {'nuevo/s':>12s} {'ratio':>7s}")
+    for key in sorted(base.keys() & new.keys()):
+        b, n = base[key]["samples_per_s"], new[key]["samples_per_s"]
+        if not b or not n:
+            continue
+        ratio = n / b
+        flag = ""
+        if ratio < 1.0 - args.threshold:
+            regressions += 1
+            flag = "  <-- regresión"
+        stage, module, samples = key
+        print(f"{stage:22s} {module:7s} {samples:9d} {b:12,.0f} {n:12,.0f} {ratio:7.2f}{flag}")
+
+    missing = sorted(base.keys() ^ new.keys())
+    if missing:
+        print(f"{len(missing)} casos solo en una de las ejecuciones")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
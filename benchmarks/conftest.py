@@ -0,0 +1,189 @@
+"""
+Suite de benchmarks de las rutas calientes (pytest, sin hardware).
+
+    pytest benchmarks
+    pytest benchmarks --bench-sizes 1k,1M,10M --bench-modules 4VT,TH
+    pytest benchmarks --bench-json base.json --bench-no-memory
+
+Cada prueba se parametriza por módulo (4VT, TH, 3AT, LXUV, CO2, DPA-AC)
+y tamaño, sobre una captura sintética de graphtec.sim (SimFile.for_module,
+con códigos especiales). Cada etapa se ejecuta una vez para medir el
+tiempo y otra con tracemalloc para el pico de memoria.
+
+Los resultados (muestras/s, MB/s de región de datos, pico en MB) se
+muestran al final y se guardan en JSON (por defecto
+benchmarks/results/bench-<fecha>.json); python -m benchmarks.compare
+compara dos ejecuciones.
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+from graphtec.io.capture import GraphtecCapture
+from graphtec.sim.device import MODULE_PRESETS, SimFile
+
+DEFAULT_SIZES = "1k,10k"
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+_RESULTS = pytest.StashKey["BenchRecorder"]()
+
+
+def parse_size(text: str) -> int:
+    """'1k' → 1000, '10M' → 10_000_000, '2500' → 2500."""
+    text = text.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if mult > 1 else text) * mult)
+
+
+def size_label(n: int) -> str:
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("graphtec-bench", "benchmarks de graphtec")
+    group.addoption("--bench-sizes", default=DEFAULT_SIZES, help="muestras por captura (ej. 1k,100k,1M,10M)")
+    group.addoption("--bench-modules", default=",".join(MODULE_PRESETS), help="módulos (ej. 4VT,TH)")
+    group.addoption("--bench-json", default=None, help="archivo JSON de resultados")
+    group.addoption("--bench-no-memory", action="store_true", help="no medir el pico de memoria")
+
+
+def pytest_configure(config):
+    config.stash[_RESULTS] = BenchRecorder(memory=not config.getoption("--bench-no-memory"))
+
+
+def pytest_generate_tests(metafunc):
+    if "case" not in metafunc.fixturenames:
+        return
+    sizes = [parse_size(s) for s in metafunc.config.getoption("--bench-sizes").split(",") if s.strip()]
+    modules = [m.strip().upper() for m in metafunc.config.getoption("--bench-modules").split(",") if m.strip()]
+    cases = [(m, n) for n in sizes for m in modules]
+    metafunc.parametrize(
+        "case",
+        cases,
+        ids=[f"{m}-{size_label(n)}" for m, n in cases],
+        indirect=True,
+        scope="session",
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _quiet_logging():
+    """El log DEBUG de pytest.ini no debe entrar en las medidas."""
+    logger = logging.getLogger("graphtec")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    yield
+    logger.setLevel(level)
+
+
+@pytest.fixture(scope="session")
+def case(request):
+    """Captura sintética: datos crudos + metadatos del header."""
+    module, n = request.param
+    f = SimFile.for_module(module, counts=n, special_every=97)
+    data = f.rows(0, n)
+    return SimpleNamespace(
+        module=module,
+        samples=n,
+        data=data,
+        meta=GraphtecCapture._parse_header(f.header()),
+    )
+
+
+@pytest.fixture
+def bench(request) -> "BenchRecorder":
+    return request.config.stash[_RESULTS]
+
+
+class BenchRecorder:
+    """Mide etapas y acumula los resultados de la sesión."""
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.results: List[Dict[str, Any]] = []
+
+    def measure(self, stage: str, case, fn: Callable[[], Any]) -> Any:
+        """Ejecuta fn (tiempo y, si procede, pico de memoria) y guarda el resultado."""
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn()
+        seconds = time.perf_counter() - t0
+
+        peak: Optional[int] = None
+        if self.memory:
+            del out
+            gc.collect()
+            tracemalloc.start()
+            try:
+                out = fn()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        n_bytes = len(case.data)
+        self.results.append({
+            "stage": stage,
+            "module": case.module,
+            "samples": case.samples,
+            "bytes": n_bytes,
+            "seconds": seconds,
+            "samples_per_s": case.samples / seconds if seconds else None,
+            "mb_per_s": n_bytes / 1e6 / seconds if seconds else None,
+            "peak_mb": None if peak is None else peak / 1e6,
+        })
+        return out
+
+    def report(self) -> Dict[str, Any]:
+        try:
+            import numpy  # noqa: F401
+            has_numpy = True
+        except ImportError:
+            has_numpy = False
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": has_numpy,
+            "results": self.results,
+        }
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config.stash.get(_RESULTS, None)
+    if recorder is None or not recorder.results:
+        return
+
+    tr = terminalreporter
+    tr.section("graphtec benchmarks")
+    tr.write_line(f"{'etapa':22s} {'módulo':7s} {'muestras':>9s} {'muestras/s':>12s} {'MB/s':>8s} {'pico MB':>8s}")
+    for r in recorder.results:
+        peak = "-" if r["peak_mb"] is None else f"{r['peak_mb']:.1f}"
+        rate = r["samples_per_s"] or float("inf")
+        mbs = r["mb_per_s"] or float("inf")
+        tr.write_line(
+            f"{r['stage']:22s} {r['module']:7s} {size_label(r['samples']):>9s} "
+            f"{rate:12,.0f} {mbs:8.2f} {peak:>8s}"
+        )
+
+    path = config.getoption("--bench-json")
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recorder.report(), f, indent=2)
+    tr.write_line(f"resultados guardados en {path}")
@@ -0,0 +1,62 @@
+"""
+Benchmarks de las rutas calientes de decodificación y exportación.
+
+Una prueba por etapa; la parametrización (módulo × tamaño) y la medida
+las aporta conftest.py.
+"""
+
+import struct
+
+import pytest
+
+from graphtec.io.capture import GraphtecCapture
+from graphtec.io.decoder import convert_row_physical
+
+# Límite de filas de una hoja xlsx (más la fila de cabecera)
+EXCEL_MAX_ROWS = 1_048_575
+
+
+@pytest.fixture(scope="module")
+def capture():
+    return GraphtecCapture(None)
+
+
+def _table_args(case):
+    m = case.meta
+    return (m["order"], case.samples, m["start_dt"], m["sample_delta"], m["amp_info"], m["spans"], m["module"])
+
+
+def test_convert_row_physical(case, bench):
+    m = case.meta
+    row = struct.Struct(f">{len(m['order'])}h")
+
+    def run():
+        n = 0
+        for raw_row in row.iter_unpack(case.data):
+            convert_row_physical(m["module"], m["order"], raw_row, m["amp_info"], m["spans"], plan=m["plan"])
+            n += 1
+        return n
+
+    assert bench.measure("convert_row_physical", case, run) == case.samples
+
+
+def test_decode_to_table(case, bench, capture):
+    timestamps, columns, rows = bench.measure(
+        "_decode_to_table", case, lambda: capture._decode_to_table(case.data, *_table_args(case))
+    )
+    assert len(rows) == len(timestamps) == case.samples
+    assert len(columns) == len(case.meta["order"])
+
+
+def test_data_to_csv(case, bench, capture, tmp_path):
+    path = str(tmp_path / "bench.csv")
+    bench.measure("_data_to_csv", case, lambda: capture._data_to_csv(case.data, path, *_table_args(case)))
+    with open(path, "rb") as f:
+        assert sum(1 for _ in f) == case.samples + 1
+
+
+def test_data_to_excel(case, bench, capture, tmp_path):
+    if case.samples > EXCEL_MAX_ROWS:
+        pytest.skip("xlsx admite como máximo 1.048.576 filas")
+    path = str(tmp_path / "bench.xlsx")
+    bench.measure("_data_to_excel", case, lambda: capture._data_to_excel(case.data, path, *_table_args(case)))
@@ -7,7 +7,8 @@ en tiempo real, descarga de capturas y gestión de archivos.
 """
 
 from graphtec.api.public import Graphtec
+from graphtec.api.async_public import AsyncGraphtec
 from graphtec.utils import setup_logging
 
 __version__ = "0.1.0"
-__all__ = ["Graphtec","setup_logging"]
+__all__ = ["Graphtec","AsyncGraphtec","setup_logging"]
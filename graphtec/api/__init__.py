@@ -3,7 +3,8 @@ API pública de la librería Graphtec
 ================================
 
 Este módulo expone la clase principal 'Graphtec', que permite controlar
-el registrador de datos Graphtec mediante USB o LAN.
+el registrador de datos Graphtec mediante USB o LAN, y su variante
+asyncio 'AsyncGraphtec' para atender varios equipos desde un solo bucle.
 
 Ejemplo de uso:
     from graphtec import Graphtec
@@ -17,5 +18,6 @@ Ejemplo de uso:
 """
 
 from graphtec.api.public import Graphtec
+from graphtec.api.async_public import AsyncGraphtec
 
-__all__ = ["Graphtec"]
+__all__ = ["Graphtec", "AsyncGraphtec"]
@@ -0,0 +1,147 @@
+"""
+API pública asyncio del GL100.
+
+Misma idea que Graphtec, pero con métodos awaitables sobre un transporte
+asyncio, para que un solo bucle de eventos pueda atender muchos equipos:
+
+    import asyncio
+    from graphtec.api.async_public import AsyncGraphtec
+
+    async def main():
+        devices = [AsyncGraphtec("lan", address=ip) for ip in IPS]
+        for gl in devices:
+            await gl.connect()
+        lecturas = await asyncio.gather(*(gl.read_measurement() for gl in devices))
+
+    asyncio.run(main())
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from graphtec.connection import AsyncGraphtecConnection
+from graphtec.core.commands import COMMON, MEAS
+from graphtec.io.async_capture import AsyncGraphtecCapture
+from graphtec.io.capture import DEFAULT_FORMATS
+from graphtec.io.protocol import channels_steps, run_steps_async
+from graphtec.io.realtime import ChannelSnapshot, GraphtecRealtime
+from graphtec.utils.utils import to_str
+import logging
+logger = logging.getLogger(__name__)
+
+
+class AsyncGraphtec:
+    """
+    Fachada asyncio: conexión, configuración de canales, lectura en tiempo
+    real, listado y descarga de capturas.
+    """
+
+    # =========================================================
+    # Inicialización
+    # =========================================================
+    def __init__(self, connection_type="usb", **kwargs):
+        """
+        Args:
+            connection_type (str): "usb" o "lan" (mismos alias que Graphtec).
+            **kwargs: Parámetros del transporte (port, baudrate... / address, tcp_port...).
+                chunk_samples, chunk_bytes y target_rtt se pasan a la descarga.
+        """
+        capture_kwargs = {
+            key: kwargs.pop(key) for key in ("chunk_samples", "chunk_bytes", "target_rtt") if key in kwargs
+        }
+        self.conn_type = connection_type
+        self.conn = AsyncGraphtecConnection(conn_type=connection_type, **kwargs)
+        self.capture = AsyncGraphtecCapture(self.conn, **capture_kwargs)
+
+        self._amp = ChannelSnapshot()
+        self._snapshot_valid = False
+        # Solo se usa su layout compilado y el decodificador canal a canal
+        self.realtime = GraphtecRealtime(SimpleNamespace(amp=self._amp, measure=None))
+        self.connected = False
+
+    # =========================================================
+    # CONEXIÓN
+    # =========================================================
+    async def connect(self):
+        """Abre la conexión con el GL100."""
+        await self.conn.open()
+        self.connected = True
+        logger.info(f"[AsyncGraphtec] Conectado vía {self.conn_type.upper()}")
+
+    async def disconnect(self):
+        """Cierra la conexión con el GL100."""
+        if not self.connected:
+            logger.warning("[AsyncGraphtec] Desconexión ignorada: no hay conexión activa.")
+            return
+        await self.conn.close()
+        self.connected = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.disconnect()
+
+    # =========================================================
+    # Funcionalidades comunes
+    # =========================================================
+    async def get_id(self) -> str:
+        """Devuelve el ID del dispositivo."""
+        return to_str(await self.conn.query(COMMON.GET_IDN))
+
+    # =========================================================
+    # Configuración de canales
+    # =========================================================
+    async def get_channels(self, refresh: bool = False) -> Dict[int, Dict[str, str]]:
+        """
+        Configuración de los canales. Como AmpModule.get_channels, solo
+        consulta al equipo la primera vez o con refresh=True.
+        """
+        if refresh or not self._snapshot_valid:
+            self._amp.update(await run_steps_async(self.conn, channels_steps()))
+            self._snapshot_valid = True
+        return self._amp.channels
+
+    async def refresh_channels(self) -> Dict[int, Dict[str, str]]:
+        """Relee del equipo la configuración de los canales."""
+        return await self.get_channels(refresh=True)
+
+    # =========================================================
+    # Lectura en tiempo real
+    # =========================================================
+    async def start_measurement(self):
+        await self.conn.send(MEAS.START_MEASUREMENT)
+
+    async def stop_measurement(self):
+        await self.conn.send(MEAS.STOP_MEASUREMENT)
+
+    async def read_measurement(self) -> Dict[str, Any]:
+        """Lee una muestra :MEAS:OUTP:ONE? y la decodifica (igual que Graphtec.read_measurement)."""
+        channels = await self.get_channels()
+        payload = self.realtime.strip_prefix(await self.conn.query(MEAS.READ_ONCE))
+        if not payload:
+            logger.warning("[AsyncGraphtec] No se recibió ningún dato.")
+            return {}
+
+        return self.realtime.decode_payload(payload, channels)
+
+    # =========================================================
+    # Gestión de archivos de captura de datos
+    # =========================================================
+    async def list_files(self, path: str = "\\MEM\\LOG\\", long: bool = True, filt: str = "OFF") -> List[str]:
+        """Lista los archivos de captura almacenados en el dispositivo."""
+        return await self.capture.list_files(path=path, long=long, filt=filt)
+
+    async def download(self, path_in_gl: str, dest_folder: str, formats=None) -> Optional[Dict[str, str]]:
+        """Descarga un archivo una sola vez y genera varios formatos (por defecto todos)."""
+        return await self.capture.download(path_in_gl, dest_folder, formats=formats or DEFAULT_FORMATS)
+
+    async def download_file(self, path_in_gl: str, dest_folder: str):
+        return await self.capture.download_file(path_in_gl, dest_folder)
+
+    async def download_csv(self, path_in_gl: str, dest_folder: str):
+        return await self.capture.download_csv(path_in_gl, dest_folder)
+
+    async def download_excel(self, path_in_gl: str, dest_folder: str):
+        return await self.capture.download_excel(path_in_gl, dest_folder)
@@ -99,10 +99,15 @@ class Graphtec:
     # Configuración y gestión de canales
     # =========================================================
     def get_channels(self):
-        """Devuelve la configuración de los canales."""
+        """Devuelve la configuración de los canales (guardada; ver refresh_channels)."""
         logger.info("[Graphtec] Consulta de configuración de canales.")
         return self.device.amp.get_channels()
 
+    def refresh_channels(self):
+        """Relee del equipo la configuración de los canales (p. ej. tras cambiarla desde el panel)."""
+        logger.info("[Graphtec] Relectura de configuración de canales.")
+        return self.device.amp.refresh()
+
     def set_channel(self, channel: int, ch_input:str="", ch_range:str=""):
         """
         Configura el tipo de un canal.\n
@@ -139,9 +144,8 @@ class Graphtec:
 
     def set_channels(self,ch_input:str="", ch_range:str=""):
         """Configura todos los canales con los mismos parámetros."""
-        for ch in range(1, 5):
-            self.set_channel(channel=ch, ch_input=ch_input, ch_range=ch_range)
         logger.info(f"[Graphtec] Configuración de todos los canales: INPUT={ch_input}, RANGE={ch_range}")
+        return self.device.amp.set_channels(ch_input=ch_input, ch_range=ch_range)
 
     def set_clamp(self, channel: int, mode: str|None=None, voltage: int|None=None, power_factor: float|None=None):
         """
@@ -547,6 +551,34 @@ class Graphtec:
         logger.info("[Graphtec] Parada de medición en tiempo real.")
         return self.device.measure.stop_measurement()
 
+    def poll_measurement(self, interval: float, count: int | None = None):
+        """Lecturas periódicas a frecuencia fija, sin deriva.
+
+        Args:
+            interval (float): Periodo de muestreo en segundos.
+            count (int | None): Número de muestras (None = indefinido).
+
+        Returns:
+            Generador de (timestamp, datos); el timestamp es el punto medio de la consulta.
+        """
+        logger.info(f"[Graphtec] Lectura periódica cada {interval} s.")
+        return self.realtime.poll(interval, count=count)
+
+    def stream(self, capacity: int = 100_000, interval: float = 0.0):
+        """Adquisición continua en segundo plano con buffer circular (requiere numpy).
+
+        Args:
+            capacity (int): Muestras que guarda el buffer circular.
+            interval (float): Periodo de muestreo en segundos (0 = tan rápido como se pueda).
+
+        Uso:
+            with gl.stream() as s:
+                ts, values = s.drain()
+        """
+        from graphtec.io.stream import RealtimeStream
+        logger.info(f"[Graphtec] Stream en tiempo real (capacidad {capacity}).")
+        return RealtimeStream(self.realtime, capacity=capacity, interval=interval)
+
     # =========================================================
     # Gestión de archivos de captura de datos
     # =========================================================
@@ -555,6 +587,51 @@ class Graphtec:
         logger.info(f"[Graphtec] Listado de archivos en: {path}")
         return self.capture.list_files(path=path,long=long, filt=filt)
 
+    def download(
+        self,
+        path_in_gl: str,
+        dest_folder: str,
+        formats=None,
+        resume: bool = False,
+        checkpoint: bool = False,
+    ):
+        """Descarga un archivo de captura una sola vez y genera varios formatos.
+
+        Args:
+            path_in_gl (str): Ruta del archivo en el dispositivo.
+            dest_folder (str): Carpeta local destino.
+            formats (tuple): "gbd", "csv", "xlsx", "parquet". Por defecto todos.
+            resume (bool): Reanudar una descarga interrumpida desde su checkpoint.
+            checkpoint (bool): Guardar checkpoint (.ckpt) para poder reanudarla.
+        """
+        logger.info(f"[Graphtec] Descarga de archivo desde: {path_in_gl} a {dest_folder} ({formats or 'todos'})")
+        if formats is None:
+            return self.capture.download(path_in_gl, dest_folder, resume=resume, checkpoint=checkpoint)
+        return self.capture.download(path_in_gl, dest_folder, formats=formats, resume=resume, checkpoint=checkpoint)
+
+    def sync(self, path_in_gl: str, dest_folder: str, formats=("csv",)):
+        """Actualiza la copia local de un archivo que sigue creciendo (solo muestras nuevas).
+
+        Args:
+            path_in_gl (str): Ruta del archivo en el dispositivo (p. ej. get_data_filepath()).
+            dest_folder (str): Carpeta local destino (la misma en cada llamada).
+            formats (tuple): "gbd", "csv", "xlsx", "parquet".
+        """
+        logger.info(f"[Graphtec] Sincronizando {path_in_gl} en {dest_folder}")
+        return self.capture.sync(path_in_gl, dest_folder, formats=formats)
+
+    def export_local(self, source: str, formats=None):
+        """Regenera formatos desde un .hdr/.bin ya descargado (sin usar el dispositivo).
+
+        Args:
+            source (str): Ruta al .hdr, al .bin o a su carpeta.
+            formats (tuple): "gbd", "csv", "xlsx", "parquet". Por defecto todos.
+        """
+        logger.info(f"[Graphtec] Regeneración local desde: {source} ({formats or 'todos'})")
+        if formats is None:
+            return self.capture.export_local(source)
+        return self.capture.export_local(source, formats=formats)
+
     def download_file(self, path_in_gl: str, dest_folder: str):
         """Descarga un archivo de captura desde el dispositivo.
 
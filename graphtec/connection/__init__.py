@@ -24,3 +24,23 @@ def GraphtecConnection(conn_type="usb", **kwargs):
         return WLANConnection(**kwargs)
     else:
         raise ValueError(f"Tipo de conexión no reconocido: {conn_type}")
+
+
+def AsyncGraphtecConnection(conn_type="usb", **kwargs):
+    """
+    Igual que GraphtecConnection, pero devuelve un transporte asyncio
+    (graphtec.connection.async_connection).
+    """
+    from graphtec.connection.async_connection import AsyncSerialConnection, AsyncWLANConnection
+
+    conn_type = conn_type.lower().strip()
+
+    usb_aliases = ["usb", "serial", "com", "uart","serie"]
+    lan_aliases = ["wlan","lan", "ethernet", "net", "tcp", "ip", "wifi"]
+
+    if conn_type in usb_aliases:
+        return AsyncSerialConnection(**kwargs)
+    elif conn_type in lan_aliases:
+        return AsyncWLANConnection(**kwargs)
+    else:
+        raise ValueError(f"Tipo de conexión no reconocido: {conn_type}")
@@ -0,0 +1,132 @@
+"""
+Serialización de comandos con prioridades.
+
+El GL100 es petición/respuesta sobre un único canal: si dos hilos
+intercalan send()/query() (p. ej. una consulta de estado durante una
+descarga TRANS) los bytes de ambas respuestas se mezclan. Cada
+conexión síncrona tiene un CommandArbiter y todas sus operaciones se
+hacen dentro de una transacción:
+
+    with conn.transaction(PRIORITY_BULK):
+        conn.send(":TRANS:OUTP:DATA 1,100")
+        block = conn.query(":TRANS:OUTP:DATA?")
+
+Cuando la conexión queda libre entra el hilo en espera de mayor
+prioridad (FIFO dentro de la misma clase). Así un sondeo en tiempo real
+se cuela entre dos fragmentos de una descarga en lugar de esperar a
+que termine. La transacción es reentrante en el mismo hilo (query()
+llama a send() dentro de la suya).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from graphtec.core.exceptions import TimeoutError
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CommandArbiter",
+    "PRIORITY_REALTIME",
+    "PRIORITY_NORMAL",
+    "PRIORITY_BULK",
+    "transaction",
+]
+
+# Clases de prioridad (menor = antes)
+PRIORITY_REALTIME = 0   # :MEAS:OUTP:ONE? y demás lecturas en vivo
+PRIORITY_NORMAL = 1     # configuración / estado (por defecto)
+PRIORITY_BULK = 2       # descargas TRANS
+
+PRIORITY_NAMES = {PRIORITY_REALTIME: "realtime", PRIORITY_NORMAL: "normal", PRIORITY_BULK: "bulk"}
+
+
+class CommandArbiter:
+    """Cerrojo reentrante que cede el turno por prioridad."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self._waiting: List[Tuple[int, int]] = []  # heap de (prioridad, turno)
+        self._seq = itertools.count()
+        self._grants: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self._max_wait: Dict[int, float] = {p: 0.0 for p in PRIORITY_NAMES}
+
+    def acquire(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> bool:
+        """Espera el turno (True) o agota 'timeout' (False)."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                return True
+
+            t0 = time.monotonic()
+            if self._owner is not None or self._waiting:
+                ticket = (priority, next(self._seq))
+                heapq.heappush(self._waiting, ticket)
+                ok = self._cond.wait_for(
+                    lambda: self._owner is None and self._waiting[0] == ticket, timeout
+                )
+                if not ok:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                    return False
+                heapq.heappop(self._waiting)
+
+            self._owner = me
+            self._depth = 1
+            if priority in self._grants:
+                self._grants[priority] += 1
+                self._max_wait[priority] = max(self._max_wait[priority], time.monotonic() - t0)
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("CommandArbiter liberado por un hilo que no lo tiene")
+            self._depth -= 1
+            if not self._depth:
+                self._owner = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def transaction(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> Iterator[None]:
+        """Bloque de comandos que no se intercala con otros hilos."""
+        if not self.acquire(priority, timeout):
+            raise TimeoutError(
+                f"[CommandArbiter] Conexión ocupada más de {timeout}s "
+                f"(prioridad {PRIORITY_NAMES.get(priority, priority)})"
+            )
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def waiting(self) -> int:
+        """Hilos esperando turno."""
+        with self._cond:
+            return len(self._waiting)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "waiting": len(self._waiting),
+                "grants": {PRIORITY_NAMES[p]: n for p, n in self._grants.items()},
+                "max_wait_s": {PRIORITY_NAMES[p]: w for p, w in self._max_wait.items()},
+            }
+
+
+def transaction(conn: Any, priority: int = PRIORITY_NORMAL):
+    """
+    conn.transaction(priority) si la conexión lo soporta; si no (mocks,
+    conexiones de terceros) un contexto vacío.
+    """
+    tx = getattr(conn, "transaction", None)
+    return tx(priority) if tx is not None else nullcontext()
@@ -0,0 +1,264 @@
+"""
+Transportes asyncio para el GL100.
+
+Mismo contrato de query() que SerialConnection (según response_kind):
+
+  - '#6******' + DATA               (:MEAS:OUTP, :TRANS:OUTP:HEAD?)
+  - '#6******' + STATUS + DATA + SUM (:TRANS:OUTP:DATA?)
+  - 3 bytes                          (:TRANS:OPEN?)
+  - línea ASCII terminada en CRLF    (resto)
+
+pero sobre asyncio.StreamReader/StreamWriter, de modo que un único
+bucle de eventos puede atender muchos equipos sin un hilo por equipo.
+
+  - AsyncWLANConnection: TCP (asyncio.open_connection).
+  - AsyncSerialConnection: puerto serie, requiere pyserial-asyncio
+    (opcional: pip install pyserial-asyncio).
+
+Cada conexión serializa sus consultas con un asyncio.Lock: varias
+corrutinas pueden compartirla sin mezclar respuestas.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from graphtec.connection.base import (
+    REPLY_BLOCK,
+    REPLY_OPEN,
+    REPLY_TRANS_DATA,
+    response_kind,
+)
+from graphtec.core.exceptions import ConnectionError, DataError, DisconnectedError, TimeoutError
+
+try:
+    import serial_asyncio
+    HAS_SERIAL_ASYNCIO = True
+except ImportError:  # pyserial-asyncio es opcional
+    serial_asyncio = None
+    HAS_SERIAL_ASYNCIO = False
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima por bytes pendientes al vaciar la entrada (flush_buffer)
+_FLUSH_POLL_S = 0.02
+
+__all__ = ["AsyncStreamConnection", "AsyncSerialConnection", "AsyncWLANConnection", "HAS_SERIAL_ASYNCIO"]
+
+
+class AsyncStreamConnection:
+    """
+    Base común: envío de comandos y lectura de respuestas enmarcadas sobre
+    un par StreamReader/StreamWriter. Las subclases solo implementan
+    _open_streams().
+    """
+
+    name = "AsyncConnection"
+
+    def __init__(self, timeout: float = 3):
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    # =========================================================
+    # Abrir/Cerrar Conexión
+    # =========================================================
+    async def _open_streams(self):
+        raise NotImplementedError
+
+    async def open(self):
+        self._reader, self._writer = await self._open_streams()
+        self._lock = asyncio.Lock()
+
+    async def close(self):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+                try:
+                    await self._writer.wait_closed()
+                except Exception:
+                    pass
+                logger.info(f"[{self.name}] Conexión cerrada")
+            finally:
+                self._reader = self._writer = None
+
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # =========================================================
+    # Envío / lectura
+    # =========================================================
+    def _require_open(self):
+        if self._reader is None or self._writer is None:
+            raise ConnectionError(f"[{self.name}] Conexión no abierta")
+
+    async def _read(self, awaitable, truncated: str = ""):
+        """
+        Lectura con timeout y errores de graphtec:
+          - timeout                    → TimeoutError
+          - fin de línea (EOF)         → DisconnectedError, o DataError si
+                                         'truncated' (bloque a medias)
+          - ruido sin separador        → DataError (LimitOverrunError)
+        """
+        try:
+            return await asyncio.wait_for(awaitable, self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"[{self.name}] Timeout esperando respuesta") from None
+        except asyncio.IncompleteReadError as e:
+            got = f"esperados {e.expected} bytes, recibidos {len(e.partial)}"
+            if truncated:
+                raise DataError(f"[{self.name}] {truncated}: {got}.") from None
+            raise DisconnectedError(f"[{self.name}] Conexión cerrada por el equipo ({got})") from None
+        except asyncio.LimitOverrunError as e:
+            raise DataError(f"[{self.name}] Respuesta sin separador tras {e.consumed} bytes") from None
+
+    async def _write(self, command: bytes | str):
+        # Asegurar que los comandos terminen en CRLF.
+        if isinstance(command, str):
+            command = command.encode()
+        if not command.endswith(b"\r\n"):
+            command += b"\r\n"
+        self._writer.write(command)
+        await self._writer.drain()
+        logger.debug(f"[{self.name}] << {command}")
+
+    async def send(self, command: bytes | str):
+        """Envía un comando sin esperar respuesta."""
+        self._require_open()
+        async with self._lock:
+            await self._write(command)
+
+    async def query(self, command: bytes | str) -> bytes:
+        """Envía un comando y devuelve su respuesta completa (ver response_kind)."""
+        self._require_open()
+        async with self._lock:
+            await self._write(command)
+            kind = response_kind(command)
+
+            if kind == REPLY_BLOCK:
+                return await self._read_block(extra=0)
+            if kind == REPLY_TRANS_DATA:
+                return await self._read_block(extra=4)
+            if kind == REPLY_OPEN:
+                resp = await self._read(self._reader.readexactly(3))
+                logger.debug(f"[{self.name}] >> {resp}")
+                return resp
+
+            resp = await self._read(self._reader.readuntil(b"\r\n"))
+            logger.debug(f"[{self.name}] >> {resp}")
+            return resp
+
+    async def flush_buffer(self):
+        """Descarta lo ya recibido (restos de una respuesta abandonada)."""
+        self._require_open()
+        async with self._lock:
+            discarded = 0
+            try:
+                while True:
+                    data = await asyncio.wait_for(self._reader.read(4096), _FLUSH_POLL_S)
+                    if not data:
+                        break
+                    discarded += len(data)
+            except asyncio.TimeoutError:
+                pass
+            if discarded:
+                logger.debug(f"[{self.name}] Descartados {discarded} bytes pendientes")
+
+    async def _read_block(self, extra: int) -> bytes:
+        """
+        Lee '#6******' + DATA(N) + extra bytes. Un bloque incompleto
+        lanza TimeoutError (no llega el resto a tiempo) o DataError (la
+        línea se cierra antes): nunca se devuelve un payload parcial, así
+        la descarga reintenta el rango.
+        """
+        # 1) Descartar hasta '#'
+        await self._read(self._reader.readuntil(b"#"))
+
+        # 2) Dígito con el nº de dígitos de la longitud + longitud ASCII
+        ndigits_b = await self._read(self._reader.readexactly(1))
+        if not ndigits_b.isdigit():
+            raise DataError(f"[{self.name}] Cabecera binaria inválida (#6).")
+        length_str = await self._read(self._reader.readexactly(int(ndigits_b)))
+        try:
+            data_len = int(length_str.decode())
+        except ValueError:
+            logger.error(f"[{self.name}] Longitud inválida en #6******: {length_str!r}")
+            raise DataError("Error longitud bloque (#6******).")
+
+        # 3) Payload
+        to_read = data_len + extra
+        payload = await self._read(self._reader.readexactly(to_read), truncated="Bloque binario truncado")
+
+        logger.debug(f"[{self.name}] << BIN {len(payload)} bytes")
+        return b"#" + ndigits_b + length_str + payload
+
+
+class AsyncWLANConnection(AsyncStreamConnection):
+    """Conexión TCP/IP asyncio (mismos parámetros que WLANConnection)."""
+
+    name = "AsyncWLANConnection"
+
+    def __init__(self, address="192.168.0.10", tcp_port=8023, timeout=3):
+        super().__init__(timeout=timeout)
+        self.address = address
+        self.port = tcp_port
+
+    async def _open_streams(self):
+        try:
+            streams = await asyncio.wait_for(
+                asyncio.open_connection(self.address, self.port), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.error(f"[{self.name}] Error de conexión: {e}")
+            raise ConnectionError(f"[{self.name}] No se pudo conectar a {self.address}:{self.port}") from e
+        logger.info(f"[{self.name}] Conectado a {self.address}:{self.port}")
+        return streams
+
+
+class AsyncSerialConnection(AsyncStreamConnection):
+    """Puerto serie asyncio (mismos parámetros que SerialConnection)."""
+
+    name = "AsyncSerialConnection"
+
+    def __init__(
+        self,
+        port="COM3",
+        baudrate=38400,
+        bytesize=8,
+        parity="N",
+        stopbits=1,
+        timeout=3,
+    ):
+        super().__init__(timeout=timeout)
+        self.port = port
+        self.baudrate = baudrate
+        self.bytesize = bytesize
+        self.parity = parity
+        self.stopbits = stopbits
+
+    async def _open_streams(self):
+        if not HAS_SERIAL_ASYNCIO:
+            raise ImportError(
+                "AsyncSerialConnection requiere pyserial-asyncio (pip install pyserial-asyncio)."
+            )
+        try:
+            streams = await serial_asyncio.open_serial_connection(
+                url=self.port,
+                baudrate=self.baudrate,
+                bytesize=self.bytesize,
+                parity=self.parity,
+                stopbits=self.stopbits,
+            )
+        except Exception as e:
+            logger.error(f"[{self.name}] Error al abrir {self.port}: {e}")
+            raise
+        logger.info(f"[{self.name}] Conexión abierta en {self.port}")
+        return streams
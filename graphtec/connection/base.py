@@ -1,16 +1,61 @@
 
 from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from graphtec.connection.arbiter import CommandArbiter, PRIORITY_NORMAL
+from graphtec.connection.framing import FramedReader
+from graphtec.core.exceptions import ConnectionError
 import logging
 logger = logging.getLogger(__name__)
 
+
+# Tipos de respuesta según el comando (ver response_kind)
+REPLY_BLOCK = "block"            # '#6******' + DATA
+REPLY_TRANS_DATA = "trans_data"  # '#6******' + STATUS(2) + DATA + CHECKSUM(2)
+REPLY_OPEN = "open"              # 3 bytes de :TRANS:OPEN?
+REPLY_ASCII = "ascii"            # línea terminada en CRLF
+
+
+def response_kind(command: bytes | str) -> str:
+    """
+    Forma de la respuesta del GL100 a 'command' (común a todos los
+    transportes, síncronos o asyncio).
+    """
+    if isinstance(command, (bytes, bytearray)):
+        command = bytes(command).decode("ascii", errors="ignore")
+    cmd_up = command.strip().upper()
+
+    if cmd_up.startswith(":TRANS:OUTP:DATA?"):
+        return REPLY_TRANS_DATA
+    if cmd_up.startswith((":MEAS:OUTP", ":TRANS:OUTP:HEAD?")):
+        return REPLY_BLOCK
+    if cmd_up.startswith(":TRANS:OPEN?"):
+        return REPLY_OPEN
+    return REPLY_ASCII
+
 class BaseConnection(ABC):
     """
     Clase base abstracta para gestionar la comunicación con el GL100.
     Define la interfaz común para USB y LAN.
+
+    send()/query() de las implementaciones se ejecutan dentro de
+    transaction(): la conexión puede compartirse entre hilos sin que se
+    intercalen comandos (ver graphtec.connection.arbiter).
     """
 
     def __init__(self):
         self._connection = None
+        self.arbiter = CommandArbiter()
+
+    def transaction(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None):
+        """
+        Reserva la conexión para una secuencia de comandos.
+
+        Args:
+            priority: PRIORITY_REALTIME / PRIORITY_NORMAL / PRIORITY_BULK.
+            timeout: espera máxima por el turno (None = sin límite).
+        """
+        return self.arbiter.transaction(priority, timeout)
 
     @abstractmethod
     def open(self):
@@ -36,6 +81,201 @@ class BaseConnection(ABC):
         """Envía un comando y recibe la respuesta."""
         pass
 
+    def query_into(self, command, buffer: bytearray) -> memoryview:
+        """
+        Como query(), pero deja la respuesta en un buffer reutilizable y
+        devuelve una memoryview sobre la parte ocupada.
+
+        Implementación por defecto (copia); los transportes pueden
+        sobrescribirla para leer directamente en el buffer.
+        Si el buffer es pequeño se usa uno nuevo.
+        """
+        resp = self.query(command) or b""
+        if len(buffer) < len(resp):
+            buffer = bytearray(len(resp))
+        buffer[:len(resp)] = resp
+        return memoryview(buffer)[:len(resp)]
+
     def is_open(self) -> bool:
         """Devuelve True si la conexión está activa."""
         return self._connection is not None
+
+
+class FramedConnection(BaseConnection):
+    """
+    Base de los transportes síncronos con lectura por tramas (USB y LAN).
+
+    Las subclases abren el transporte y crean su FramedReader
+    (_make_reader); la recepción y el despacho de respuestas según
+    response_kind (ASCII, apertura TRANS, bloques #6 con o sin
+    STATUS/CHECKSUM) son comunes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._reader: Optional[FramedReader] = None
+        self._reader_source = None
+        self._tap: Optional[Callable[[memoryview], None]] = None
+
+    @abstractmethod
+    def _make_reader(self, raw) -> FramedReader:
+        """Crea el FramedReader para el transporte abierto 'raw'."""
+
+    # =========================================================
+    # lectura de respuesta
+    # =========================================================
+    @property
+    def reader(self) -> FramedReader:
+        """
+        FramedReader sobre la conexión abierta: todas las lecturas pasan
+        por su buffer (bloques grandes con readinto/recv_into).
+        """
+        if not self._connection:
+            raise ConnectionError(f"[{type(self).__name__}] Conexión no abierta")
+        if self._reader is None or self._reader_source is not self._connection:
+            self._reader = self._make_reader(self._connection)
+            self._reader.tap = self._tap
+            self._reader_source = self._connection
+        return self._reader
+
+    @property
+    def tap(self) -> Optional[Callable[[memoryview], None]]:
+        """Observador de los bytes recibidos del transporte (ver FramedReader.tap)."""
+        return self._tap
+
+    @tap.setter
+    def tap(self, fn: Optional[Callable[[memoryview], None]]) -> None:
+        self._tap = fn
+        if self._reader is not None:
+            self._reader.tap = fn
+
+    def receive(self, size=4096) -> bytes:
+        """
+        Lee hasta n bytes de datos (lo ya recibido o una lectura del transporte).
+        Args:
+            size (int): Número máximo de bytes a leer.
+
+        Returns:
+            bytes: Datos recibidos.
+        """
+        response = self.reader.read(size)
+        logger.debug(f"[{type(self).__name__}] >> {response}")
+
+        return response
+
+    def receive_until(self, terminator: bytes = b"\r\n") -> bytes:
+        """
+        Lee datos hasta encontrar el terminador especificado.
+
+        Args:
+            terminator (bytes): Secuencia de bytes que indica el final del mensaje.
+
+        Returns:
+            bytes: Datos recibidos incluyendo el terminador.
+
+        Raises:
+            TimeoutError: si el terminador no llega dentro del timeout.
+        """
+        response = self.reader.read_until(terminator)
+        logger.debug(f"[{type(self).__name__}] >> {response}")
+        return response
+
+    def read_ascii(self) -> str:
+        """Lee una respuesta ASCII (CRLF) y la devuelve como texto sin terminador."""
+        return self.receive_until(b"\r\n").decode("ascii", errors="ignore").strip()
+
+    def receive_line(self) -> bytes:
+        """
+        Lee una línea completa (hasta '\n').
+        """
+        return self.reader.read_until(b"\n")
+
+    def query(self, command: str) -> bytes:
+        with self.transaction():
+            self.send(command)
+            return self._read_reply(response_kind(command))
+
+    def _read_reply(self, kind: str) -> bytes:
+        """Lee la respuesta de la forma 'kind' (ver response_kind)."""
+        # Real-time (:MEAS:OUTP) y cabecera GBD (:TRANS:OUTP:HEAD?, solo #6****** + header ASCII)
+        if kind == REPLY_BLOCK:
+            return self.read_binary()
+
+        # Transferencia bloque binario de datos capturados (incluye status+checksum)
+        if kind == REPLY_TRANS_DATA:
+            return self.read_binary_trans_data()
+
+        # Apertura TRANS → 3 bytes
+        if kind == REPLY_OPEN:
+            resp = self.reader.read_exact(3)
+            logger.debug(f"[{type(self).__name__}] >> {resp}")
+            return resp
+
+        # Resto: ASCII
+        return self.receive_until(b"\r\n")
+
+    def query_into(self, command: str, buffer: bytearray) -> memoryview:
+        """
+        Igual que query(), pero los bloques binarios (#6******) se leen
+        directamente en 'buffer' y se devuelve una memoryview sobre él,
+        sin concatenaciones intermedias.
+
+        Si el buffer no tiene tamaño suficiente se usa uno nuevo.
+        """
+        kind = response_kind(command)
+
+        with self.transaction():
+            if kind == REPLY_TRANS_DATA:
+                self.send(command)
+                return self.read_binary_trans_data_into(buffer)
+
+            if kind == REPLY_BLOCK:
+                self.send(command)
+                return self.read_binary_into(buffer)
+
+            return BaseConnection.query_into(self, command, buffer)
+
+    def read_binary(self):
+        """
+        Lee un bloque binario estilo #6xxxxxx del GL100 SIN status/checksum.
+        Usado para:
+          - :MEAS:OUTP:ONE?
+          - :TRANS:OUTP:HEAD?
+
+        Raises:
+            TimeoutError: si el bloque no llega completo.
+            DataError: si la cabecera #6****** no es válida.
+        """
+        block = self.reader.read_block(extra=0)
+        logger.debug(f"[{type(self).__name__}] << BIN {len(block)} bytes")
+        return block
+
+    def read_binary_trans_data(self):
+        """
+        Lee un bloque binario de :TRANS:OUTP:DATA?:
+
+          '#6******' + STATUS(2) + DATA(N) + CHECKSUM(2)
+
+        donde ****** = N (tamaño de DATA en bytes, SIN incluir status/checksum).
+        Devuelve:
+          b'#' + '6' + '******' + STATUS + DATA + CHECKSUM
+        """
+        block = self.reader.read_block(extra=4)
+        logger.debug(f"[{type(self).__name__}] << BIN {len(block)} bytes")
+        return block
+
+    def read_binary_into(self, buffer: bytearray) -> memoryview:
+        """
+        Como read_binary(), pero leyendo en un buffer reutilizable.
+        """
+        return self.reader.read_block_into(buffer, extra=0)
+
+    def read_binary_trans_data_into(self, buffer: bytearray) -> memoryview:
+        """
+        Como read_binary_trans_data(), pero leyendo en un buffer reutilizable:
+
+          '#6******' + STATUS(2) + DATA(N) + CHECKSUM(2)
+
+        Devuelve una memoryview sobre el bloque dentro de 'buffer'.
+        """
+        return self.reader.read_block_into(buffer, extra=4)
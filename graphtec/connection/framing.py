@@ -0,0 +1,273 @@
+"""
+Lectura con buffer y reconstrucción de tramas para transportes síncronos.
+
+FramedReader lee del transporte en bloques grandes (readinto) hacia un
+buffer interno y reconstruye desde ahí las respuestas del GL100:
+
+  - read_exact(n, deadline):    exactamente n bytes o TimeoutError
+  - read_until(term, deadline): hasta el terminador (incluido)
+  - read_block(extra, deadline): '#<nd><len>' + DATA(len) + extra bytes
+  - read_block_into(buffer, ...): igual, dejando el bloque en 'buffer'
+
+Los plazos son absolutos (time.monotonic()); sin plazo se usa 'timeout'.
+El plazo se comprueba antes de cada lectura del transporte y, si se
+indica 'settimeout', el tiempo restante se pasa al transporte para que
+ninguna lectura lo sobrepase. Una respuesta incompleta al vencer el
+plazo lanza TimeoutError en lugar de devolverse truncada (y un bloque #6
+a medias se descarta del buffer).
+
+Cuando se sabe cuántos bytes faltan (bloques #6) se piden de una vez, así
+que un bloque TRANS cuesta unas pocas llamadas al transporte en lugar de
+una por byte de cabecera más varias lecturas pequeñas.
+
+    reader = FramedReader(
+        ser.readinto,
+        available=lambda: ser.in_waiting,
+        settimeout=lambda t: setattr(ser, "timeout", t),
+    )
+    block = reader.read_block(extra=4)  # :TRANS:OUTP:DATA?
+
+Si se asigna 'tap', cada trozo leído del transporte se le pasa tal cual
+llega (graphtec.connection.trace lo usa para grabar el tráfico).
+"""
+
+import time
+import builtins
+from typing import Any, Callable, Dict, Optional
+
+from graphtec.core.exceptions import DataError, TimeoutError
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = ["FramedReader"]
+
+# Timeout del transporte durante una lectura (socket.timeout es el builtin)
+_TIMEOUT_ERRORS = (builtins.TimeoutError, TimeoutError)
+
+
+class FramedReader:
+    """Buffer de recepción + parser de tramas sobre una función readinto."""
+
+    def __init__(
+        self,
+        readinto: Callable[[memoryview], Optional[int]],
+        available: Optional[Callable[[], int]] = None,
+        timeout: float = 3.0,
+        chunk_size: int = 65536,
+        settimeout: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Args:
+            readinto: lee en la memoryview y devuelve los bytes leídos
+                (0/None si vence el timeout del transporte).
+            available: bytes ya recibidos por el transporte (in_waiting),
+                para vaciarlos en una sola lectura.
+            timeout: plazo por defecto de cada lectura de trama (s).
+            chunk_size: capacidad inicial del buffer.
+            settimeout: fija el timeout de una lectura del transporte; se
+                llama con el tiempo que queda hasta el plazo.
+        """
+        self._readinto = readinto
+        self._available = available
+        self._settimeout = settimeout
+        self._transport_timeout: Optional[float] = None
+        self.timeout = timeout
+        # Observador de los bytes crudos recibidos (memoryview de cada lectura)
+        self.tap: Optional[Callable[[memoryview], None]] = None
+        self._buf = bytearray(chunk_size)
+        self._start = 0
+        self._end = 0
+
+        self.reads = 0
+        self.bytes_read = 0
+
+    # ============================================================
+    # Buffer
+    # ============================================================
+    @property
+    def buffered(self) -> int:
+        """Bytes recibidos y aún no consumidos."""
+        return self._end - self._start
+
+    def clear(self) -> int:
+        """Descarta lo pendiente en el buffer (devuelve cuántos bytes)."""
+        n = self.buffered
+        self._start = self._end = 0
+        return n
+
+    def transport_timeout_changed(self) -> None:
+        """Avisa de que el timeout del transporte se ha cambiado por fuera."""
+        self._transport_timeout = None
+
+    def _deadline(self, deadline: Optional[float]) -> float:
+        return time.monotonic() + self.timeout if deadline is None else deadline
+
+    def _transport_read(self, view: memoryview, deadline: float, what: str) -> int:
+        """
+        Una lectura del transporte limitada por el plazo. TimeoutError si el
+        plazo ya ha vencido (aunque el transporte siga entregando datos).
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"[FramedReader] Timeout leyendo {what}")
+
+        if self._settimeout is not None:
+            # Solo se reconfigura si el valor cambia de forma apreciable
+            # (en serie cada cambio cuesta una llamada al sistema).
+            cur = self._transport_timeout
+            if cur is None or remaining < cur * 0.9 or remaining > cur * 1.1:
+                self._settimeout(remaining)
+                self._transport_timeout = remaining
+
+        try:
+            n = self._readinto(view) or 0
+        except _TIMEOUT_ERRORS:
+            n = 0
+        if n and self.tap is not None:
+            self.tap(view[:n])
+        self.reads += 1
+        self.bytes_read += n
+        return n
+
+    def _fill(self, want: int, deadline: float, what: str) -> int:
+        """
+        Una lectura hacia el buffer interno: al menos 'want' bytes pedidos
+        (o todo lo que ya esté disponible, si es más). Devuelve los leídos.
+        """
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._start > len(self._buf) // 2:
+            n = self._end - self._start
+            self._buf[:n] = self._buf[self._start:self._end]
+            self._start, self._end = 0, n
+
+        want = max(want, self._waiting())
+        if len(self._buf) - self._end < want:
+            self._buf.extend(bytes(self._end + want - len(self._buf)))
+
+        n = self._transport_read(memoryview(self._buf)[self._end:self._end + want], deadline, what)
+        self._end += n
+        return n
+
+    def _waiting(self) -> int:
+        if self._available is None:
+            return 0
+        try:
+            return self._available() or 0
+        except Exception:
+            return 0
+
+    def _ensure(self, n: int, deadline: float, what: str) -> None:
+        """Garantiza n bytes en el buffer antes del plazo."""
+        while self.buffered < n:
+            self._fill(n - self.buffered, deadline, f"{what} ({self.buffered}/{n} bytes)")
+
+    def _take(self, n: int) -> bytes:
+        out = bytes(self._buf[self._start:self._start + n])
+        self._start += n
+        return out
+
+    # ============================================================
+    # Lecturas
+    # ============================================================
+    def read(self, size: int = 4096, deadline: Optional[float] = None) -> bytes:
+        """Hasta 'size' bytes: lo pendiente o, si no hay nada, una lectura del transporte."""
+        if not self.buffered:
+            try:
+                self._fill(1, self._deadline(deadline), "datos")
+            except TimeoutError:
+                return b""
+        return self._take(min(size, self.buffered))
+
+    def read_available(self) -> bytes:
+        """Lo pendiente más lo que el transporte ya tenga recibido, sin esperar."""
+        if self._waiting():
+            self._fill(0, self._deadline(None), "datos disponibles")
+        return self._take(self.buffered)
+
+    def read_exact(self, n: int, deadline: Optional[float] = None) -> bytes:
+        """Exactamente n bytes; TimeoutError si no llegan antes del plazo."""
+        self._ensure(n, self._deadline(deadline), f"{n} bytes")
+        return self._take(n)
+
+    def read_until(self, terminator: bytes = b"\r\n", deadline: Optional[float] = None) -> bytes:
+        """Bytes hasta 'terminator' (incluido)."""
+        deadline = self._deadline(deadline)
+        scanned = self._start
+        while True:
+            idx = self._buf.find(terminator, scanned, self._end)
+            if idx >= 0:
+                return self._take(idx + len(terminator) - self._start)
+            # Solo se vuelve a buscar en lo nuevo (y el solape del terminador)
+            scanned = max(self._start, self._end - len(terminator) + 1)
+            before = self._start
+            self._fill(1, deadline, f"{terminator!r} ({self.buffered} bytes recibidos)")
+            scanned += self._start - before
+
+    def _block_size(self, extra: int, deadline: float) -> int:
+        """Deja el buffer al inicio de un bloque '#' y devuelve su tamaño total."""
+        while True:
+            idx = self._buf.find(b"#", self._start, self._end)
+            if idx >= 0:
+                if idx > self._start:
+                    logger.debug(f"[FramedReader] Descartando {idx - self._start} bytes antes de '#'")
+                self._start = idx
+                break
+            self._start = self._end
+            self._fill(1, deadline, "inicio de bloque (#)")
+
+        self._ensure(2, deadline, "cabecera de bloque")
+        nd = self._buf[self._start + 1] - 0x30
+        if not 0 < nd <= 9:
+            self._start += 1  # no volver a tomar este '#' como inicio
+            raise DataError("[FramedReader] Cabecera binaria inválida (#6).")
+
+        self._ensure(2 + nd, deadline, "longitud de bloque")
+        length = bytes(self._buf[self._start + 2:self._start + 2 + nd])
+        try:
+            data_len = int(length)
+        except ValueError:
+            self._start += 1
+            logger.error(f"[FramedReader] Longitud inválida en #6******: {length!r}")
+            raise DataError("Error longitud bloque (#6******).")
+        return 2 + nd + data_len + extra
+
+    def read_block(self, extra: int = 0, deadline: Optional[float] = None) -> bytes:
+        """
+        Bloque '#<nd><len>' + DATA(len) + 'extra' bytes (4 en TRANS DATA:
+        STATUS + CHECKSUM), con la cabecera incluida.
+        """
+        deadline = self._deadline(deadline)
+        total = self._block_size(extra, deadline)
+        try:
+            self._ensure(total, deadline, "bloque binario")
+        except TimeoutError:
+            # Un bloque a medias no debe confundirse con la siguiente respuesta
+            self.clear()
+            raise
+        return self._take(total)
+
+    def read_block_into(self, buffer: bytearray, extra: int = 0, deadline: Optional[float] = None) -> memoryview:
+        """
+        Como read_block(), pero el bloque queda en 'buffer' (uno nuevo si no
+        cabe) y se devuelve una memoryview sobre él. Lo que falta del bloque
+        se lee directamente en 'buffer', sin pasar por el buffer interno.
+        """
+        deadline = self._deadline(deadline)
+        total = self._block_size(extra, deadline)
+        if len(buffer) < total:
+            buffer = bytearray(total)
+        view = memoryview(buffer)
+
+        have = min(self.buffered, total)
+        view[:have] = self._buf[self._start:self._start + have]
+        self._start += have
+
+        while have < total:
+            have += self._transport_read(
+                view[have:total], deadline, f"bloque binario ({have}/{total} bytes)"
+            )
+        return view[:total]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"reads": self.reads, "bytes": self.bytes_read, "buffered": self.buffered}
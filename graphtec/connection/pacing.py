@@ -0,0 +1,105 @@
+"""
+Ritmo de envío de comandos (pacing) por clase de comando.
+
+Antes SerialConnection.send dormía 0,1 s tras cada escritura, también
+antes de leer la respuesta de una consulta. Con PacingPolicy:
+
+  - Consultas (terminan en '?'): no hay temporizador, la propia lectura
+    de la respuesta marca el ritmo (query_gap = 0 por defecto).
+  - Setters: separación mínima 'setter_gap' entre el final de una
+    escritura y la siguiente. Solo se espera lo que falta: si entre dos
+    comandos ya ha pasado ese tiempo (p. ej. leyendo una respuesta o
+    preparando el siguiente) no se duerme nada.
+  - 'gaps': separación propia por prefijo de comando (gana el prefijo
+    más largo), p. ej. {":MEAS:START": 0.5}.
+
+    conn = SerialConnection(port="COM3", pacing=PacingPolicy(setter_gap=0.01))
+    conn = SerialConnection(port="COM3", pacing=PacingPolicy.fixed(0.1))  # comportamiento anterior
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = ["PacingPolicy", "SETTER_GAP"]
+
+# Separación por defecto tras un setter (s)
+SETTER_GAP = 0.02
+
+
+class PacingPolicy:
+    """Separación mínima entre comandos según su clase."""
+
+    def __init__(
+        self,
+        setter_gap: float = SETTER_GAP,
+        query_gap: float = 0.0,
+        gaps: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            setter_gap: separación tras un comando sin respuesta.
+            query_gap: separación tras una consulta (tras enviarla, no tras leerla).
+            gaps: separación por prefijo de comando (tiene prioridad).
+            clock, sleep: inyectables para pruebas.
+        """
+        if setter_gap < 0 or query_gap < 0:
+            raise ValueError("Las separaciones entre comandos no pueden ser negativas")
+        self.setter_gap = float(setter_gap)
+        self.query_gap = float(query_gap)
+        self.gaps = {prefix.upper(): float(gap) for prefix, gap in (gaps or {}).items()}
+        self._clock = clock
+        self._sleep = sleep
+        self._ready_at = 0.0
+
+        self.commands = 0
+        self.waits = 0
+        self.waited = 0.0
+
+    @classmethod
+    def fixed(cls, delay: float = 0.1, **kwargs) -> "PacingPolicy":
+        """Misma separación para todos los comandos (equivale al antiguo sleep(0.1))."""
+        return cls(setter_gap=delay, query_gap=delay, **kwargs)
+
+    def gap_for(self, command: bytes | str) -> float:
+        """Separación que debe seguir a 'command'."""
+        if isinstance(command, (bytes, bytearray)):
+            command = bytes(command).decode("ascii", errors="ignore")
+        cmd_up = command.strip().upper()
+
+        best = None
+        for prefix in self.gaps:
+            if cmd_up.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        if best is not None:
+            return self.gaps[best]
+        is_query = cmd_up.split(" ", 1)[0].endswith("?")
+        return self.query_gap if is_query else self.setter_gap
+
+    def before_send(self) -> None:
+        """Espera lo que falte de la separación del comando anterior."""
+        remaining = self._ready_at - self._clock()
+        if remaining > 0:
+            self._sleep(remaining)
+            self.waits += 1
+            self.waited += remaining
+
+    def after_send(self, command: bytes | str) -> None:
+        """Registra el envío de 'command' (la separación cuenta desde ahora)."""
+        self.commands += 1
+        self._ready_at = self._clock() + self.gap_for(command)
+
+    def reset(self) -> None:
+        self._ready_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "commands": self.commands,
+            "waits": self.waits,
+            "waited_s": self.waited,
+            "setter_gap": self.setter_gap,
+            "query_gap": self.query_gap,
+        }
@@ -0,0 +1,432 @@
+"""
+Grabación del tráfico con el GL100 y reproducción sin equipo.
+
+RecordingConnection envuelve una conexión (cualquier BaseConnection) y
+guarda en un archivo de traza binario cada comando enviado y cada trozo
+de bytes recibido, con su instante monotónico. ReplayConnection
+reproduce ese archivo haciendo de equipo: GraphtecCapture y
+GraphtecRealtime trabajan sobre ella igual que sobre el transporte
+original, a toda velocidad o con el ritmo grabado.
+
+Formato (little-endian):
+
+    b"GLTRACE" + versión u8 + len(meta) u32 + meta (JSON UTF-8)
+    registros: tipo u8 + t f64 (s desde el inicio) + len u32 + datos
+
+    tipo 1 = comando enviado (con CRLF), 2 = bytes recibidos,
+    3 = flush_buffer (lo recibido antes se descartó)
+
+Con un FramedConnection (serie, LAN) se graba cada lectura del
+transporte tal cual llega (FramedConnection.tap), así que la
+reproducción conserva la fragmentación y los tiempos reales; con otras
+conexiones se graba cada respuesta completa.
+
+    with RecordingConnection(conn, "descarga.gltrace") as rec:
+        GraphtecCapture(rec).download(path, "out")
+
+    replay = ReplayConnection("descarga.gltrace", speed=1.0)
+    replay.open()
+    GraphtecCapture(replay).download(path, "out_offline")
+"""
+
+import json
+import time
+import struct
+import threading
+import logging
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+from graphtec.connection.arbiter import transaction
+from graphtec.connection.base import FramedConnection
+from graphtec.connection.framing import FramedReader
+from graphtec.core.exceptions import CommandError, ConnectionError, DataError
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "TraceRecord",
+    "TraceWriter",
+    "load_trace",
+    "RecordingConnection",
+    "ReplayConnection",
+]
+
+MAGIC = b"GLTRACE"
+VERSION = 1
+
+SENT = 1
+RECEIVED = 2
+FLUSH = 3
+
+_U32 = struct.Struct("<I")
+_RECORD = struct.Struct("<BdI")
+
+
+def _command_bytes(command: bytes | str) -> bytes:
+    """Comando tal como sale por el transporte (terminado en CRLF)."""
+    if isinstance(command, str):
+        command = command.encode()
+    command = bytes(command)
+    return command if command.endswith(b"\r\n") else command + b"\r\n"
+
+
+class TraceRecord(NamedTuple):
+    kind: int
+    t: float
+    data: bytes
+
+
+# ============================================================
+# ARCHIVO DE TRAZA
+# ============================================================
+class TraceWriter:
+    """Escribe registros de traza (seguro entre hilos)."""
+
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None, clock=time.monotonic):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._f: Optional[BinaryIO] = open(path, "wb")
+        raw = json.dumps(meta or {}).encode("utf-8")
+        self._f.write(MAGIC + bytes([VERSION]) + _U32.pack(len(raw)) + raw)
+        self._t0 = clock()
+        self.records = 0
+        self.bytes = 0
+
+    def write(self, kind: int, data=b"") -> None:
+        t = self._clock() - self._t0
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.write(_RECORD.pack(kind, t, len(data)))
+            self._f.write(data)
+            self.records += 1
+            self.bytes += len(data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+
+def load_trace(path: str) -> Tuple[Dict[str, Any], List[TraceRecord]]:
+    """Lee una traza completa: (metadatos, registros)."""
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC) + 1 + _U32.size)
+        if head[:len(MAGIC)] != MAGIC:
+            raise DataError(f"[trace] {path} no es una traza GLTRACE")
+        if head[len(MAGIC)] != VERSION:
+            raise DataError(f"[trace] Versión de traza no soportada: {head[len(MAGIC)]}")
+        (meta_len,) = _U32.unpack_from(head, len(MAGIC) + 1)
+        meta = json.loads(f.read(meta_len).decode("utf-8") or "{}")
+
+        records: List[TraceRecord] = []
+        while True:
+            rec = f.read(_RECORD.size)
+            if len(rec) < _RECORD.size:
+                break
+            kind, t, n = _RECORD.unpack(rec)
+            data = f.read(n)
+            if len(data) < n:
+                logger.warning("[trace] Traza truncada: último registro incompleto.")
+                break
+            records.append(TraceRecord(kind, t, data))
+    return meta, records
+
+
+# ============================================================
+# GRABACIÓN
+# ============================================================
+class RecordingConnection:
+    """
+    Envoltorio de una conexión que graba su tráfico en una traza.
+
+    Se usa en lugar de la conexión (mismos métodos; lo no grabado se
+    delega tal cual). El registro de cada comando y su envío se hacen
+    dentro de la misma transacción, así que el orden de la traza es el
+    del enlace aunque la conexión se comparta entre hilos.
+    """
+
+    def __init__(self, connection, path: str, meta: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            connection: conexión a grabar (abierta o no).
+            path: archivo de traza (se sobrescribe).
+            meta: metadatos extra a guardar en la cabecera de la traza.
+        """
+        self.connection = connection
+        self._framed = isinstance(connection, FramedConnection)
+        info = {
+            "transport": type(connection).__name__,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "chunks": "transport" if self._framed else "reply",
+        }
+        info.update(meta or {})
+        self.writer: Optional[TraceWriter] = TraceWriter(path, info)
+        if self._framed:
+            connection.tap = self._on_data
+
+    def _on_data(self, view) -> None:
+        if self.writer is not None:
+            self.writer.write(RECEIVED, view)
+
+    def _record_reply(self, resp: Any) -> None:
+        """Respuesta completa (conexiones sin tap)."""
+        if self.writer is None or self._framed or resp is None:
+            return
+        if isinstance(resp, str):
+            resp = resp.encode("latin-1", errors="replace") + b"\r\n"
+        if len(resp):
+            self.writer.write(RECEIVED, resp)
+
+    def stop(self) -> None:
+        """Deja de grabar (la conexión sigue abierta)."""
+        if self._framed and self.connection.tap == self._on_data:
+            self.connection.tap = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    # ------------------------------------------------------------
+    # Interfaz de conexión
+    # ------------------------------------------------------------
+    def open(self):
+        return self.connection.open()
+
+    def close(self):
+        try:
+            return self.connection.close()
+        finally:
+            self.stop()
+
+    def send(self, command):
+        with transaction(self.connection):
+            if self.writer is not None:
+                self.writer.write(SENT, _command_bytes(command))
+            return self.connection.send(command)
+
+    def query(self, command):
+        with transaction(self.connection):
+            if self.writer is not None:
+                self.writer.write(SENT, _command_bytes(command))
+            resp = self.connection.query(command)
+            self._record_reply(resp)
+            return resp
+
+    def query_into(self, command, buffer: bytearray):
+        with transaction(self.connection):
+            if self.writer is not None:
+                self.writer.write(SENT, _command_bytes(command))
+            resp = self.connection.query_into(command, buffer)
+            self._record_reply(resp)
+            return resp
+
+    def flush_buffer(self):
+        with transaction(self.connection):
+            if self.writer is not None:
+                self.writer.write(FLUSH)
+            return self.connection.flush_buffer()
+
+    def _read(self, name: str, *args):
+        resp = getattr(self.connection, name)(*args)
+        self._record_reply(resp)
+        return resp
+
+    def read_ascii(self):
+        return self._read("read_ascii")
+
+    def receive(self, *args):
+        return self._read("receive", *args)
+
+    def receive_until(self, *args):
+        return self._read("receive_until", *args)
+
+    def read_binary(self):
+        return self._read("read_binary")
+
+    def read_binary_trans_data(self):
+        return self._read("read_binary_trans_data")
+
+    def __getattr__(self, name: str):
+        # transaction, arbiter, is_open, timeout, ...
+        return getattr(self.connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ============================================================
+# REPRODUCCIÓN
+# ============================================================
+class _ReplayTransport:
+    """
+    Transporte que entrega los bytes grabados tras cada comando.
+
+    Los bytes recibidos después de un comando solo se entregan cuando
+    ese comando se ha enviado; con speed > 0, además, no antes de su
+    instante grabado (relativo al envío) dividido por speed. Si no queda
+    nada hasta el siguiente comando, readinto espera el timeout del
+    transporte, como un puerto real.
+    """
+
+    def __init__(self, records: List[TraceRecord], speed: float, timeout: Optional[float]):
+        self.records = records
+        self.speed = speed
+        self.timeout = timeout
+        self._i = 0
+        self._off = 0
+        # (instante local, instante grabado) del último comando enviado
+        self._anchor = (time.monotonic(), 0.0)
+        self.stats = {"sent": 0, "received": 0, "mismatches": 0, "skipped_bytes": 0}
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self.timeout = timeout
+
+    def _skip_received(self) -> None:
+        while self._i < len(self.records) and self.records[self._i].kind == RECEIVED:
+            self.stats["skipped_bytes"] += len(self.records[self._i].data) - self._off
+            self._i += 1
+            self._off = 0
+
+    def expect_send(self, command: bytes) -> Optional[bytes]:
+        """Avanza hasta el siguiente comando grabado y lo devuelve (None si no quedan)."""
+        while self._i < len(self.records) and self.records[self._i].kind != SENT:
+            rec = self.records[self._i]
+            if rec.kind == RECEIVED:
+                self.stats["skipped_bytes"] += len(rec.data) - self._off
+            self._i += 1
+            self._off = 0
+        self.stats["sent"] += 1
+        if self._i >= len(self.records):
+            return None
+        rec = self.records[self._i]
+        self._i += 1
+        self._off = 0
+        self._anchor = (time.monotonic(), rec.t)
+        return rec.data
+
+    def flush(self) -> None:
+        """Descarta lo grabado hasta el flush_buffer() correspondiente, si lo hay."""
+        j = self._i
+        while j < len(self.records) and self.records[j].kind == RECEIVED:
+            j += 1
+        if j < len(self.records) and self.records[j].kind == FLUSH:
+            self._skip_received()
+            self._i += 1
+
+    def _ready_at(self, rec: TraceRecord) -> float:
+        if not self.speed:
+            return 0.0
+        local, recorded = self._anchor
+        return local + (rec.t - recorded) / self.speed
+
+    def available(self) -> int:
+        if self._i < len(self.records):
+            rec = self.records[self._i]
+            if rec.kind == RECEIVED and time.monotonic() >= self._ready_at(rec):
+                return len(rec.data) - self._off
+        return 0
+
+    def readinto(self, view) -> int:
+        now = time.monotonic()
+        deadline = None if self.timeout is None else now + self.timeout
+        while True:
+            rec = self.records[self._i] if self._i < len(self.records) else None
+            if rec is not None and rec.kind == RECEIVED:
+                ready = self._ready_at(rec)
+                if now >= ready:
+                    n = min(len(view), len(rec.data) - self._off)
+                    view[:n] = rec.data[self._off:self._off + n]
+                    self._off += n
+                    if self._off >= len(rec.data):
+                        self._i += 1
+                        self._off = 0
+                    self.stats["received"] += n
+                    return n
+                wake = ready
+            else:
+                # Nada más hasta el siguiente comando: el equipo calla
+                wake = None
+
+            if deadline is not None and (wake is None or wake > deadline):
+                if deadline > now:
+                    time.sleep(deadline - now)
+                return 0
+            if wake is None:
+                return 0
+            time.sleep(max(0.0, wake - now))
+            now = time.monotonic()
+
+
+class ReplayConnection(FramedConnection):
+    """
+    Conexión que reproduce una traza de RecordingConnection.
+
+    Los comandos enviados se comparan con los grabados (un comando
+    distinto se cuenta en stats()["mismatches"], o lanza CommandError
+    con strict=True) y las respuestas se leen con el mismo FramedReader
+    que los transportes reales.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0, timeout: float = 0.5, strict: bool = False):
+        """
+        Args:
+            path: archivo de traza.
+            speed: 0 = a toda velocidad; 1.0 = con los tiempos grabados;
+                2.0 = el doble de rápido, etc.
+            timeout: timeout de lectura (lo que tarda en fallar una
+                lectura que la traza no contiene).
+            strict: si True, un comando distinto del grabado es un error.
+        """
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.timeout = timeout
+        self.strict = strict
+        self.meta: Dict[str, Any] = {}
+
+    def open(self):
+        self.meta, records = load_trace(self.path)
+        self._connection = _ReplayTransport(records, self.speed, self.timeout)
+        logger.info(
+            f"[ReplayConnection] {self.path}: {len(records)} registros "
+            f"({self.meta.get('transport', '?')}, velocidad {self.speed or 'máxima'})"
+        )
+
+    def close(self):
+        self._connection = None
+        self._reader = None
+
+    def send(self, command: bytes | str):
+        data = _command_bytes(command)
+        if not self._connection:
+            raise ConnectionError("[ReplayConnection] Traza no abierta")
+        with self.transaction():
+            recorded = self._connection.expect_send(data)
+            if recorded != data:
+                self._connection.stats["mismatches"] += 1
+                msg = f"[ReplayConnection] Enviado {data!r}, grabado {recorded!r}"
+                if self.strict:
+                    raise CommandError(msg)
+                logger.warning(msg)
+            logger.debug(f"[ReplayConnection] << {data}")
+
+    def _make_reader(self, transport: _ReplayTransport) -> FramedReader:
+        return FramedReader(
+            transport.readinto,
+            available=transport.available,
+            timeout=self.timeout,
+            settimeout=transport.settimeout,
+        )
+
+    def flush_buffer(self):
+        self.reader.clear()
+        self._connection.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._connection.stats) if self._connection else {}
@@ -1,14 +1,20 @@
 import socket
-from graphtec.connection.base import BaseConnection
+from graphtec.connection.base import FramedConnection
+from graphtec.connection.framing import FramedReader
+from graphtec.core.exceptions import ConnectionError, DisconnectedError
 import logging
 logger = logging.getLogger(__name__)
 
 
-class WLANConnection(BaseConnection):
+class WLANConnection(FramedConnection):
     """
     Implementa la comunicación TCP/IP con el dispositivo.
     #* En principio los dispositivos del laboratorio no tienen módulo LAN.
     #? Pero hay un modelo con conexión ethernet. Probar si requiere sockets. Sino descartar.
+
+    Misma recepción por tramas que SerialConnection (FramedConnection):
+    recv_into sobre un buffer, bloques #6 de longitud exacta y TRANS DATA
+    con STATUS/CHECKSUM, aunque lleguen repartidos en varios segmentos TCP.
     """
 
     def __init__(self, address="192.168.0.10", tcp_port=8023, timeout=3):
@@ -23,9 +29,12 @@ class WLANConnection(BaseConnection):
             self._connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._connection.settimeout(self.timeout)
             self._connection.connect((self.address, self.port))
+            # Comandos cortos petición/respuesta: sin esperar a agrupar segmentos
+            self._connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             logger.info(f"[GL100 LAN] Conectado a {self.address}:{self.port}")
         except socket.error as e:
             logger.error(f"[GL100 LAN] Error de conexión: {e}")
+            self._connection = None
             raise
 
     def close(self):
@@ -36,51 +45,37 @@ class WLANConnection(BaseConnection):
                 logger.info("[GL100 LAN] Conexión cerrada")
             finally:
                 self._connection = None
+                self._reader = None
 
     def send(self, command: bytes | str):
-        """Envía datos por TCP."""
+        """Envía datos por TCP (terminados en CRLF)."""
         if isinstance(command, str):
-            command = (command + "\r\n").encode()
+            command = command.encode()
+        if not command.endswith(b"\r\n"):
+            command += b"\r\n"
         if not self._connection:
             raise ConnectionError("Socket TCP no abierto")
-        self._connection.sendall(command)
+        with self.transaction():
+            self._connection.sendall(command)
+            logger.debug(f"[GL100 LAN] << {command}")
 
+    def _make_reader(self, sock) -> FramedReader:
+        """FramedReader sobre el socket (recv_into; el plazo se pasa con settimeout)."""
 
-    def receive(self, size=4096) -> bytes:
-        """Recibe datos del socket TCP."""
-        if not self._connection:
-            raise ConnectionError("Socket TCP no abierto")
-        return self._connection.recv(size)
-    
-    def receive_until(self, terminator: bytes = b"\n") -> bytes:
-        """Recibe datos hasta encontrar el terminador."""
-        if not self._connection:
-            raise ConnectionError("Socket TCP no abierto")
-        
-        data = bytearray()
-        while True:
-            chunk = self._connection.recv(1)
-            if not chunk:
-                break
-            data += chunk
-            if data.endswith(terminator):
-                break
-        return bytes(data)
-    
-    def receive_line(self) -> bytes:
-        """Recibe una línea completa (hasta \n)."""
-        return self.receive_until(terminator=b"\n") 
-    
-    def query(self, command: bytes | str, size=4096) -> bytes:
-        """Envía un comando y recibe la respuesta."""
-        self.send(command)
-        return self.receive(size=size)
+        def recv_into(view) -> int:
+            n = sock.recv_into(view)
+            if not n and len(view):
+                raise DisconnectedError("[GL100 LAN] Conexión cerrada por el equipo")
+            return n
+
+        return FramedReader(recv_into, timeout=self.timeout, settimeout=sock.settimeout)
 
     def flush_buffer(self):
-        """Limpia el buffer de recepción del socket."""
+        """Limpia el buffer de recepción (lector y socket)."""
         if not self._connection:
             raise ConnectionError("Socket TCP no abierto")
-        
+
+        self.reader.clear()
         self._connection.setblocking(False)
         try:
             while True:
@@ -90,4 +85,6 @@ class WLANConnection(BaseConnection):
         except BlockingIOError:
             pass
         finally:
-            self._connection.setblocking(True)
\ No newline at end of file
+            # setblocking(True) quitaría el timeout del socket
+            self._connection.settimeout(self.timeout)
+            self.reader.transport_timeout_changed()
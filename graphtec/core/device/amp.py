@@ -51,16 +51,42 @@ class AmpModule(BaseModule):
     def __init__(self, device):
         super().__init__(device)
         self.channels = {ch: {"type": "", "input": "", "range": ""} for ch in range(1, 5)}
+        # Snapshot de configuración: get_channels() solo consulta al equipo
+        # si no es válido. Los setters de canal lo invalidan y config_version
+        # cambia cada vez que la configuración puede haber cambiado.
+        self._snapshot_valid = False
+        self.config_version = 0
         logger.debug("[GL-AMP] Módulo de canales inicializado.")
 
+    # =========================================================
+    # SNAPSHOT DE CONFIGURACIÓN
+    # =========================================================
+
+    def invalidate(self):
+        """Marca la configuración guardada como obsoleta (se relee en el próximo get_channels)."""
+        self._snapshot_valid = False
+        self.config_version += 1
+
+    def refresh(self) -> dict:
+        """Relee del equipo la configuración de todos los canales."""
+        return self.get_channels(refresh=True)
+
     # =========================================================
     # GETTERS
     # =========================================================
 
-    def get_channels(self) -> dict:
-        """Devuelve la configuración actual de todos los canales."""
-        for ch in range(1, 5):
-            self.get_channel(ch)
+    def get_channels(self, refresh: bool = False) -> dict:
+        """
+        Devuelve la configuración de todos los canales.
+
+        Solo consulta al equipo (3 queries por canal) si no hay snapshot
+        válido o si refresh=True; si no, devuelve el guardado.
+        """
+        if refresh or not self._snapshot_valid:
+            for ch in range(1, 5):
+                self.get_channel(ch)
+            self._snapshot_valid = True
+            self.config_version += 1
         return self.channels
 
     def get_channel(self,channel:int) -> dict:
@@ -172,6 +198,17 @@ class AmpModule(BaseModule):
 
         return self.device.amp.get_channel(channel)
 
+    def set_channels(self, ch_input: str = "", ch_range: str = "", channels=(1, 2, 3, 4)) -> dict:
+        """Configura varios canales con los mismos parámetros y relee la configuración una sola vez."""
+        for ch in channels:
+            ch = validate_channel(ch)
+            if ch_input:
+                self.set_channel_input(channel=ch, ch_input=ch_input)
+            if ch_range:
+                self.set_channel_range(channel=ch, ch_range=ch_range)
+
+        return self.refresh()
+
     def set_channel_input(self, channel: int, ch_input: str):
         channel = validate_channel(channel)
         tipo_actual = self.channels[channel]["type"]
@@ -183,6 +220,7 @@ class AmpModule(BaseModule):
             cmd = SET_CHANNEL_INPUT.format(ch=channel, mode=ch_input)
             self.connection.send(cmd)
             self.channels[channel]["input"] = ch_input
+            self.invalidate()
             logger.debug(f"[GL-AMP] CH{channel} INPUT <- {ch_input}")
         else:
             raise CommandError(f"Modo de entrada inválido para CH{channel}: {ch_input} no es compatible con el tipo {self.channels[channel]['type']}")
@@ -198,6 +236,7 @@ class AmpModule(BaseModule):
             cmd = SET_CHANNEL_RANGE.format(ch=channel, value=ch_range)
             self.connection.send(cmd)
             self.channels[channel]["range"] = ch_range
+            self.invalidate()
             logger.debug(f"[GL-AMP] CH{channel} RANGE <- {ch_range}")
         else:
             raise CommandError(f"Configuración inválida para CH{channel}: {modo_actual} no es compatible con {ch_range}")
@@ -219,6 +258,7 @@ class AmpModule(BaseModule):
         channel = validate_channel(channel)
         cmd = SET_CHANNEL_CLAMP.format(ch=channel, mode=mode)
         self.connection.send(cmd)
+        self.invalidate()
         logger.debug(f"[GL-AMP] CH{channel} CLAMP <- {mode}")
 
     def set_clamp_voltage(self, channel: int, voltage: int):
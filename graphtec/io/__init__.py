@@ -4,10 +4,19 @@ Módulos de entrada/salida de datos (I/O) para GL100
 
 - realtime: adquisición de datos en tiempo real.
 - capture: descarga y lectura de datos almacenados (memoria o SD).
+- gbdfile: lectura de .GBD locales con mmap y acceso aleatorio.
 - decoder: utilidades comunes de decodificación y conversión física.
+- chunking: tamaño adaptativo de los fragmentos TRANS.
+- layout: tramas de tiempo real compiladas (struct.Struct + tabla de campos).
+- scheduler: lecturas a frecuencia fija sin deriva (plazos monotónicos).
+- stream: adquisición en segundo plano con buffer circular NumPy.
+- protocol: secuencias de comandos sin E/S (canales, descarga TRANS).
+- async_capture: descarga TRANS sobre transportes asyncio.
+- hub: DeviceHub, muchos equipos atendidos desde un bucle selectors.
 """
 
 from graphtec.io.realtime import GraphtecRealtime
 from graphtec.io.capture import GraphtecCapture
+from graphtec.io.gbdfile import GBDFile
 
-__all__ = ["GraphtecRealtime", "GraphtecCapture"]
\ No newline at end of file
+__all__ = ["GraphtecRealtime", "GraphtecCapture", "GBDFile"]
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Descarga TRANS sobre transportes asyncio.
+
+AsyncGraphtecCapture hace la misma transferencia que GraphtecCapture
+(TRANS:OPEN → HEAD → DATA por fragmentos adaptativos con reintentos →
+CLOSE) sobre una conexión asyncio (graphtec.connection.async_connection).
+La secuencia de comandos es la de graphtec.io.protocol, compartida con
+DeviceHub, y reutiliza los parsers de header y los escritores de siempre.
+
+Mientras una descarga espera al enlace, el bucle de eventos puede
+atender a otros equipos; la verificación, decodificación y escritura de
+cada fragmento se hacen en un executor (run_in_executor) para no
+bloquear el bucle. La reanudación por checkpoint y el modo
+pipeline siguen siendo exclusivos de GraphtecCapture.
+"""
+
+import logging
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+from graphtec.io.capture import DEFAULT_FORMATS, GraphtecCapture
+from graphtec.io.chunking import ChunkerConfig
+from graphtec.io.protocol import run_steps_async, trans_download_steps
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["AsyncGraphtecCapture"]
+
+
+class AsyncGraphtecCapture:
+    """Listado y descarga de capturas con una conexión asyncio."""
+
+    MAX_RETRIES = GraphtecCapture.MAX_RETRIES
+
+    def __init__(
+        self,
+        connection,
+        chunk_samples: Optional[int] = None,
+        chunk_bytes: int = 8192,
+        target_rtt: float = 1.0,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            connection: AsyncSerialConnection / AsyncWLANConnection.
+            chunk_samples, chunk_bytes, target_rtt: como en GraphtecCapture.
+            executor: dónde se verifican, decodifican y escriben los
+                fragmentos (None = executor por defecto del bucle).
+        """
+        self.conn = connection
+        self.chunk_config = ChunkerConfig(chunk_samples, chunk_bytes, target_rtt)
+        self.executor = executor
+        self.last_stats: Optional[Dict[str, Any]] = None
+
+    # ============================================================
+    # LISTADO DE ARCHIVOS
+    # ============================================================
+    async def list_files(self, path: str = "\\MEM\\LOG\\", long: bool = True, filt: str = "OFF") -> List[str]:
+        """Igual que GraphtecCapture.list_files."""
+        await self.conn.send(f':FILE:CD "{path}"')
+        await self.conn.send(f":FILE:LIST:FORM {'LONG' if long else 'SHORT'}")
+
+        if isinstance(filt, str) and filt.upper() != "OFF":
+            ext = filt.strip()
+            if not ext.startswith('"'):
+                ext = f'"{ext}"'
+            await self.conn.send(f":FILE:LIST:FILT {ext}")
+        else:
+            await self.conn.send(":FILE:LIST:FILT OFF")
+
+        raw = await self.conn.query(":FILE:LIST?")
+        return GraphtecCapture._parse_file_list(raw)
+
+    # ============================================================
+    # API PÚBLICA DE DESCARGA
+    # ============================================================
+    async def download(
+        self,
+        path_in_gl: str,
+        dest_folder: str,
+        formats: Tuple[str, ...] = DEFAULT_FORMATS,
+    ) -> Optional[Dict[str, str]]:
+        """Igual que GraphtecCapture.download (sin resume)."""
+        return await self._download_core(path_in_gl, dest_folder, tuple(formats))
+
+    async def download_file(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, str]]:
+        return await self._download_core(path_in_gl, dest_folder, ("gbd",))
+
+    async def download_csv(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, str]]:
+        return await self._download_core(path_in_gl, dest_folder, ("csv",))
+
+    async def download_excel(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, str]]:
+        return await self._download_core(path_in_gl, dest_folder, ("xlsx",))
+
+    async def _download_core(
+        self,
+        path_in_gl: str,
+        dest_folder: str,
+        formats: Tuple[str, ...],
+    ) -> Optional[Dict[str, Any]]:
+        self.last_stats = {}
+        steps = trans_download_steps(
+            path_in_gl,
+            dest_folder,
+            formats,
+            self.chunk_config.make,
+            max_retries=self.MAX_RETRIES,
+            stats=self.last_stats,
+        )
+        return await run_steps_async(self.conn, steps, offload=True, executor=self.executor)
@@ -1,21 +1,40 @@
 import os
 import re
-import csv
-import struct
+import time
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Iterator, Callable
 
 from graphtec.io.decoder import (
     parse_head_block,
-    extract_trans_data_block,
-    convert_row_physical,
+    get_conversion_plan,
     build_column_names_with_units,
 )
+from graphtec.connection.arbiter import PRIORITY_BULK, transaction
+from graphtec.io.checkpoint import DownloadCheckpoint
+from graphtec.io.chunking import (
+    BLOCK_OVERHEAD,
+    AdaptiveChunker,
+    ChunkerConfig,
+    FetchRange,
+    run_data_steps,
+    trans_data_steps,
+)
+from graphtec.io.pipeline import TransPipeline
+from graphtec.io.writers import (
+    CaptureChunk,
+    CaptureWriter,
+    CsvWriter,
+    ExcelWriter,
+    HAS_PYARROW,
+    make_writer,
+    pad_header,
+)
 
 logger = logging.getLogger(__name__)
 
-import xlsxwriter
+# Formatos generados por GraphtecCapture.download si no se indican
+DEFAULT_FORMATS: Tuple[str, ...] = ("gbd", "csv", "xlsx") + (("parquet",) if HAS_PYARROW else ())
 
 
 class GraphtecCapture:
@@ -28,6 +47,16 @@ class GraphtecCapture:
             <nombre>.GBD   (GBD reconstruido según especificación oficial)
             <nombre>.csv   (timestamp + valores en unidades físicas)
             <nombre>.xlsx  (igual que CSV pero en Excel)
+            <nombre>.parquet (columnar, requiere pyarrow)
+
+    Una sola transferencia puede alimentar varios formatos (download) y
+    los formatos se pueden regenerar desde .hdr/.bin locales (export_local).
+
+    La descarga es en streaming: cada bloque TRANS se escribe en el .bin
+    y se decodifica hacia los escritores (graphtec.io.writers) en cuanto
+    llega, así que la memoria queda acotada por el tamaño de fragmento.
+    Ese tamaño se adapta al enlace (graphtec.io.chunking) salvo que se
+    fije chunk_samples; las estadísticas quedan en last_stats.
 
     Basado en:
       - GL100 Data Reception Specifications (TRANS / #6****** / status / checksum)
@@ -35,8 +64,39 @@ class GraphtecCapture:
       - Binary translation of voltage data of 4ch voltage temperature (GS-4VT)
     """
 
-    def __init__(self, connection):
+    # Reintentos del mismo rango tras timeout / checksum incorrecto
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        connection,
+        chunk_samples: Optional[int] = None,
+        chunk_bytes: int = 8192,
+        target_rtt: float = 1.0,
+        pipeline: bool = False,
+        pipeline_depth: int = 4,
+    ):
+        """
+        Args:
+            connection: conexión con el GL100.
+            chunk_samples: muestras fijas por cada :TRANS:OUTP:DATA.
+                None (por defecto) = tamaño adaptativo.
+            chunk_bytes: presupuesto inicial de bytes por petición en modo
+                adaptativo (y tamaño de lectura de export_local).
+            target_rtt: RTT (s) objetivo por petición en modo adaptativo.
+            pipeline: si True, un hilo lector pide los bloques TRANS mientras
+                el hilo llamante verifica, decodifica y escribe
+                (graphtec.io.pipeline). La conexión no debe usarse desde
+                otros hilos durante la descarga.
+            pipeline_depth: bloques en vuelo entre lector y escritores.
+        """
         self.conn = connection
+        self.chunk_samples = chunk_samples
+        self.chunk_bytes = chunk_bytes
+        self.target_rtt = target_rtt
+        self.pipeline = pipeline
+        self.pipeline_depth = pipeline_depth
+        self.last_stats: Optional[Dict[str, Any]] = None
 
     # ============================================================
     # LISTADO DE ARCHIVOS
@@ -53,24 +113,26 @@ class GraphtecCapture:
         Returns:
             Lista de nombres de archivo (sin carpetas).
         """
-        # Cambiar de carpeta
-        self.conn.send(f':FILE:CD "{path}"')
-
-        # Seleccionar formato de salida
-        form = "LONG" if long else "SHORT"
-        self.conn.send(f":FILE:LIST:FORM {form}")
-
-        # Filtro
-        if isinstance(filt, str) and filt.upper() != "OFF":
-            ext = filt.strip()
-            if not ext.startswith('"'):
-                ext = f'"{ext}"'
-            self.conn.send(f":FILE:LIST:FILT {ext}")
-        else:
-            self.conn.send(":FILE:LIST:FILT OFF")
-
-        # Obtener listado
-        raw = self.conn.query(":FILE:LIST?")
+        # CD + FORM + FILT + LIST? sin comandos de otros hilos en medio
+        with transaction(self.conn):
+            # Cambiar de carpeta
+            self.conn.send(f':FILE:CD "{path}"')
+
+            # Seleccionar formato de salida
+            form = "LONG" if long else "SHORT"
+            self.conn.send(f":FILE:LIST:FORM {form}")
+
+            # Filtro
+            if isinstance(filt, str) and filt.upper() != "OFF":
+                ext = filt.strip()
+                if not ext.startswith('"'):
+                    ext = f'"{ext}"'
+                self.conn.send(f":FILE:LIST:FILT {ext}")
+            else:
+                self.conn.send(":FILE:LIST:FILT OFF")
+
+            # Obtener listado
+            raw = self.conn.query(":FILE:LIST?")
 
         if not isinstance(raw, str):
             try:
@@ -108,6 +170,207 @@ class GraphtecCapture:
     # ============================================================
     # API PÚBLICA DE DESCARGA
     # ============================================================
+    def download(
+        self,
+        path_in_gl: str,
+        dest_folder: str,
+        formats: Tuple[str, ...] = DEFAULT_FORMATS,
+        resume: bool = False,
+        checkpoint: bool = False,
+    ) -> Optional[Dict[str, str]]:
+        """
+        Descarga un archivo de medida UNA sola vez y genera a la vez
+        todos los formatos pedidos, además de .hdr y .bin.
+
+        Args:
+            path_in_gl: ruta completa en el GL100.
+            dest_folder: carpeta local destino.
+            formats: cualquier combinación de "gbd", "csv", "xlsx", "parquet".
+                Por defecto todos (parquet solo si pyarrow está instalado).
+            resume: si True y existe un checkpoint (<nombre>.ckpt) válido de
+                una descarga anterior interrumpida, solo se piden las
+                muestras que faltan (ver graphtec.io.checkpoint). Implica
+                checkpoint=True.
+            checkpoint: mantener el checkpoint (<nombre>.ckpt) durante la
+                descarga para poder reanudarla con resume=True si se corta.
+                Por defecto no se crea.
+
+        Returns:
+            {"folder", "hdr", "bin", <formato>: ruta, ...} o None si falla
+            ("ckpt" también en modo reanudable).
+        """
+        return self._download_core(
+            path_in_gl,
+            dest_folder,
+            formats=tuple(formats),
+            resume=resume,
+            checkpoint=checkpoint,
+        )
+
+    def sync(
+        self,
+        path_in_gl: str,
+        dest_folder: str,
+        formats: Tuple[str, ...] = ("csv",),
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Actualiza una descarga local de un archivo que sigue creciendo
+        (p. ej. el de get_data_filepath durante una medida larga).
+
+        Relee Counts del header TRANS y pide solo [muestras locales + 1,
+        Counts], añadiéndolas en su sitio a .bin, CSV y GBD (cuya header
+        region se reescribe con el nuevo Counts). Parquet añade un archivo
+        parte <nombre>.<muestra>.parquet; xlsx no se puede ampliar y se
+        regenera entero desde el .bin local.
+
+        La primera llamada (sin checkpoint) descarga todo. El .bin local
+        solo se valida por tamaño, así que el coste de cada refresco es
+        proporcional a lo nuevo, no al tamaño del archivo.
+
+        Returns:
+            Igual que download(), más "samples" (total local) y
+            "new_samples" (recibidas en esta llamada).
+        """
+        return self._download_core(
+            path_in_gl,
+            dest_folder,
+            formats=tuple(formats),
+            resume=True,
+            verify_crc=False,
+        )
+
+    def export_local(
+        self,
+        source: str,
+        formats: Tuple[str, ...] = DEFAULT_FORMATS,
+    ) -> Optional[Dict[str, str]]:
+        """
+        Regenera formatos a partir de un .hdr y .bin ya descargados,
+        sin comunicarse con el dispositivo.
+
+        Args:
+            source: ruta al .hdr, al .bin o a la carpeta <nombre>/ generada
+                por una descarga previa, o a un .GBD local (ver GBDFile).
+            formats: formatos a generar ("gbd", "csv", "xlsx", "parquet").
+
+        Returns:
+            {"folder", "hdr", "bin", <formato>: ruta, ...} ({"folder",
+            "gbd", ...} para un .GBD) o None si falta algún fichero o el
+            header no es válido.
+        """
+        if os.path.isfile(source) and source.lower().endswith(".gbd"):
+            return self._export_gbd(source, formats)
+
+        hdr_path, bin_path = self._locate_local(source)
+        if not (os.path.isfile(hdr_path) and os.path.isfile(bin_path)):
+            logger.error(f"[GraphtecCapture] No se encuentran {hdr_path} / {bin_path}")
+            return None
+
+        folder = os.path.dirname(hdr_path)
+        base_name = os.path.splitext(os.path.basename(hdr_path))[0]
+
+        with open(hdr_path, "r", encoding="utf-8") as f:
+            meta = self._parse_header(f.read())
+
+        if not meta["order"] or meta["counts"] <= 0:
+            logger.error("[GraphtecCapture] Header sin Order o Counts válidos.")
+            return None
+
+        # El .bin es la fuente: nunca se reescribe
+        writers = self._make_writers(
+            tuple(f for f in formats if f.lower().lstrip(".") != "bin"),
+            folder,
+            base_name,
+        )
+
+        result = {"folder": folder, "hdr": hdr_path, "bin": bin_path}
+        with open(bin_path, "rb") as fbin:
+            self._run_writers(writers, meta, self._iter_file_chunks(fbin, meta))
+
+        for fmt, w in writers.items():
+            result[fmt] = w.path
+            logger.info(f"[GraphtecCapture] {fmt.upper()} regenerado en {w.path}")
+
+        return result
+
+    def _export_gbd(self, gbd_path: str, formats: Tuple[str, ...]) -> Optional[Dict[str, str]]:
+        """export_local de un .GBD: los fragmentos salen del mapeo, sin copiar."""
+        from graphtec.io.gbdfile import GBDFile
+
+        try:
+            gbd = GBDFile(gbd_path)
+        except ValueError as e:
+            logger.error(f"[GraphtecCapture] {e}")
+            return None
+
+        folder = os.path.dirname(gbd_path)
+        base_name = os.path.splitext(os.path.basename(gbd_path))[0]
+        # El .GBD es la fuente: nunca se reescribe
+        writers = self._make_writers(
+            tuple(f for f in formats if f.lower().lstrip(".") not in ("gbd", "bin")),
+            folder,
+            base_name,
+        )
+
+        result = {"folder": folder, "gbd": gbd_path}
+        with gbd:
+            step = self._local_chunk_samples(gbd.bytes_per_sample)
+            meta = dict(gbd.meta, counts=gbd.counts)
+            self._run_writers(writers, meta, gbd.iter_chunks(step))
+
+        for fmt, w in writers.items():
+            result[fmt] = w.path
+            logger.info(f"[GraphtecCapture] {fmt.upper()} regenerado en {w.path}")
+
+        return result
+
+    @staticmethod
+    def _locate_local(source: str) -> Tuple[str, str]:
+        """Rutas (.hdr, .bin) a partir de un .hdr, un .bin o su carpeta."""
+        if os.path.isdir(source):
+            base_name = os.path.basename(os.path.normpath(source))
+            stem = os.path.join(source, base_name)
+        else:
+            stem = os.path.splitext(source)[0]
+        return stem + ".hdr", stem + ".bin"
+
+    def _iter_file_chunks(
+        self,
+        fbin,
+        meta: Dict[str, Any],
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Lee las muestras [start, stop) de un .bin local por fragmentos
+        sobre un buffer reutilizable (mismo contrato que
+        _iter_data_chunks). Sin stop lee hasta Counts.
+        """
+        bytes_per_sample = meta["bytes_per_sample"]
+        if stop is None:
+            stop = meta["counts"]
+        target_bytes = stop * bytes_per_sample
+        buf = bytearray(self._local_chunk_samples(bytes_per_sample) * bytes_per_sample)
+        view = memoryview(buf)
+
+        received = start * bytes_per_sample
+        fbin.seek(received)
+        while received < target_bytes:
+            want = min(len(buf), target_bytes - received)
+            n = fbin.readinto(view[:want])
+            n -= n % bytes_per_sample
+            if n <= 0:
+                break
+            yield received // bytes_per_sample, view[:n]
+            received += n
+
+        if received < target_bytes:
+            logger.warning(
+                "[GraphtecCapture] El .bin local solo tiene %d bytes (esperados %d).",
+                received,
+                target_bytes,
+            )
+
     def download_file(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, str]]:
         """
         Descarga un archivo de medida del GL100 y genera:
@@ -121,30 +384,7 @@ class GraphtecCapture:
             path_in_gl: ruta completa en el GL100, p.ej. "\\MEM\\LOG\\251130-110423.GBD"
             dest_folder: carpeta local destino.
         """
-        core = self._download_core(path_in_gl, dest_folder)
-        if core is None:
-            return None
-
-        folder = core["folder"]
-        base_name = core["base_name"]
-        hdr_path = core["hdr_path"]
-        bin_path = core["bin_path"]
-        header_text = core["header_text"]
-        data_bytes = core["data_bytes"]
-        header_siz = core["header_siz"]
-
-        gbd_path = os.path.join(folder, base_name + ".GBD")
-        gbd_bytes = self._build_gbd_file(header_text, data_bytes, header_siz)
-        with open(gbd_path, "wb") as fgbd:
-            fgbd.write(gbd_bytes)
-        logger.info(f"[GraphtecCapture] GBD reconstruido guardado en {gbd_path}")
-
-        return {
-            "folder": folder,
-            "hdr": hdr_path,
-            "bin": bin_path,
-            "gbd": gbd_path,
-        }
+        return self._download_core(path_in_gl, dest_folder, formats=("gbd",))
 
     def download_csv(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, str]]:
         """
@@ -156,36 +396,7 @@ class GraphtecCapture:
 
         NO genera GBD ni Excel.
         """
-        core = self._download_core(path_in_gl, dest_folder)
-        if core is None:
-            return None
-
-        folder = core["folder"]
-        base_name = core["base_name"]
-        hdr_path = core["hdr_path"]
-        bin_path = core["bin_path"]
-
-        csv_path = os.path.join(folder, base_name + ".csv")
-
-        self._data_to_csv(
-            data_bytes=core["data_bytes"],
-            csv_path=csv_path,
-            order=core["order"],
-            counts=core["counts"],
-            start_dt=core["start_dt"],
-            delta=core["sample_delta"],
-            amp_info=core["amp_info"],
-            spans=core["spans"],
-            module=core["module"],
-        )
-        logger.info(f"[GraphtecCapture] CSV generado en {csv_path}")
-
-        return {
-            "folder": folder,
-            "hdr": hdr_path,
-            "bin": bin_path,
-            "csv": csv_path,
-        }
+        return self._download_core(path_in_gl, dest_folder, formats=("csv",))
 
     def download_excel(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, str]]:
         """
@@ -197,53 +408,44 @@ class GraphtecCapture:
 
         NO genera GBD ni CSV.
         """
-        core = self._download_core(path_in_gl, dest_folder)
-        if core is None:
-            return None
-
-        folder = core["folder"]
-        base_name = core["base_name"]
-        hdr_path = core["hdr_path"]
-        bin_path = core["bin_path"]
-
-        xlsx_path = os.path.join(folder, base_name + ".xlsx")
-
-        self._data_to_excel(
-            data_bytes=core["data_bytes"],
-            xlsx_path=xlsx_path,
-            order=core["order"],
-            counts=core["counts"],
-            start_dt=core["start_dt"],
-            delta=core["sample_delta"],
-            amp_info=core["amp_info"],
-            spans=core["spans"],
-            module=core["module"],
-        )
-        logger.info(f"[GraphtecCapture] Excel generado en {xlsx_path}")
-
-        return {
-            "folder": folder,
-            "hdr": hdr_path,
-            "bin": bin_path,
-            "xlsx": xlsx_path,
-        }
+        return self._download_core(path_in_gl, dest_folder, formats=("xlsx",))
 
     # ============================================================
-    # PIPELINE CORE: TRANS + HEADER + DATA
+    # PIPELINE CORE: TRANS + HEADER + DATA (streaming)
     # ============================================================
-    def _download_core(self, path_in_gl: str, dest_folder: str) -> Optional[Dict[str, Any]]:
+    def _download_core(
+        self,
+        path_in_gl: str,
+        dest_folder: str,
+        formats: Tuple[str, ...] = (),
+        resume: bool = False,
+        verify_crc: bool = True,
+        checkpoint: bool = False,
+    ) -> Optional[Dict[str, Any]]:
         """
         Lógica común de descarga vía TRANS:
 
           - Abre TRANS.
           - Lee header y lo guarda (.hdr).
           - Parsear metadatos (Order, Counts, Sample, Start, Amp, Span, UnitOrder).
-          - Descarga datos puros y los guarda (.bin).
+          - Solo con checkpoint (o resume, que lo implica) se mantiene el
+            .ckpt. Si resume y el checkpoint es válido, reutiliza las
+            muestras ya presentes en el .bin (y continúa los archivos de
+            los escritores que lo permiten; el resto se regenera desde
+            el .bin local).
+          - Descarga los datos (restantes) por fragmentos y cada fragmento
+            se pasa directamente a los escritores (.bin + formats),
+            actualizando el checkpoint si lo hay.
           - Cierra TRANS.
 
-        Devuelve un diccionario con toda la info necesaria para
-        generar GBD, CSV o Excel.
+        La memoria usada queda acotada por el tamaño de fragmento, no
+        por el tamaño del archivo.
+
+        Devuelve un diccionario con las rutas generadas
+        ("folder", "hdr", "bin", "ckpt" en modo reanudable y una clave
+        por formato) más "samples" y "new_samples".
         """
+        checkpoint = checkpoint or resume
         base = os.path.basename(path_in_gl)
         base_name = os.path.splitext(base)[0]
 
@@ -251,24 +453,23 @@ class GraphtecCapture:
         os.makedirs(out_dir, exist_ok=True)
 
         hdr_path = os.path.join(out_dir, base_name + ".hdr")
-        bin_path = os.path.join(out_dir, base_name + ".bin")
+
+        # Validar formatos antes de tocar el dispositivo
+        writers = self._make_writers(("bin",) + tuple(formats), out_dir, base_name)
 
         logger.info(f"[GraphtecCapture] Descargando {path_in_gl} → {out_dir}")
 
-        # 1) Seleccionar archivo como fuente de TRANS
-        self.conn.send(f':TRANS:SOUR DISK,"{path_in_gl}"')
+        # La descarga no retiene la conexión: cada paso TRANS es una
+        # transacción PRIORITY_BULK y entre dos fragmentos pueden entrar
+        # lecturas en tiempo real u otras consultas (graphtec.connection.arbiter).
+        with transaction(self.conn, PRIORITY_BULK):
+            # 1) Seleccionar archivo como fuente de TRANS
+            self.conn.send(f':TRANS:SOUR DISK,"{path_in_gl}"')
 
-        # 2) Abrir TRANS
-        resp = self.conn.query(":TRANS:OPEN?")
+            # 2) Abrir TRANS
+            resp = self.conn.query(":TRANS:OPEN?")
         logger.debug(f"[GraphtecCapture] Respuesta apertura Trans: {resp}")
-        ok = False
-        if isinstance(resp, bytes) and len(resp) == 3:
-            # bit 0 de tercer byte = error
-            ok = not (resp[2] & 0x01)
-        elif isinstance(resp, str):
-            ok = "OK" in resp.upper()
-
-        if not ok:
+        if not self._trans_open_ok(resp):
             logger.error(f"[GraphtecCapture] TRANS:OPEN? falló → {resp}")
             return None
 
@@ -282,66 +483,203 @@ class GraphtecCapture:
             logger.info(f"[GraphtecCapture] Header guardado en {hdr_path}")
 
             # 4) Parsear metadatos del header
-            order = self._extract_order(header_text)
-            counts = self._extract_counts(header_text)
-            sample_delta = self._extract_sample_delta(header_text)
-            start_dt = self._extract_start_datetime(header_text)
-            amp_info = self._extract_amp_info(header_text)
-            spans = self._extract_spans(header_text)
-            module = self._extract_module(header_text)
-            header_siz = self._extract_header_size(header_text)
+            meta = self._parse_header(header_text)
+            order = meta["order"]
+            counts = meta["counts"]
 
             if not order or counts <= 0:
                 logger.error("[GraphtecCapture] Header sin Order o Counts válidos.")
                 return None
 
-            bytes_per_sample = len(order) * 2
-            total_bytes_expected = counts * bytes_per_sample
-
             logger.info(
                 "[GraphtecCapture] order=%s, counts=%d, bytes/row=%d, module=%s",
                 order,
                 counts,
-                bytes_per_sample,
-                module,
+                meta["bytes_per_sample"],
+                meta["module"],
             )
 
-            # 5) Descargar datos puros → .bin (sin cabecera #6, ni status, ni checksum)
-            data_bytes = self._download_data_bytes(counts, bytes_per_sample)
+            # 5) Checkpoint (solo en modo reanudable): ¿hay muestras ya verificadas en el .bin?
+            bin_writer = writers["bin"]
+            bps = meta["bytes_per_sample"]
+            result: Dict[str, Any] = {"folder": out_dir, "hdr": hdr_path}
+            ckpt: Optional[DownloadCheckpoint] = None
+            on_chunk: Optional[Callable[[int, Any], None]] = None
+            done = replay_from = 0
+            if checkpoint:
+                ckpt = DownloadCheckpoint.for_bin(bin_writer.path)
+                done = self._checkpoint_resume_point(
+                    ckpt, bin_writer.path, header_text, meta, resume, verify_crc
+                )
+                replay_from = self._resume_writers(writers, ckpt, done)
+                ckpt.snapshot(writers)
+                ckpt.save()
+                result["ckpt"] = ckpt.path
+
+                def on_chunk(first: int, raw: Any) -> None:
+                    ckpt.advance(first, raw)
+                    if ckpt.due():
+                        ckpt.snapshot(writers)
+                        ckpt.save()
+
+            # 6) Prefijo local (escritores atrasados) + datos restantes → escritores
+            try:
+                total = self._run_writers(
+                    writers,
+                    meta,
+                    self._iter_resumed_chunks(meta, bin_writer.path, replay_from, done),
+                    on_chunk=on_chunk,
+                )
+            finally:
+                if ckpt is not None:
+                    # Los escritores ya están cerrados: el .bin está en disco
+                    # y su estado (también tras un fallo) es el último fragmento entero
+                    ckpt.snapshot(writers)
+                    ckpt.complete = ckpt.samples >= counts
+                    ckpt.save()
+            samples = ckpt.samples if ckpt is not None else total // bps
+
+            for fmt, w in writers.items():
+                result[fmt] = w.path
+                logger.info(f"[GraphtecCapture] {fmt.upper()} generado en {w.path}")
+
+            result["samples"] = samples
+            result["new_samples"] = samples - done
+            logger.info(
+                "[GraphtecCapture] Descargados %d bytes (esperados %d bytes)",
+                (samples - done) * bps,
+                (counts - done) * bps,
+            )
+            if self.last_stats:
+                logger.info(
+                    "[GraphtecCapture] %d peticiones, %d reintentos, fragmentos %s",
+                    self.last_stats["requests"],
+                    self.last_stats["retries"],
+                    self.last_stats["chunk_sizes"],
+                )
+            return result
+
+        finally:
+            # 7) Cerrar TRANS siempre
+            with transaction(self.conn, PRIORITY_BULK):
+                self.conn.send(":TRANS:CLOSE?")
+                try:
+                    self.conn.read_ascii()
+                except Exception:
+                    pass
 
-            with open(bin_path, "wb") as fout_bin:
-                fout_bin.write(data_bytes)
+    @staticmethod
+    def _checkpoint_resume_point(
+        ckpt: DownloadCheckpoint,
+        bin_path: str,
+        header_text: str,
+        meta: Dict[str, Any],
+        resume: bool,
+        verify_crc: bool,
+    ) -> int:
+        """
+        Muestras ya verificadas en el .bin que se pueden reutilizar (0 si
+        no se reanuda o el checkpoint no vale; en ese caso se reinicia).
+        """
+        counts = meta["counts"]
+        done = 0
+        if resume:
+            done = ckpt.resume_point(header_text, meta["bytes_per_sample"], bin_path, verify_crc=verify_crc)
+            if done > counts:
+                logger.warning(
+                    "[GraphtecCapture] El checkpoint tiene %d muestras y el header %d; "
+                    "se descarga desde el principio.",
+                    done,
+                    counts,
+                )
+                done = 0
+        if done:
             logger.info(
-                "[GraphtecCapture] BIN guardado en %s (%d bytes, esperado %d bytes)",
-                bin_path,
-                len(data_bytes),
-                total_bytes_expected,
+                "[GraphtecCapture] Reanudando descarga en la muestra %d de %d.",
+                done + 1,
+                counts,
             )
+        else:
+            ckpt.start(header_text, meta["bytes_per_sample"])
+        return done
 
-            return {
-                "folder": out_dir,
-                "base_name": base_name,
-                "hdr_path": hdr_path,
-                "bin_path": bin_path,
-                "header_text": header_text,
-                "data_bytes": data_bytes,
-                "order": order,
-                "counts": counts,
-                "sample_delta": sample_delta,
-                "start_dt": start_dt,
-                "amp_info": amp_info,
-                "spans": spans,
-                "module": module,
-                "header_siz": header_siz,
-            }
+    @staticmethod
+    def _trans_open_ok(resp: Any) -> bool:
+        """Interpreta la respuesta de :TRANS:OPEN? (3 bytes; bit 0 del tercero = error)."""
+        if isinstance(resp, bytes) and len(resp) == 3:
+            return not (resp[2] & 0x01)
+        if isinstance(resp, str):
+            return "OK" in resp.upper()
+        return False
+
+    @staticmethod
+    def _make_writers(formats: Tuple[str, ...], folder: str, base_name: str) -> Dict[str, CaptureWriter]:
+        """Un escritor por formato (sin duplicados, respetando el orden)."""
+        writers: Dict[str, CaptureWriter] = {}
+        for fmt in formats:
+            w = make_writer(fmt, folder, base_name)
+            key = w.extension.lstrip(".").lower()
+            if key not in writers:
+                writers[key] = w
+        return writers
+
+    @staticmethod
+    def _resume_writers(
+        writers: Dict[str, CaptureWriter],
+        ckpt: DownloadCheckpoint,
+        done: int,
+    ) -> int:
+        """
+        Indica a cada escritor desde dónde continúa su archivo: el .bin
+        desde 'done'; los que pueden continuar, desde su estado en el
+        checkpoint; el resto desde 0.
 
+        Devuelve la primera muestra que hay que releer del .bin local.
+        """
+        replay_from = done
+        for key, w in writers.items():
+            if key == "bin":
+                w.resume_from(done)
+                continue
+            state = ckpt.writers.get(key) if done else None
+            if w.appendable and state and 0 < state.get("samples", 0) <= done:
+                w.resume_from(state["samples"], state.get("offset"))
+            else:
+                ckpt.writers.pop(key, None)
+            replay_from = min(replay_from, w.resume_samples)
+        return replay_from
+
+    @staticmethod
+    def _run_writers(
+        writers: Dict[str, CaptureWriter],
+        meta: Dict[str, Any],
+        chunks: Iterator[Tuple[int, Any]],
+        on_chunk: Optional[Callable[[int, Any], None]] = None,
+    ) -> int:
+        """
+        Reparte cada fragmento (first, raw) entre todos los escritores
+        (cada uno ignora lo que ya tiene, ver CaptureWriter.feed) y,
+        después, llama a on_chunk(first, raw) si se indica.
+        Devuelve el número de bytes de datos procesados.
+        """
+        total = 0
+        opened: List[CaptureWriter] = []
+        try:
+            for w in writers.values():
+                w.open(meta)
+                opened.append(w)
+
+            for first, raw in chunks:
+                chunk = CaptureChunk(meta, first, raw)
+                for w in opened:
+                    w.feed(chunk)
+                if on_chunk is not None:
+                    on_chunk(first, raw)
+                total += len(raw)
         finally:
-            # 6) Cerrar TRANS siempre
-            self.conn.send(":TRANS:CLOSE?")
-            try:
-                self.conn.read_ascii()
-            except Exception:
-                pass
+            for w in opened:
+                w.close()
+        return total
 
     # ============================================================
     # LECTURA DEL HEADER TRANS (#6****** + header ASCII)
@@ -355,7 +693,8 @@ class GraphtecCapture:
 
         Sin status ni checksum.
         """
-        block = self.conn.query(":TRANS:OUTP:HEAD?")
+        with transaction(self.conn, PRIORITY_BULK):
+            block = self.conn.query(":TRANS:OUTP:HEAD?")
         logger.debug(f"[GraphtecCapture] Bloque HEAD recibido: {block}")
         if not isinstance(block, bytes):
             raise RuntimeError("[GraphtecCapture] HEAD devolvió datos no binarios.")
@@ -365,6 +704,33 @@ class GraphtecCapture:
     # ============================================================
     # PARSERS DE HEADER (GBD File Specification)
     # ============================================================
+    @classmethod
+    def _parse_header(cls, header_text: str) -> Dict[str, Any]:
+        """
+        Parsea todos los metadatos necesarios para decodificar/exportar:
+        Order, Counts, Sample, Start, Amp, Span, UnitOrder y HeaderSiz,
+        más el plan de conversión y los nombres de columna.
+        """
+        order = cls._extract_order(header_text)
+        amp_info = cls._extract_amp_info(header_text)
+        spans = cls._extract_spans(header_text)
+        module = cls._extract_module(header_text)
+
+        return {
+            "header_text": header_text,
+            "order": order,
+            "counts": cls._extract_counts(header_text),
+            "sample_delta": cls._extract_sample_delta(header_text),
+            "start_dt": cls._extract_start_datetime(header_text),
+            "amp_info": amp_info,
+            "spans": spans,
+            "module": module,
+            "header_siz": cls._extract_header_size(header_text),
+            "bytes_per_sample": len(order) * 2,
+            "plan": get_conversion_plan(order, amp_info, spans, module),
+            "columns": build_column_names_with_units(order, amp_info),
+        }
+
     @staticmethod
     def _extract_header_size(hdr: str) -> int:
         """
@@ -513,68 +879,146 @@ class GraphtecCapture:
     # ============================================================
     # DESCARGA DE DATOS PUROS (BIN) VÍA TRANS
     # ============================================================
-    def _download_data_bytes(self, counts: int, bytes_per_sample: int) -> bytes:
+    @property
+    def chunk_config(self) -> ChunkerConfig:
+        """Configuración de fragmentos actual (chunk_samples, chunk_bytes, target_rtt)."""
+        return ChunkerConfig(self.chunk_samples, self.chunk_bytes, self.target_rtt)
+
+    def _make_chunker(self, bytes_per_sample: int) -> AdaptiveChunker:
+        """Controlador de tamaño de fragmento para una descarga."""
+        return self.chunk_config.make(bytes_per_sample)
+
+    def _local_chunk_samples(self, bytes_per_sample: int) -> int:
+        """Muestras por fragmento al trabajar sin dispositivo."""
+        return self.chunk_config.local_samples(bytes_per_sample)
+
+    def _iter_resumed_chunks(
+        self,
+        meta: Dict[str, Any],
+        bin_path: str,
+        replay_from: int,
+        done: int,
+    ) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Fragmentos de una descarga reanudada: primero las muestras
+        [replay_from, done) del .bin local (para los escritores que van
+        atrasados), luego el resto pedido por TRANS.
+        """
+        if replay_from < done:
+            with open(bin_path, "rb") as fbin:
+                yield from self._iter_file_chunks(fbin, meta, start=replay_from, stop=done)
+        yield from self._iter_data_chunks(meta, start=done)
+
+    def _iter_data_chunks(self, meta: Dict[str, Any], start: int = 0) -> Iterator[Tuple[int, memoryview]]:
         """
-        Descarga la región de datos completa usando:
+        Descarga la región de datos por fragmentos usando:
 
             :TRANS:OUTP:DATA <START>,<END>
             :TRANS:OUTP:DATA?
 
-        y devuelve exclusivamente la parte de datos (Data) de los
-        bloques #6****** (sin status ni checksum), concatenada.
+        y va entregando (índice 0-based de la primera muestra, DATA) de
+        cada bloque #6****** (sin status ni checksum).
 
-        Se asegura de no devolver más de counts * bytes_per_sample bytes.
-        """
-        target_bytes = counts * bytes_per_sample
-        buf = bytearray()
+        Rangos, reintentos y verificación los decide trans_data_steps
+        (graphtec.io.chunking), igual que en el resto de caminos de
+        descarga; aquí solo se hace la E/S. Las estadísticas quedan en
+        last_stats.
 
-        first = 1
-        chunk_samples = 1000  # tamaño razonable
+        Cada DATA es una vista dentro de un buffer reutilizable: solo es
+        válida hasta la siguiente iteración.
 
-        while first <= counts and len(buf) < target_bytes:
-            last = min(first + chunk_samples - 1, counts)
-            self.conn.send(f":TRANS:OUTP:DATA {first},{last}")
-            block = self.conn.query(":TRANS:OUTP:DATA?")
+        start: muestras (0-based) que ya se tienen; se pide desde start + 1.
+
+        Con pipeline=True delega en TransPipeline (mismo contrato).
+        """
+        if self.pipeline:
+            yield from self._iter_data_chunks_pipelined(meta, start)
+            return
+
+        chunker = self._make_chunker(meta["bytes_per_sample"])
+        self.last_stats = chunker.stats()
+        steps = trans_data_steps(meta, chunker, self.MAX_RETRIES, start, stats=self.last_stats)
+
+        block_buf = bytearray(chunker.samples * meta["bytes_per_sample"] + BLOCK_OVERHEAD)
+
+        def fetch(req: FetchRange) -> Any:
+            nonlocal block_buf
+            if len(block_buf) < req.size:
+                block_buf = bytearray(req.size)
+            t0 = time.monotonic()
+            block = self._fetch_data_range(req.first, req.last, block_buf)
             logger.debug(
-                f"[GraphtecCapture] Bloque DATA recibido ({first}-{last}): {block}"
+                f"[GraphtecCapture] Bloque DATA recibido ({req.first}-{req.last}) "
+                f"en {time.monotonic() - t0:.3f}s"
             )
+            return block
 
-            if not isinstance(block, bytes):
-                logger.error(
-                    "[GraphtecCapture] TRANS:OUTP:DATA? devolvió datos no binarios."
-                )
-                break
-
-            data, status, checksum_ok = extract_trans_data_block(block)
+        yield from run_data_steps(steps, fetch, self._resync)
 
-            if not data:
-                logger.warning(
-                    "[GraphtecCapture] Bloque DATA vacío en rango %d-%d, deteniendo descarga.",
-                    first,
-                    last,
-                )
-                break
+    def _iter_data_chunks_pipelined(
+        self,
+        meta: Dict[str, Any],
+        start: int = 0,
+    ) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Igual que _iter_data_chunks, pero con un hilo lector dedicado a
+        la conexión y una cola acotada de bloques (TransPipeline).
+        """
+        pipe = TransPipeline(
+            self._fetch_data_range,
+            self._make_chunker(meta["bytes_per_sample"]),
+            meta["counts"],
+            meta["bytes_per_sample"],
+            depth=self.pipeline_depth,
+            max_retries=self.MAX_RETRIES,
+            start=start,
+            resync=self._resync,
+        )
+        self.last_stats = pipe.stats()
+        try:
+            for item in pipe:
+                yield item
+        finally:
+            self.last_stats = pipe.stats()
 
-            buf.extend(data)
+    def _fetch_data_range(self, first: int, last: int, buffer: bytearray) -> Any:
+        """Pide el rango [first, last] y devuelve el bloque #6****** crudo."""
+        with transaction(self.conn, PRIORITY_BULK):
+            self.conn.send(f":TRANS:OUTP:DATA {first},{last}")
+            return self._query_block(":TRANS:OUTP:DATA?", buffer)
 
-            first = last + 1
+    def _resync(self) -> None:
+        """
+        Antes de reintentar un rango descarta lo pendiente en la línea
+        (p. ej. el resto de un bloque que llegó tarde), para que no se
+        tome como el principio de la respuesta siguiente.
+        """
+        flush = getattr(self.conn, "flush_buffer", None)
+        if flush is None:
+            return
+        with transaction(self.conn, PRIORITY_BULK):
+            flush()
 
-        # Ajustar a tamaño esperado
-        if len(buf) > target_bytes:
-            logger.warning(
-                "[GraphtecCapture] Recibidos %d bytes, truncando a %d bytes.",
-                len(buf),
-                target_bytes,
-            )
-            buf = buf[:target_bytes]
-        elif len(buf) < target_bytes:
-            logger.warning(
-                "[GraphtecCapture] Recibidos solo %d bytes (esperados %d).",
-                len(buf),
-                target_bytes,
-            )
+    def _download_data_bytes(self, counts: int, bytes_per_sample: int) -> bytearray:
+        """
+        Descarga la región de datos completa en memoria.
+        Preferir _iter_data_chunks para archivos grandes.
+        """
+        meta = {"counts": counts, "bytes_per_sample": bytes_per_sample}
+        buf = bytearray()
+        for _, data in self._iter_data_chunks(meta):
+            buf += data
+        return buf
 
-        return bytes(buf)
+    def _query_block(self, command: str, buffer: bytearray) -> Any:
+        """
+        Lanza una consulta binaria usando el buffer reutilizable de la
+        conexión si ésta lo soporta (query_into); si no, query().
+        """
+        query_into = getattr(self.conn, "query_into", None)
+        if query_into is not None:
+            return query_into(command, buffer)
+        return self.conn.query(command)
 
     # ============================================================
     # RECONSTRUCCIÓN DE GBD
@@ -588,21 +1032,55 @@ class GraphtecCapture:
         Header region: texto ASCII tal cual devuelto por HEAD.
         Padding: espacios (0x20) hasta HeaderSiz bytes totales.
         """
-        header_bytes = header_text.encode("ascii", errors="ignore")
+        return pad_header(header_text, header_siz) + data_bytes
+
+    # ============================================================
+    # DATOS EN MEMORIA → FRAGMENTOS
+    # ============================================================
+    @staticmethod
+    def _table_meta(
+        order: List[str],
+        counts: int,
+        start_dt: Optional[datetime],
+        delta: timedelta,
+        amp_info: Dict[str, Dict[str, str]],
+        spans: Dict[str, Tuple[int, int]],
+        module: str,
+    ) -> Dict[str, Any]:
+        """Metadatos mínimos para decodificar/exportar sin header completo."""
+        return {
+            "order": order,
+            "counts": counts,
+            "sample_delta": delta,
+            "start_dt": start_dt,
+            "amp_info": amp_info,
+            "spans": spans,
+            "module": module,
+            "bytes_per_sample": len(order) * 2,
+            "plan": get_conversion_plan(order, amp_info, spans, module),
+            "columns": build_column_names_with_units(order, amp_info),
+        }
+
+    def _iter_memory_chunks(self, data_bytes: Any, meta: Dict[str, Any]) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Trocea una región de datos ya en memoria en fragmentos
+        (vistas, sin copia).
+        """
+        bytes_per_sample = meta["bytes_per_sample"]
+        n_samples = min(meta["counts"], len(data_bytes) // bytes_per_sample)
 
-        if len(header_bytes) > header_siz:
+        if n_samples < meta["counts"]:
             logger.warning(
-                "[GraphtecCapture] header_bytes (%d) > HeaderSiz (%d). "
-                "Guardando sin recortar (puede no ser estándar).",
-                len(header_bytes),
-                header_siz,
+                "[GraphtecCapture] Solo hay datos para %d muestras (header indicaba %d).",
+                n_samples,
+                meta["counts"],
             )
-            padded = header_bytes
-        else:
-            pad_len = header_siz - len(header_bytes)
-            padded = header_bytes + b" " * pad_len
 
-        return padded + data_bytes
+        view = memoryview(data_bytes)
+        step = self._local_chunk_samples(bytes_per_sample)
+        for first in range(0, n_samples, step):
+            last = min(first + step, n_samples)
+            yield first, view[first * bytes_per_sample:last * bytes_per_sample]
 
     # ============================================================
     # DECODIFICAR DATA → TABLA (timestamps + columnas + filas)
@@ -619,50 +1097,26 @@ class GraphtecCapture:
         module: str,
     ) -> Tuple[List[Optional[datetime]], List[str], List[List[Optional[float]]]]:
         """
-        Convierte data_bytes (pure data, 16-bit big-endian) en una tabla:
+        Convierte data_bytes (pure data, 16-bit big-endian) en una tabla
+        completa en memoria:
 
             - lista de timestamps (o None)
             - lista de nombres de columna
             - lista de filas físicas
 
-        Esta función es común para CSV y Excel.
+        Las exportaciones usan los escritores en streaming; esta función
+        se mantiene para quien necesite la tabla entera.
         """
-        n_items = len(order)
-        bytes_per_sample = n_items * 2
-
-        total_bytes = len(data_bytes)
-        max_samples_from_bytes = total_bytes // bytes_per_sample
-        n_samples = min(counts, max_samples_from_bytes)
-
-        if max_samples_from_bytes < counts:
-            logger.warning(
-                "[GraphtecCapture] Solo hay datos para %d muestras (header indicaba %d).",
-                max_samples_from_bytes,
-                counts,
-            )
+        meta = self._table_meta(order, counts, start_dt, delta, amp_info, spans, module)
 
+        timestamps: List[Optional[datetime]] = []
         rows_phys: List[List[Optional[float]]] = []
-        for i in range(n_samples):
-            base = i * bytes_per_sample
-            raw_row = struct.unpack_from(f">{n_items}h", data_bytes, base)
-            phys_row = convert_row_physical(
-                module=module,
-                order=order,
-                raw_row=raw_row,
-                amp_info=amp_info,
-                spans=spans,
-            )
-            rows_phys.append(phys_row)
-
-        # timestamps
-        if start_dt is None:
-            timestamps: List[Optional[datetime]] = [None for _ in range(n_samples)]
-        else:
-            timestamps = [start_dt + i * delta for i in range(n_samples)]
+        for first, raw in self._iter_memory_chunks(data_bytes, meta):
+            chunk = CaptureChunk(meta, first, raw)
+            timestamps.extend(chunk.timestamps())
+            rows_phys.extend(chunk.rows())
 
-        cols = build_column_names_with_units(order, amp_info)
-
-        return timestamps, cols, rows_phys
+        return timestamps, meta["columns"], rows_phys
 
     # ============================================================
     # GENERACIÓN DEL CSV
@@ -682,25 +1136,12 @@ class GraphtecCapture:
         """
         Genera un CSV a partir de los datos crudos y la metadata.
         """
-        timestamps, cols, rows_phys = self._decode_to_table(
-                                                            data_bytes=data_bytes,
-                                                            order=order,
-                                                            counts=counts,
-                                                            start_dt=start_dt,
-                                                            delta=delta,
-                                                            amp_info=amp_info,
-                                                            spans=spans,
-                                                            module=module,
-                                                        )
-
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["TimeStamp"] + cols)
-            for ts, row in zip(timestamps, rows_phys):
-                if ts is None:
-                    w.writerow([""] + list(row))
-                else:
-                    w.writerow([ts.isoformat()] + list(row))
+        meta = self._table_meta(order, counts, start_dt, delta, amp_info, spans, module)
+        self._run_writers(
+            {"csv": CsvWriter(csv_path)},
+            meta,
+            self._iter_memory_chunks(data_bytes, meta),
+        )
 
     # ============================================================
     # GENERACIÓN DEL EXCEL
@@ -720,30 +1161,9 @@ class GraphtecCapture:
         """
         Genera un Excel (.xlsx) a partir de los datos crudos y metadata.
         """
-        timestamps, cols, rows_phys = self._decode_to_table(
-            data_bytes=data_bytes,
-            order=order,
-            counts=counts,
-            start_dt=start_dt,
-            delta=delta,
-            amp_info=amp_info,
-            spans=spans,
-            module=module,
+        meta = self._table_meta(order, counts, start_dt, delta, amp_info, spans, module)
+        self._run_writers(
+            {"xlsx": ExcelWriter(xlsx_path)},
+            meta,
+            self._iter_memory_chunks(data_bytes, meta),
         )
-
-        wb = xlsxwriter.Workbook(xlsx_path)
-
-        try:
-            ws = wb.add_worksheet("Data")
-
-            # Cabecera
-            ws.write_row(0, 0, ["TimeStamp"] + cols)
-
-            # Filas
-            for r, (ts, row) in enumerate(zip(timestamps, rows_phys), start=1):
-                ts_str = ts.isoformat() if ts is not None else ""
-                ws.write(r, 0, ts_str)
-                ws.write_row(r, 1, list(row))
-
-        finally:
-            wb.close()
@@ -0,0 +1,212 @@
+"""
+Checkpoints de descarga para reanudar transferencias TRANS.
+
+En modo reanudable (download(..., checkpoint=True), resume=True o
+sync()) se guarda junto al .bin un pequeño JSON (<nombre>.ckpt) con:
+
+  - layout_sha1:      huella del header TRANS sin los campos que cambian
+                      mientras el archivo crece (Counts)
+  - bytes_per_sample: tamaño de muestra del .bin
+  - samples:          muestras verificadas y escritas en el .bin
+  - crc32:            CRC32 acumulado de esos samples * bytes_per_sample bytes
+  - complete:         True cuando se recibieron todas las Counts del header
+  - writers:          {formato: {"samples", "offset"}} de los escritores
+                      que pueden continuar su archivo (CSV, GBD, Parquet)
+
+Al reanudar se comprueba que el layout no ha cambiado y que el prefijo
+del .bin es válido (CRC completo, o solo tamaño en sync); solo entonces
+se piden las muestras que faltan.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DownloadCheckpoint", "layout_fingerprint"]
+
+CHECKPOINT_VERSION = 1
+
+# Líneas del header que cambian mientras el GL100 sigue grabando
+_VOLATILE_LINE = re.compile(r"^\s*Counts\s*=", re.IGNORECASE)
+
+
+def layout_fingerprint(header_text: str) -> str:
+    """SHA1 del header TRANS sin las líneas volátiles (Counts)."""
+    stable = "\n".join(
+        line for line in header_text.splitlines() if not _VOLATILE_LINE.match(line)
+    )
+    return hashlib.sha1(stable.encode("utf-8", errors="replace")).hexdigest()
+
+
+class DownloadCheckpoint:
+    """
+    Estado persistente de una descarga.
+
+    Se guarda con escritura atómica (fichero temporal + os.replace) para
+    que un corte nunca deje un JSON a medias.
+    """
+
+    extension = ".ckpt"
+
+    def __init__(self, path: str, interval: float = 1.0):
+        """
+        Args:
+            path: ruta del .ckpt.
+            interval: segundos mínimos entre guardados periódicos (ver due()).
+        """
+        self.path = path
+        self.interval = interval
+        self.layout_sha1: Optional[str] = None
+        self.bytes_per_sample = 0
+        self.samples = 0
+        self.crc32 = 0
+        self.complete = False
+        self.writers: Dict[str, Dict[str, Any]] = {}
+        self._last_save = 0.0
+
+    @classmethod
+    def for_bin(cls, bin_path: str, **kwargs) -> "DownloadCheckpoint":
+        return cls(os.path.splitext(bin_path)[0] + cls.extension, **kwargs)
+
+    # ------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------
+    def load(self) -> bool:
+        """Carga el .ckpt. Devuelve False si no existe o no es válido."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if state.get("version") != CHECKPOINT_VERSION:
+            return False
+
+        self.layout_sha1 = state.get("layout_sha1")
+        self.bytes_per_sample = int(state.get("bytes_per_sample", 0))
+        self.samples = int(state.get("samples", 0))
+        self.crc32 = int(state.get("crc32", 0))
+        self.complete = bool(state.get("complete", False))
+        self.writers = dict(state.get("writers") or {})
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "layout_sha1": self.layout_sha1,
+            "bytes_per_sample": self.bytes_per_sample,
+            "samples": self.samples,
+            "crc32": self.crc32,
+            "complete": self.complete,
+            "writers": self.writers,
+        }
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, self.path)
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """True si ha pasado 'interval' desde el último guardado."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    # ------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------
+    def start(self, header_text: str, bytes_per_sample: int) -> None:
+        """Empieza una descarga nueva desde la muestra 0."""
+        self.layout_sha1 = layout_fingerprint(header_text)
+        self.bytes_per_sample = bytes_per_sample
+        self.samples = 0
+        self.crc32 = 0
+        self.complete = False
+        self.writers = {}
+
+    def snapshot(self, writers: Dict[str, Any]) -> None:
+        """Guarda en memoria el estado de los escritores que pueden continuar."""
+        for key, w in writers.items():
+            if key == "bin":  # su estado es samples/crc32
+                continue
+            state = w.state() if w.appendable else None
+            if state is not None:
+                self.writers[key] = state
+
+    def advance(self, first: int, raw: Any) -> None:
+        """
+        Registra un fragmento escrito en el .bin. Los fragmentos que no
+        continúan exactamente el prefijo verificado se ignoran.
+        """
+        if first != self.samples or not self.bytes_per_sample:
+            return
+        self.crc32 = zlib.crc32(raw, self.crc32)
+        self.samples += len(raw) // self.bytes_per_sample
+
+    def resume_point(
+        self,
+        header_text: str,
+        bytes_per_sample: int,
+        bin_path: str,
+        verify_crc: bool = True,
+    ) -> int:
+        """
+        Valida el checkpoint frente al header recibido y al .bin local.
+
+        Con verify_crc=False solo se comprueba el tamaño del .bin (coste
+        constante, para sync periódicos); si no, se recalcula el CRC32
+        del prefijo.
+
+        Returns:
+            Número de muestras ya verificadas en el .bin (0 si hay que
+            empezar de cero).
+        """
+        if not self.load():
+            return 0
+
+        if self.layout_sha1 != layout_fingerprint(header_text):
+            logger.warning("[checkpoint] El header ha cambiado, se descarga desde el principio.")
+            return 0
+        if self.bytes_per_sample != bytes_per_sample:
+            logger.warning("[checkpoint] Tamaño de muestra distinto, se descarga desde el principio.")
+            return 0
+
+        n_bytes = self.samples * bytes_per_sample
+        try:
+            size = os.path.getsize(bin_path)
+        except OSError:
+            size = -1
+        if size < n_bytes:
+            logger.warning(
+                "[checkpoint] %s tiene %d bytes (checkpoint: %d), se descarga desde el principio.",
+                bin_path,
+                size,
+                n_bytes,
+            )
+            return 0
+
+        if not verify_crc:
+            return self.samples
+
+        crc = 0
+        remaining = n_bytes
+        with open(bin_path, "rb") as f:
+            while remaining:
+                block = f.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                remaining -= len(block)
+
+        if remaining or crc != self.crc32:
+            logger.warning("[checkpoint] CRC del .bin no coincide, se descarga desde el principio.")
+            return 0
+
+        return self.samples
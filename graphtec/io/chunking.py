@@ -0,0 +1,365 @@
+"""
+Tamaño adaptativo de los fragmentos TRANS de GraphtecCapture.
+
+En lugar de pedir siempre el mismo número de muestras por
+:TRANS:OUTP:DATA, el controlador trabaja con un presupuesto de bytes
+por petición (así un Order estrecho no hace miles de viajes minúsculos
+y uno ancho no provoca timeouts en serie) y lo ajusta según lo medido:
+
+  - Crece (x2) mientras el tiempo de ida y vuelta (RTT) esté holgado.
+  - Se mantiene si el RTT se acerca al objetivo.
+  - Se reduce (/2) si el RTT lo supera, o tras un timeout o un error
+    de checksum (en ese caso GraphtecCapture reintenta el mismo rango).
+
+Las estadísticas (stats()) se publican en GraphtecCapture.last_stats.
+
+La política completa de la región de datos (rango siguiente, reintento
+del mismo rango, muestras completas) está en trans_data_steps(), un
+generador sin E/S que ejecutan todos los caminos de descarga:
+GraphtecCapture (secuencial y TransPipeline, vía run_data_steps),
+AsyncGraphtecCapture y DeviceHub (vía graphtec.io.protocol).
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generator, Iterator, NamedTuple, Optional, Tuple
+
+from graphtec.core.exceptions import DataError, TimeoutError as GraphtecTimeoutError
+from graphtec.io.decoder import extract_trans_data_view
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "AdaptiveChunker",
+    "ChunkerConfig",
+    "MAX_TRANS_BYTES",
+    "BLOCK_OVERHEAD",
+    "RETRYABLE_ERRORS",
+    "FetchRange",
+    "DataChunk",
+    "Resync",
+    "RESYNC",
+    "trans_data_steps",
+    "run_data_steps",
+]
+
+# '#6******' admite como mucho 999999 bytes, STATUS(2) y CHECKSUM(2) incluidos
+MAX_TRANS_BYTES = 999_999 - 4
+
+
+class AdaptiveChunker:
+    """
+    Elige cuántas muestras pedir en cada :TRANS:OUTP:DATA.
+
+    Uso:
+        n = chunker.next_samples(remaining)
+        ... petición ...
+        chunker.record_success(n_samples, n_bytes, rtt)  # o record_failure("timeout")
+    """
+
+    def __init__(
+        self,
+        bytes_per_sample: int,
+        target_bytes: int = 8192,
+        min_bytes: int = 512,
+        max_bytes: int = 256 * 1024,
+        target_rtt: float = 1.0,
+        fixed_samples: Optional[int] = None,
+    ):
+        """
+        Args:
+            bytes_per_sample: bytes por muestra (columnas de Order * 2).
+            target_bytes: presupuesto inicial de bytes por petición.
+            min_bytes / max_bytes: límites del presupuesto.
+            target_rtt: RTT (s) a partir del cual se deja de crecer y por
+                encima del cual se reduce. Debe quedar por debajo del
+                timeout de lectura de la conexión.
+            fixed_samples: si se indica, tamaño fijo (sin adaptación).
+        """
+        self.bytes_per_sample = max(1, int(bytes_per_sample))
+        self.target_rtt = float(target_rtt)
+        self.fixed_samples = fixed_samples
+
+        max_bytes = min(max_bytes, MAX_TRANS_BYTES)
+        self.min_samples = max(1, min_bytes // self.bytes_per_sample)
+        self.max_samples = max(self.min_samples, max_bytes // self.bytes_per_sample)
+
+        if fixed_samples is not None:
+            self.samples = max(1, int(fixed_samples))
+        else:
+            self.samples = self._clamp(target_bytes // self.bytes_per_sample)
+
+        self.requests = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.checksum_errors = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.chunk_sizes: Dict[int, int] = {}
+
+    def _clamp(self, samples: int) -> int:
+        return max(self.min_samples, min(self.max_samples, int(samples)))
+
+    @property
+    def max_block_bytes(self) -> int:
+        """Tamaño máximo de DATA que puede pedirse (para dimensionar buffers)."""
+        return max(self.samples, self.max_samples) * self.bytes_per_sample
+
+    def next_samples(self, remaining: int) -> int:
+        """Número de muestras a pedir en la siguiente petición."""
+        return max(1, min(self.samples, remaining))
+
+    def record_success(self, n_samples: int, n_bytes: int, rtt: float) -> None:
+        """Petición correcta: ajusta la ventana según el RTT medido."""
+        self.requests += 1
+        self.bytes += n_bytes
+        self.elapsed += rtt
+        self.chunk_sizes[n_samples] = self.chunk_sizes.get(n_samples, 0) + 1
+
+        if self.fixed_samples is not None:
+            return
+
+        # Solo aprendemos de peticiones de ventana completa: la última
+        # (más corta) no dice nada sobre la capacidad del enlace.
+        if n_samples < self.samples:
+            return
+
+        if rtt > self.target_rtt:
+            self._resize(self.samples // 2, f"RTT {rtt:.3f}s > {self.target_rtt:.3f}s")
+        elif rtt < self.target_rtt / 2:
+            self._resize(self.samples * 2, f"RTT {rtt:.3f}s")
+
+    def record_failure(self, reason: str) -> None:
+        """
+        Petición fallida ("timeout", "checksum", "framing" o "empty"): reduce la
+        ventana a la mitad. El llamante reintenta el mismo rango.
+        """
+        self.retries += 1
+        if reason == "timeout":
+            self.timeouts += 1
+        elif reason == "checksum":
+            self.checksum_errors += 1
+
+        if self.fixed_samples is None:
+            self._resize(self.samples // 2, reason)
+
+    def _resize(self, samples: int, reason: str) -> None:
+        new = self._clamp(samples)
+        if new != self.samples:
+            logger.debug(f"[chunking] Ventana {self.samples} → {new} muestras ({reason})")
+            self.samples = new
+
+    def stats(self) -> Dict[str, Any]:
+        """Resumen de la descarga: peticiones, reintentos, tamaños usados y caudal."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "checksum_errors": self.checksum_errors,
+            "bytes": self.bytes,
+            "elapsed_s": self.elapsed,
+            "throughput_Bps": self.bytes / self.elapsed if self.elapsed > 0 else None,
+            "chunk_sizes": dict(self.chunk_sizes),
+            "final_chunk_samples": self.samples,
+            "adaptive": self.fixed_samples is None,
+        }
+
+
+@dataclass(frozen=True)
+class ChunkerConfig:
+    """
+    Parámetros de fragmentación de una descarga (chunk_samples,
+    chunk_bytes y target_rtt de GraphtecCapture), sin conexión: los
+    comparten GraphtecCapture, AsyncGraphtecCapture y DeviceHub.
+    """
+
+    chunk_samples: Optional[int] = None
+    chunk_bytes: int = 8192
+    target_rtt: float = 1.0
+
+    def make(self, bytes_per_sample: int) -> AdaptiveChunker:
+        """Controlador de tamaño de fragmento para una descarga."""
+        return AdaptiveChunker(
+            bytes_per_sample,
+            target_bytes=self.chunk_bytes,
+            target_rtt=self.target_rtt,
+            fixed_samples=self.chunk_samples,
+        )
+
+    def local_samples(self, bytes_per_sample: int) -> int:
+        """Muestras por fragmento al trabajar sin dispositivo."""
+        if self.chunk_samples:
+            return self.chunk_samples
+        return max(1, self.chunk_bytes // max(1, bytes_per_sample))
+
+
+# ============================================================
+# POLÍTICA DE RANGOS Y REINTENTOS (sin E/S)
+# ============================================================
+# Margen para '#6******' + STATUS(2) + CHECKSUM(2) al dimensionar buffers
+BLOCK_OVERHEAD = 32
+
+# Fallos de lectura tras los que se reintenta el mismo rango
+RETRYABLE_ERRORS = (TimeoutError, GraphtecTimeoutError, DataError)
+
+
+class FetchRange(NamedTuple):
+    """
+    Pedir :TRANS:OUTP:DATA first,last y :TRANS:OUTP:DATA? (1-based).
+    Se responde con el bloque '#6******' crudo o se lanza (throw) uno
+    de RETRYABLE_ERRORS.
+    """
+
+    first: int
+    last: int
+    size: int  # bytes máximos del bloque (para dimensionar el buffer)
+
+
+class DataChunk(NamedTuple):
+    """DATA verificado de las muestras [first, first + n) (first 0-based)."""
+
+    first: int
+    data: Any
+
+
+class Resync(NamedTuple):
+    """Descartar lo pendiente en la línea antes de reintentar (flush_buffer)."""
+
+
+RESYNC = Resync()
+
+DataSteps = Generator[Any, Any, int]
+
+
+def trans_data_steps(
+    meta: Dict[str, Any],
+    chunker: AdaptiveChunker,
+    max_retries: int = 3,
+    start: int = 0,
+    stats: Optional[Dict[str, Any]] = None,
+) -> DataSteps:
+    """
+    Descarga de la región de datos sin E/S. Produce FetchRange, RESYNC
+    y DataChunk (ver cada tipo); tras un timeout, una trama inválida o
+    un checksum incorrecto reduce la ventana, pide RESYNC y reintenta
+    el mismo rango (hasta max_retries). Solo entrega muestras completas
+    y nunca más de Counts.
+
+    Args:
+        meta: necesita "counts" y "bytes_per_sample".
+        start: muestras (0-based) que ya se tienen; se pide desde start + 1.
+        stats: si se indica, se actualiza con chunker.stats().
+
+    Returns:
+        Muestras disponibles al terminar (start + recibidas).
+    """
+    counts = meta["counts"]
+    bps = meta["bytes_per_sample"]
+
+    first = start + 1
+    failures = 0
+    try:
+        while first <= counts:
+            n_req = chunker.next_samples(counts - first + 1)
+            last = first + n_req - 1
+
+            t0 = time.monotonic()
+            try:
+                block = yield FetchRange(first, last, n_req * bps + BLOCK_OVERHEAD)
+            except RETRYABLE_ERRORS as e:
+                # DataError: restos de un bloque anterior tomados como cabecera #6
+                failure = "framing" if isinstance(e, DataError) else "timeout"
+                logger.warning(f"[chunking] Fallo ({failure}) en rango {first}-{last}: {e}")
+            else:
+                rtt = time.monotonic() - t0
+                if not isinstance(block, (bytes, bytearray, memoryview)):
+                    logger.error("[chunking] TRANS:OUTP:DATA? devolvió datos no binarios.")
+                    break
+                data, _, checksum_ok = extract_trans_data_view(block)
+                failure = "empty" if not data else (None if checksum_ok else "checksum")
+
+            if failure is not None:
+                chunker.record_failure(failure)
+                failures += 1
+                if failures > max_retries:
+                    logger.error(
+                        "[chunking] Rango %d-%d fallido (%s) tras %d reintentos, deteniendo descarga.",
+                        first,
+                        last,
+                        failure,
+                        max_retries,
+                    )
+                    break
+                logger.warning(
+                    "[chunking] Rango %d-%d fallido (%s), reintentando (%d/%d).",
+                    first,
+                    last,
+                    failure,
+                    failures,
+                    max_retries,
+                )
+                yield RESYNC
+                continue
+            failures = 0
+
+            # Si llegan menos muestras de las pedidas se continúa desde la última
+            n_got = min(len(data) // bps, n_req)
+            if n_got * bps != len(data):
+                logger.warning(
+                    "[chunking] Recibidos %d bytes en rango %d-%d, usando %d muestras.",
+                    len(data),
+                    first,
+                    last,
+                    n_got,
+                )
+                data = data[:n_got * bps]
+                if not n_got:
+                    break
+
+            chunker.record_success(n_got, len(data), rtt)
+            if stats is not None:
+                stats.update(chunker.stats())
+
+            yield DataChunk(first - 1, data)
+            first += n_got
+    finally:
+        if stats is not None:
+            stats.update(chunker.stats())
+
+    if first <= counts:
+        logger.warning("[chunking] Recibidas solo %d de %d muestras.", first - 1, counts)
+    return first - 1
+
+
+def run_data_steps(
+    steps: DataSteps,
+    fetch: Callable[[FetchRange], Any],
+    resync: Optional[Callable[[], None]] = None,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Ejecuta trans_data_steps con E/S síncrona: fetch(FetchRange) devuelve
+    el bloque crudo (o lanza un error de RETRYABLE_ERRORS) y resync()
+    descarta lo pendiente. Entrega (first 0-based, DATA) de cada DataChunk.
+    """
+    reply: Any = None
+    error: Optional[BaseException] = None
+    try:
+        while True:
+            try:
+                item = steps.throw(error) if error is not None else steps.send(reply)
+            except StopIteration:
+                return
+            reply = error = None
+
+            if isinstance(item, DataChunk):
+                yield item
+            elif isinstance(item, FetchRange):
+                try:
+                    reply = fetch(item)
+                except RETRYABLE_ERRORS as e:
+                    error = e
+            elif resync is not None:
+                resync()
+    finally:
+        steps.close()
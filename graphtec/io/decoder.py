@@ -7,41 +7,124 @@ Incluye:
   - Conversión de crudo -> físico (GS-4VT y resto de módulos).
 """
 
+import math
 import struct
+import hashlib
 import logging
-from typing import Tuple, Optional, Dict, List, Any
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Tuple, Optional, Dict, List, Any, Iterator, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usa el camino Python puro
+    np = None
 
 logger = logging.getLogger(__name__)
 
+BytesLike = Union[bytes, bytearray, memoryview]
+
 __all__ = [
     "strip_noise",
     "parse_head_block",
     "extract_trans_data_block",
+    "extract_trans_data_view",
     "extract_meas_payload",
+    "extract_meas_payload_view",
+    "FrameScanner",
     "decode_special",
     "convert_4vt_voltage",
     "convert_value",
     "convert_row_physical",
+    "ColumnConversion",
+    "channel_conversion",
+    "ConversionPlan",
+    "build_conversion_plan",
+    "get_conversion_plan",
+    "plan_fingerprint",
+    "ChannelLUT",
+    "FLAG_NAMES",
+    "build_channel_lut",
+    "get_channel_lut",
+    "clear_lut_cache",
+    "convert_column_physical",
+    "decode_data_region",
+    "iter_physical_rows",
+    "decode_rows",
     "build_column_names_with_units",
+    "HAS_NUMPY",
 ]
 
+HAS_NUMPY = np is not None
+
+# Códigos especiales GL100 (ver decode_special)
+SPECIAL_CODES = (0x7fff, 0x7ffe, 0x7ffd, 0x7ffc, -0x7fff)
+
 # ============================================================
 # BLOQUES #6******
 # ============================================================
-def strip_noise(block: bytes) -> bytes:
+# Las funciones *_view trabajan sobre bytearray/memoryview y devuelven
+# vistas dentro del buffer recibido (sin copiar el payload). Las
+# versiones clásicas devuelven bytes y se mantienen por compatibilidad.
+
+def _find_hash(view: memoryview) -> int:
+    """Posición del primer '#' en una vista, copiando solo ventanas pequeñas."""
+    window = 64
+    start = 0
+    while start < len(view):
+        idx = bytes(view[start:start + window]).find(b"#")
+        if idx != -1:
+            return start + idx
+        start += window
+        window = min(window * 4, 65536)
+    return -1
+
+
+def strip_noise(block: BytesLike) -> BytesLike:
     """
     Busca el primer '#' y descarta basura anterior.
     Si no se encuentra '#', devuelve el bloque tal cual.
+
+    Con bytes/str devuelve bytes; con bytearray/memoryview devuelve
+    una memoryview dentro del mismo buffer (sin copia).
     """
     if isinstance(block, str):
         block = block.encode("latin-1", errors="ignore")
-    if not isinstance(block, (bytes, bytearray)):
-        raise TypeError("strip_noise espera bytes o str.")
-    idx = block.find(b"#")
-    return block[idx:] if idx != -1 else block
+    if isinstance(block, bytes):
+        idx = block.find(b"#")
+        return block[idx:] if idx != -1 else block
+    if not isinstance(block, (bytearray, memoryview)):
+        raise TypeError("strip_noise espera bytes, bytearray, memoryview o str.")
+
+    view = memoryview(block)
+    if view.format != "B":
+        view = view.cast("B")
+    idx = _find_hash(view)
+    return view[idx:] if idx != -1 else view
 
 
-def parse_head_block(block: bytes) -> str:
+def _parse_hash_header(view: memoryview) -> Tuple[int, int]:
+    """
+    Parsea el prefijo "#<nd><len>" de un bloque (ya sin ruido).
+
+    Devuelve (offset del payload, longitud declarada).
+    Lanza ValueError si el prefijo no es numérico.
+    """
+    nd = int(bytes(view[1:2]))
+    strlen = int(bytes(view[2:2 + nd]))
+    return 2 + nd, strlen
+
+
+def _checksum16(data: BytesLike) -> int:
+    """Suma de bytes módulo 2^16 (checksum de TRANS:OUTP:DATA?)."""
+    if np is not None:
+        return int(np.frombuffer(data, dtype=np.uint8).sum(dtype=np.uint64)) & 0xFFFF
+    return sum(data) & 0xFFFF
+
+
+def parse_head_block(block: BytesLike) -> str:
     """
     Parseo de HEAD/HEADER:
 
@@ -49,35 +132,33 @@ def parse_head_block(block: bytes) -> str:
 
     Devuelve el texto ASCII del header.
     """
-    block = strip_noise(block)
+    view = memoryview(strip_noise(block))
 
-    if not block.startswith(b"#"):
+    if bytes(view[:1]) != b"#":
         raise ValueError("Bloque HEAD inválido: no empieza por '#'.")
 
     try:
-        nd = int(block[1:2])
-        strlen = int(block[2:2 + nd])
+        start, strlen = _parse_hash_header(view)
     except ValueError as e:
         raise ValueError("Bloque HEAD inválido: campo de longitud no numérico.") from e
 
-    start = 2 + nd
     end = start + strlen
 
-    if len(block) < end:
+    if len(view) < end:
         logger.warning(
             "[decoder] HEAD truncado: len=%d, esperado al menos %d.",
-            len(block),
+            len(view),
             end,
         )
-        end = len(block)
+        end = len(view)
 
-    header_bytes = block[start:end]
-    return header_bytes.decode("ascii", errors="ignore")
+    return str(view[start:end], "ascii", "ignore")
 
 
-def extract_trans_data_block(block: bytes) -> Tuple[bytes, int, Optional[bool]]:
+def extract_trans_data_view(block: BytesLike) -> Tuple[memoryview, int, Optional[bool]]:
     """
-    Extrae la parte de DATA de un bloque de TRANS:OUTP:DATA?.
+    Igual que extract_trans_data_block, pero devuelve DATA como una
+    memoryview dentro del buffer recibido (sin copia).
 
     Formato esperado (Data Reception Specs):
 
@@ -86,116 +167,204 @@ def extract_trans_data_block(block: bytes) -> Tuple[bytes, int, Optional[bool]]:
     Donde ****** = N (tamaño de DATA, sin STATUS ni CHECKSUM).
 
     Devuelve:
-        (data: bytes, status: int, checksum_ok: bool|None)
+        (data: memoryview, status: int, checksum_ok: bool|None)
     """
-    block = strip_noise(block)
+    view = memoryview(strip_noise(block))
+    empty = view[0:0]
 
-    if not block.startswith(b"#"):
+    if bytes(view[:1]) != b"#":
         # ascii inesperado
-        try:
-            text = block.decode("ascii", errors="ignore").strip()
-        except Exception:
-            text = "?"
+        text = str(view, "ascii", "ignore").strip()
         logger.warning("[decoder] Bloque ASCII recibido en TRANS: %s", text)
-        return b"", 0, None
+        return empty, 0, None
 
     try:
-        nd = int(block[1:2])          # normalmente '6'
-        strlen = int(block[2:2 + nd]) # longitud de DATA en bytes (N)
+        offset, strlen = _parse_hash_header(view)  # normalmente '#6' + N
     except ValueError:
         logger.error("[decoder] Cabecera #6 inválida en TRANS.")
-        return b"", 0, None
+        return empty, 0, None
 
-    offset = 2 + nd
-    remaining = len(block) - offset
+    remaining = len(view) - offset
     status_val: int = 0  # siempre int para evitar problemas con el linter
 
     # Caso HEAD/MEAS: "#6******" + DATA(N)
     if remaining == strlen:
-        data = block[offset:offset + strlen]
-        return data, status_val, None
+        return view[offset:offset + strlen], status_val, None
 
     # Caso TRANS: "#6******" + STATUS(2) + DATA(N) + CHECKSUM(2)
     if remaining >= strlen + 4:
-        status_bytes = block[offset:offset + 2]
-
-        if len(status_bytes) != 2:
-            logger.error("[decoder] STATUS bytes incompletos en TRANS.")
-            status_val = 0
-        else:
-            status_val = struct.unpack(">H", status_bytes)[0]
-            # Bits 0-2 según especificación
-            if status_val & 0x0001:
-                logger.error(
-                    "[decoder] STATUS de TRANS indica error (0x%04X).",
-                    status_val,
-                )
-            if status_val & 0x0002:
-                logger.error(
-                    "[decoder] Error en posición END (STATUS=0x%04X).",
-                    status_val,
-                )
-            if status_val & 0x0004:
-                logger.error(
-                    "[decoder] Error en posición START (STATUS=0x%04X).",
-                    status_val,
-                )
+        status_val = struct.unpack_from(">H", view, offset)[0]
+        # Bits 0-2 según especificación
+        if status_val & 0x0001:
+            logger.error(
+                "[decoder] STATUS de TRANS indica error (0x%04X).",
+                status_val,
+            )
+        if status_val & 0x0002:
+            logger.error(
+                "[decoder] Error en posición END (STATUS=0x%04X).",
+                status_val,
+            )
+        if status_val & 0x0004:
+            logger.error(
+                "[decoder] Error en posición START (STATUS=0x%04X).",
+                status_val,
+            )
 
         data_start = offset + 2
         data_end = data_start + strlen
-        data = block[data_start:data_end]
-
-        checksum_bytes = block[data_end:data_end + 2]
-        checksum_ok: Optional[bool] = None
-        if len(checksum_bytes) == 2:
-            checksum_rx = struct.unpack(">H", checksum_bytes)[0]
-            checksum_calc = sum(data) & 0xFFFF
-            checksum_ok = (checksum_calc == checksum_rx)
-            if not checksum_ok:
-                logger.error(
-                    "[decoder] Checksum inválido: calc=0x%04X, recv=0x%04X",
-                    checksum_calc,
-                    checksum_rx,
-                )
+        data = view[data_start:data_end]
+
+        checksum_rx = struct.unpack_from(">H", view, data_end)[0]
+        checksum_calc = _checksum16(data)
+        checksum_ok = (checksum_calc == checksum_rx)
+        if not checksum_ok:
+            logger.error(
+                "[decoder] Checksum inválido: calc=0x%04X, recv=0x%04X",
+                checksum_calc,
+                checksum_rx,
+            )
 
         return data, status_val, checksum_ok
 
     logger.warning("[decoder] Bloque TRANS truncado o inconsistente.")
-    return b"", status_val, None
+    return empty, status_val, None
 
 
-def extract_meas_payload(block: bytes) -> bytes:
+def extract_trans_data_block(block: BytesLike) -> Tuple[bytes, int, Optional[bool]]:
     """
-    Extrae el payload de un bloque :MEAS:OUTP:ONE?:
+    Extrae la parte de DATA de un bloque de TRANS:OUTP:DATA?.
 
-        "#6******" + DATA(N)
+    Formato esperado (Data Reception Specs):
 
-    Si no hay cabecera #6, devuelve el bloque tal cual.
+      "#6******" + STATUS(2) + DATA(N) + CHECKSUM(2)
+
+    Donde ****** = N (tamaño de DATA, sin STATUS ni CHECKSUM).
+
+    Devuelve:
+        (data: bytes, status: int, checksum_ok: bool|None)
+    """
+    data, status_val, checksum_ok = extract_trans_data_view(block)
+    return bytes(data), status_val, checksum_ok
+
+
+def extract_meas_payload_view(block: BytesLike) -> memoryview:
     """
-    block = strip_noise(block)
+    Igual que extract_meas_payload, pero devuelve una memoryview
+    dentro del buffer recibido (sin copia).
+    """
+    view = memoryview(strip_noise(block))
 
-    if not block.startswith(b"#"):
-        return block
+    if bytes(view[:1]) != b"#":
+        return view
 
     try:
-        nd = int(block[1:2])
-        strlen = int(block[2:2 + nd])
+        offset, strlen = _parse_hash_header(view)
     except ValueError:
         logger.error("[decoder] Cabecera #6 inválida en MEAS.")
-        return block
+        return view
 
-    offset = 2 + nd
     end = offset + strlen
 
-    if len(block) < end:
+    if len(view) < end:
         logger.warning(
             "[decoder] Bloque MEAS truncado: len=%d, esperado al menos %d.",
-            len(block),
+            len(view),
             end,
         )
-        end = len(block)
+        end = len(view)
+
+    return view[offset:end]
 
-    return block[offset:end]
+
+def extract_meas_payload(block: BytesLike) -> bytes:
+    """
+    Extrae el payload de un bloque :MEAS:OUTP:ONE?:
+
+        "#6******" + DATA(N)
+
+    Si no hay cabecera #6, devuelve el bloque tal cual.
+    """
+    return bytes(extract_meas_payload_view(block))
+
+
+class FrameScanner:
+    """
+    Reconstruye respuestas del GL100 a partir de bytes que llegan por
+    trozos (lecturas no bloqueantes, ver DeviceHub).
+
+    expect(kind) indica la forma de la siguiente respuesta (los REPLY_*
+    de graphtec.connection.base); feed(data) devuelve la respuesta
+    completa en cuanto está, o None si faltan bytes. Los bloques #6 se
+    completan con la longitud declarada (+ STATUS y CHECKSUM en TRANS
+    DATA), sin volver a recorrer lo ya recibido.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.kind: Optional[str] = None
+        self._need: Optional[int] = None
+
+    def expect(self, kind: str) -> None:
+        if self._buf:
+            logger.debug("[decoder] Descartando %d bytes sin respuesta pendiente.", len(self._buf))
+        self._buf.clear()
+        self.kind = kind
+        self._need = None
+
+    def reset(self) -> None:
+        self._buf.clear()
+        self.kind = None
+        self._need = None
+
+    @property
+    def pending(self) -> int:
+        """Bytes recibidos de la respuesta en curso."""
+        return len(self._buf)
+
+    def feed(self, data: BytesLike) -> Optional[bytes]:
+        self._buf += data
+        if self.kind is None:
+            return None
+        size = self._frame_size()
+        if size is None:
+            return None
+        out = bytes(self._buf[:size])
+        del self._buf[:size]
+        self.kind = None
+        self._need = None
+        return out
+
+    def _frame_size(self) -> Optional[int]:
+        buf = self._buf
+        if self.kind == "ascii":
+            end = buf.find(b"\r\n")
+            return None if end < 0 else end + 2
+        if self.kind == "open":
+            return 3 if len(buf) >= 3 else None
+
+        # Bloques '#<nd><len>' + DATA (+ STATUS/CHECKSUM)
+        if self._need is None:
+            idx = buf.find(b"#")
+            if idx < 0:
+                buf.clear()
+                return None
+            if idx:
+                del buf[:idx]
+            if len(buf) < 2:
+                return None
+            nd = buf[1] - 0x30
+            if not 0 < nd <= 9:
+                raise ValueError("Cabecera binaria inválida (#6).")
+            if len(buf) < 2 + nd:
+                return None
+            try:
+                data_len = int(bytes(buf[2:2 + nd]))
+            except ValueError as e:
+                raise ValueError("Bloque inválido: campo de longitud no numérico.") from e
+            self._need = 2 + nd + data_len + (4 if self.kind == "trans_data" else 0)
+
+        return self._need if len(buf) >= self._need else None
 
 
 # ============================================================
@@ -242,13 +411,10 @@ def _normalize_4vt_range(rng: str) -> str:
     return r
 
 
-def convert_4vt_voltage(raw_val: int, rng: str) -> float:
+def _4vt_voltage_divisor(rng: str) -> Optional[int]:
     """
-    Conversión EXACTA según "Binary translation of voltage data
-    of 4ch voltage temperature (GS-4VT)".
-
-    1) Escalado base (1, 2, 5) → factores 1 / 2 / 4
-    2) Ajuste de punto decimal → siempre a Voltios
+    Divisor total (factor base * ajuste de punto decimal) de un rango
+    GS-4VT, o None si el rango es desconocido.
     """
     rng_norm = _normalize_4vt_range(rng)
 
@@ -260,8 +426,7 @@ def convert_4vt_voltage(raw_val: int, rng: str) -> float:
     elif rng_norm in ("50MV", "500MV", "5V", "50V", "1-5V"):
         base_factor = 4
     else:
-        # Rango desconocido → devolvemos raw sin escalar
-        return float(raw_val)
+        return None
 
     # Ajuste de punto decimal (siempre a V)
     if rng_norm == "20MV":
@@ -272,29 +437,37 @@ def convert_4vt_voltage(raw_val: int, rng: str) -> float:
         dec_factor = 10_000
     elif rng_norm in ("5V", "10V", "20V", "1-5V"):
         dec_factor = 1_000
-    elif rng_norm == "50V":
+    else:  # 50V
         dec_factor = 100
-    else:
-        dec_factor = 1.0
 
-    return raw_val / (base_factor * dec_factor)
+    return base_factor * dec_factor
+
+
+def convert_4vt_voltage(raw_val: int, rng: str) -> float:
+    """
+    Conversión EXACTA según "Binary translation of voltage data
+    of 4ch voltage temperature (GS-4VT)".
+
+    1) Escalado base (1, 2, 5) → factores 1 / 2 / 4
+    2) Ajuste de punto decimal → siempre a Voltios
+    """
+    divisor = _4vt_voltage_divisor(rng)
+    if divisor is None:
+        # Rango desconocido → devolvemos raw sin escalar
+        return float(raw_val)
+    return raw_val / divisor
 
 
 # ============================================================
 # CONVERSIÓN FÍSICA UNIFICADA (captured data)
 # ============================================================
-def convert_value(
-    module: str,
-    inp: str,
-    rng: str,
-    span: Tuple[int, int],
-    raw_val: int,
-) -> float:
+def _resolve_conversion(module: str, inp: str, rng: str) -> Tuple[str, float]:
     """
-    Conversión física unificada para todos los módulos GL100.
+    Resuelve (una sola vez) la fórmula de conversión de un canal.
 
-    - GS-4VT: fórmulas oficiales (sin spans)
-    - Resto: conversión lineal por spans + ajustes heurísticos
+    Devuelve (kind, divisor):
+      - "scale": físico = raw / divisor
+      - "span":  físico = conversión lineal por span / divisor
     """
     module_u = (module or "UNKNOWN").upper()
     inp_u = (inp or "").upper()
@@ -303,57 +476,303 @@ def convert_value(
     # ---------------------- GS-4VT ---------------------------
     if module_u.startswith("GS-4VT"):
         if inp_u in ("DC", "DC_V", "V", "VT", "MV"):
-            return convert_4vt_voltage(raw_val, rng_u)
+            divisor = _4vt_voltage_divisor(rng_u)
+            # Rango desconocido → raw sin escalar
+            return "scale", 1 if divisor is None else divisor
 
         # Temperatura por termopar:
         # [Temperature (°C)] = [Temperature data] / 10
         if inp_u == "TEMP":
-            return raw_val / 10.0
+            return "scale", 10.0
 
         # Logic / Pulse / Alarm → devolver raw
-        return float(raw_val)
+        return "scale", 1
 
     # ---------------------- Resto de módulos -----------------
-    smin, smax = span
-
-    # Conversión lineal Graphtec en unidades del span
-    phys = smin + ((raw_val + 32768) * (smax - smin) / 65535.0)
-
     # GS-TH
     if module_u.startswith("GS-TH"):
         if inp_u in ("TEMP", "HUM", "HUMID", "RH", "DEW"):
-            return phys / 100.0
-        return phys
+            return "span", 100.0
+        return "span", 1.0
 
     # GS-3AT
     if module_u.startswith("GS-3AT"):
         if inp_u == "ACC":
-            return phys / 1000.0
+            return "span", 1000.0
         if inp_u == "TEMP":
-            return phys / 100.0
-        return phys
+            return "span", 100.0
+        return "span", 1.0
 
     # GS-LXUV
     if module_u.startswith("GS-LXUV"):
         if inp_u in ("LUX", "UV"):
-            return phys / 1000.0
-        return phys
+            return "span", 1000.0
+        return "span", 1.0
 
     # GS-CO2
     if module_u.startswith("GS-CO2"):
-        return phys
+        return "span", 1.0
 
     # GS-DPA-AC
     if module_u.startswith("GS-DPA-AC"):
         if "A" in inp_u:
-            return phys / 1000.0
-        return phys
+            return "span", 1000.0
+        return "span", 1.0
 
     # GS-4TSR
     if module_u.startswith("GS-4TSR"):
-        return phys / 100.0
+        return "span", 100.0
+
+    return "span", 1.0
 
-    return phys
+
+@dataclass(frozen=True)
+class ColumnConversion:
+    """
+    Conversión ya resuelta de una columna del Order.
+
+    - kind:    "raw" (campo no canal), "scale" o "span"
+    - divisor: divisor final hacia unidades físicas
+    - span:    (smin, smax) del bloque $$Span (solo kind="span")
+    - flags:   si True, los códigos especiales GL100 se devuelven como None
+    - lut_key: clave (módulo, entrada, rango, span) de su tabla LUT
+    """
+    name: str
+    kind: str
+    divisor: float = 1
+    span: Tuple[int, int] = (0, 1)
+    flags: bool = True
+    lut_key: Optional[Tuple[Any, ...]] = field(default=None, compare=False)
+
+    def convert(self, raw_val: int) -> Optional[float]:
+        """Convierte un valor crudo aplicando la política de flags."""
+        if self.kind == "raw":
+            return raw_val
+        if self.flags and raw_val in SPECIAL_CODES:
+            return None
+        return self.physical(raw_val)
+
+    def physical(self, raw_val: int) -> float:
+        """Conversión física pura (sin tratar códigos especiales)."""
+        if self.kind == "scale":
+            return raw_val / self.divisor
+
+        smin, smax = self.span
+        # Conversión lineal Graphtec en unidades del span
+        phys = smin + ((raw_val + 32768) * (smax - smin) / 65535.0)
+        if self.divisor != 1:
+            phys = phys / self.divisor
+        return phys
+
+    def convert_array(self, raw: "np.ndarray") -> "np.ndarray":
+        """
+        Versión vectorizada de convert(): int16 → float64,
+        con NaN en los códigos especiales.
+        """
+        _require_numpy()
+
+        raw_f = raw.astype(np.float64)
+        if self.kind == "raw":
+            return raw_f
+
+        if self.kind == "scale":
+            out = raw_f / self.divisor
+        else:
+            smin, smax = self.span
+            out = smin + ((raw_f + 32768) * (smax - smin) / 65535.0)
+            if self.divisor != 1:
+                out = out / self.divisor
+
+        if self.flags:
+            out = np.where(np.isin(raw, SPECIAL_CODES), np.nan, out)
+        return out
+
+    def lut(self) -> "ChannelLUT":
+        """Tabla LUT (65536 entradas) de esta columna, desde la caché."""
+        return get_channel_lut(self)
+
+    def lookup(self, raw_val: int) -> Tuple[Optional[float], Optional[str]]:
+        """
+        Convierte un valor crudo devolviendo (valor | None, flag | None),
+        igual que decode_special + conversión física.
+        Usa la LUT si numpy está disponible.
+        """
+        if np is None or self.kind == "raw":
+            val, flag = decode_special(raw_val) if self.flags else (raw_val, None)
+            return (None if val is None else self.physical(val)), flag
+
+        table = self.lut()
+        idx = raw_val & 0xFFFF
+        code = int(table.flags[idx])
+        if code:
+            return None, FLAG_NAMES[code]
+        return float(table.values[idx]), None
+
+
+@dataclass(frozen=True)
+class ConversionPlan:
+    """
+    Plan de conversión precompilado para un Order/Amp/Span/módulo.
+
+    Se construye una vez por cabecera (ver get_conversion_plan) y lo
+    usan tanto la conversión fila a fila como la vectorizada.
+    """
+    fingerprint: str
+    module: str
+    order: Tuple[str, ...]
+    columns: Tuple[ColumnConversion, ...]
+
+    def convert_row(self, raw_row: Any) -> List[Optional[float]]:
+        return [col.convert(raw_val) for col, raw_val in zip(self.columns, raw_row)]
+
+
+def channel_conversion(
+    module: str,
+    inp: str,
+    rng: str,
+    span: Tuple[int, int] = (0, 1),
+    name: str = "",
+) -> ColumnConversion:
+    """Resuelve la conversión de un canal a partir de módulo/entrada/rango."""
+    return _channel_conversion(module, inp, rng, tuple(span), name)
+
+
+@lru_cache(maxsize=256)
+def _channel_conversion(
+    module: str,
+    inp: str,
+    rng: str,
+    span: Tuple[int, int],
+    name: str,
+) -> ColumnConversion:
+    kind, divisor = _resolve_conversion(module, inp, rng)
+    return ColumnConversion(
+        name=name,
+        kind=kind,
+        divisor=divisor,
+        span=span,
+        lut_key=((module or "").upper(), (inp or "").upper(), (rng or "").upper(), span),
+    )
+
+
+_RAW_COLUMNS: Dict[str, ColumnConversion] = {}
+
+
+def resolve_column(
+    module: str,
+    name: str,
+    amp_info: Dict[str, Dict[str, str]],
+    spans: Dict[str, Tuple[int, int]],
+) -> ColumnConversion:
+    """Resuelve la conversión de una columna del Order."""
+    n = name.strip()
+
+    # Campos no canal (Logic, Alarm, etc.) → dejar raw tal cual
+    if not n.startswith("CH"):
+        col = _RAW_COLUMNS.get(n)
+        if col is None:
+            col = _RAW_COLUMNS[n] = ColumnConversion(name=n, kind="raw", flags=False)
+        return col
+
+    info = amp_info.get(n, {})
+    return channel_conversion(
+        module,
+        info.get("input") or "",
+        info.get("range") or "",
+        span=spans.get(n, (0, 1)),
+        name=n,
+    )
+
+
+def plan_fingerprint(
+    order: List[str],
+    amp_info: Dict[str, Dict[str, str]],
+    spans: Dict[str, Tuple[int, int]],
+    module: str,
+) -> str:
+    """
+    Huella de los campos de cabecera que afectan a la conversión.
+    Dos descargas con la misma configuración de amplificador
+    comparten huella (y por tanto plan).
+    """
+    canon = repr((
+        module,
+        tuple(n.strip() for n in order),
+        tuple(sorted((ch, tuple(sorted(info.items()))) for ch, info in amp_info.items())),
+        tuple(sorted((ch, tuple(sp)) for ch, sp in spans.items())),
+    ))
+    return hashlib.sha1(canon.encode("utf-8")).hexdigest()
+
+
+def build_conversion_plan(
+    order: List[str],
+    amp_info: Dict[str, Dict[str, str]],
+    spans: Dict[str, Tuple[int, int]],
+    module: str,
+) -> ConversionPlan:
+    """Construye un ConversionPlan (sin caché)."""
+    return ConversionPlan(
+        fingerprint=plan_fingerprint(order, amp_info, spans, module),
+        module=module,
+        order=tuple(n.strip() for n in order),
+        columns=tuple(resolve_column(module, n, amp_info, spans) for n in order),
+    )
+
+
+# Las cachés LRU se usan desde varios hilos (TransPipeline, DeviceHub,
+# executors de asyncio): cada get/move_to_end/insert/popitem va bajo su lock
+_PLAN_CACHE: "OrderedDict[str, ConversionPlan]" = OrderedDict()
+_PLAN_CACHE_SIZE = 32
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+def get_conversion_plan(
+    order: List[str],
+    amp_info: Dict[str, Dict[str, str]],
+    spans: Dict[str, Tuple[int, int]],
+    module: str,
+) -> ConversionPlan:
+    """
+    Devuelve el ConversionPlan de una cabecera, reutilizándolo si ya se
+    construyó uno con la misma huella.
+    """
+    key = plan_fingerprint(order, amp_info, spans, module)
+    with _PLAN_CACHE_LOCK:
+        plan = _PLAN_CACHE.get(key)
+        if plan is not None:
+            _PLAN_CACHE.move_to_end(key)
+            return plan
+
+    # Se construye fuera del lock; si otro hilo se adelanta, gana el suyo
+    plan = build_conversion_plan(order, amp_info, spans, module)
+    with _PLAN_CACHE_LOCK:
+        plan = _PLAN_CACHE.setdefault(key, plan)
+        _PLAN_CACHE.move_to_end(key)
+        if len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+
+    logger.debug("[decoder] Nuevo plan de conversión %s (%s)", key[:12], module)
+    return plan
+
+
+def convert_value(
+    module: str,
+    inp: str,
+    rng: str,
+    span: Tuple[int, int],
+    raw_val: int,
+) -> float:
+    """
+    Conversión física unificada para todos los módulos GL100.
+
+    - GS-4VT: fórmulas oficiales (sin spans)
+    - Resto: conversión lineal por spans + ajustes heurísticos
+
+    Para convertir muchas muestras usar un ConversionPlan.
+    """
+    kind, divisor = _resolve_conversion(module, inp, rng)
+    col = ColumnConversion(name="", kind=kind, divisor=divisor, span=span)
+    return col.physical(raw_val)
 
 
 def convert_row_physical(
@@ -362,45 +781,258 @@ def convert_row_physical(
     raw_row: Any,
     amp_info: Dict[str, Dict[str, str]],
     spans: Dict[str, Tuple[int, int]],
+    plan: Optional[ConversionPlan] = None,
 ) -> List[Optional[float]]:
     """
     Convierte una fila de datos crudos (lista/tupla de enteros 16-bit)
     en unidades físicas, respetando el Order del header.
 
     Aplica también los códigos especiales del GL100.
+
+    Para convertir muchas filas conviene pasar un ConversionPlan
+    (get_conversion_plan); sin él, la conversión se resuelve columna
+    a columna en cada llamada.
     """
-    out: List[Optional[float]] = []
+    if plan is not None:
+        return plan.convert_row(raw_row)
 
-    for name, raw_val in zip(order, raw_row):
-        n = name.strip()
+    return [
+        resolve_column(module, name, amp_info, spans).convert(raw_val)
+        for name, raw_val in zip(order, raw_row)
+    ]
 
-        # Campos no canal (Logic, Alarm, etc.) → dejar raw tal cual
-        if not n.startswith("CH"):
-            out.append(raw_val)
-            continue
 
-        # Tratar códigos especiales
-        val_raw, flag = decode_special(int(raw_val))
-        if val_raw is None:
-            # Error / burnout / overFS / etc. → dejamos celda vacía
-            out.append(None)
+# ============================================================
+# CONVERSIÓN VECTORIZADA (numpy)
+# ============================================================
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "La decodificación vectorizada requiere numpy (pip install numpy)."
+        )
+
+
+def convert_column_physical(
+    module: str,
+    inp: str,
+    rng: str,
+    span: Tuple[int, int],
+    raw: "np.ndarray",
+) -> "np.ndarray":
+    """
+    Versión vectorizada de convert_value para una columna completa.
+
+    Recibe un array int16 con los valores crudos de un canal y devuelve
+    un array float64 en unidades físicas. Los códigos especiales GL100
+    (OverFS, Burnout, ...) se devuelven como NaN.
+    """
+    kind, divisor = _resolve_conversion(module, inp, rng)
+    col = ColumnConversion(name="", kind=kind, divisor=divisor, span=span)
+    return col.convert_array(raw)
+
+
+def decode_data_region(
+    data: Any,
+    order: List[str],
+    counts: int,
+    amp_info: Dict[str, Dict[str, str]],
+    spans: Dict[str, Tuple[int, int]],
+    module: str,
+    plan: Optional[ConversionPlan] = None,
+    return_flags: bool = False,
+) -> Any:
+    """
+    Decodifica la región de datos completa de un GBD (16-bit big-endian)
+    de forma columnar.
+
+    La región se ve con np.frombuffer(dtype=">i2") sin copiar, se le da
+    forma (counts, len(order)) y cada canal se convierte con un gather
+    sobre su tabla LUT (ver get_channel_lut).
+
+    Devuelve un array float64 (n_muestras, len(order)):
+      - Canales CH*: unidades físicas, NaN para códigos especiales.
+      - Resto (Logic, Alarm, ...): valor crudo.
+
+    Con return_flags=True devuelve (tabla, flags), donde flags es un
+    array uint8 con índices en FLAG_NAMES.
+    """
+    _require_numpy()
+
+    n_items = len(order)
+    if n_items == 0:
+        empty = np.empty((0, 0), dtype=np.float64)
+        return (empty, np.empty((0, 0), dtype=np.uint8)) if return_flags else empty
+
+    if plan is None:
+        plan = get_conversion_plan(order, amp_info, spans, module)
+
+    bytes_per_sample = n_items * 2
+    n_samples = min(counts, len(data) // bytes_per_sample)
+
+    raw = np.frombuffer(data, dtype=">i2", count=n_samples * n_items)
+    raw = raw.reshape(n_samples, n_items)
+
+    table = np.empty((n_samples, n_items), dtype=np.float64)
+    flags = np.zeros((n_samples, n_items), dtype=np.uint8) if return_flags else None
+    index = _as_lut_index(raw)
+
+    for idx, col in enumerate(plan.columns):
+        if col.kind == "raw":
+            table[:, idx] = raw[:, idx]
             continue
 
-        span = spans.get(n, (0, 1))
-        info = amp_info.get(n, {})
-        inp = info.get("input") or ""
-        rng = info.get("range") or ""
-
-        val = convert_value(
-            module=module,
-            inp=inp,
-            rng=rng,
-            span=span,
-            raw_val=val_raw,
+        # Un único gather por canal sobre su LUT de 65536 entradas
+        lut = col.lut()
+        table[:, idx] = lut.values[index[:, idx]]
+        if flags is not None:
+            flags[:, idx] = lut.flags[index[:, idx]]
+
+    if flags is not None:
+        return table, flags
+    return table
+
+
+def iter_physical_rows(
+    table: "np.ndarray",
+    order: List[str],
+) -> Iterator[List[Optional[float]]]:
+    """
+    Recorre una tabla de decode_data_region devolviendo filas con el
+    mismo formato que convert_row_physical:
+
+      - NaN → None
+      - Campos no canal → int
+    """
+    is_channel = [name.strip().startswith("CH") for name in order]
+
+    for values in table.tolist():
+        row: List[Optional[float]] = []
+        for ch, v in zip(is_channel, values):
+            if not ch:
+                row.append(int(v))
+            elif math.isnan(v):
+                row.append(None)
+            else:
+                row.append(v)
+        yield row
+
+
+# ============================================================
+# TABLAS LUT int16 → físico
+# ============================================================
+# Índice de flag en ChannelLUT.flags (0 = sin flag)
+FLAG_NAMES: Tuple[Optional[str], ...] = (
+    None,
+    "CalcError",
+    "Off",
+    "Burnout",
+    "OverFS",
+    "UnderFS",
+)
+
+
+@dataclass(frozen=True)
+class ChannelLUT:
+    """
+    Conversión tabulada de un canal para los 65536 valores int16.
+
+    - values: float64[65536], NaN en los códigos especiales
+    - flags:  uint8[65536], índice en FLAG_NAMES
+
+    El índice de la tabla es el valor crudo visto como uint16.
+    """
+    values: "np.ndarray"
+    flags: "np.ndarray"
+
+    def gather(self, raw: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Convierte un array int16 (cualquier endianness) con un gather."""
+        idx = _as_lut_index(raw)
+        return self.values[idx], self.flags[idx]
+
+
+def _as_lut_index(raw: "np.ndarray") -> "np.ndarray":
+    """Vista uint16 (sin copia) de un array int16 para indexar una LUT."""
+    return raw.view(np.dtype(raw.dtype.byteorder + "u2"))
+
+
+def build_channel_lut(col: ColumnConversion) -> ChannelLUT:
+    """Tabula la conversión de una columna para todo el rango int16."""
+    _require_numpy()
+
+    codes = np.arange(65536, dtype=np.uint16).view(np.int16)
+    values = col.convert_array(codes)
+
+    flags = np.zeros(65536, dtype=np.uint8)
+    if col.flags and col.kind != "raw":
+        for raw_val in SPECIAL_CODES:
+            _, flag = decode_special(raw_val)
+            flags[raw_val & 0xFFFF] = FLAG_NAMES.index(flag)
+
+    values.setflags(write=False)
+    flags.setflags(write=False)
+    return ChannelLUT(values=values, flags=flags)
+
+
+_LUT_CACHE: "OrderedDict[Tuple[Any, ...], ChannelLUT]" = OrderedDict()
+_LUT_CACHE_SIZE = 16  # ~9 MB (16 × 65536 × 9 bytes)
+_LUT_CACHE_LOCK = threading.Lock()
+
+
+def get_channel_lut(col: ColumnConversion) -> ChannelLUT:
+    """
+    Devuelve la LUT de una columna desde una caché LRU indexada por
+    (módulo, entrada, rango, span).
+    """
+    key = col.lut_key
+    if key is None:
+        key = (col.kind, col.divisor, col.span, col.flags)
+
+    with _LUT_CACHE_LOCK:
+        lut = _LUT_CACHE.get(key)
+        if lut is not None:
+            _LUT_CACHE.move_to_end(key)
+            return lut
+
+    lut = build_channel_lut(col)
+    with _LUT_CACHE_LOCK:
+        lut = _LUT_CACHE.setdefault(key, lut)
+        _LUT_CACHE.move_to_end(key)
+        if len(_LUT_CACHE) > _LUT_CACHE_SIZE:
+            _LUT_CACHE.popitem(last=False)
+    return lut
+
+
+def clear_lut_cache() -> None:
+    """Vacía la caché de tablas LUT."""
+    with _LUT_CACHE_LOCK:
+        _LUT_CACHE.clear()
+
+
+def decode_rows(data: BytesLike, plan: ConversionPlan, counts: Optional[int] = None) -> List[List[Optional[float]]]:
+    """
+    Decodifica un fragmento de la región de datos a filas físicas
+    (mismo formato que convert_row_physical).
+
+    Usa el motor columnar (LUT) si numpy está disponible y la
+    conversión fila a fila con el plan en caso contrario.
+    """
+    n_items = len(plan.columns)
+    if n_items == 0:
+        return []
+
+    n_samples = len(data) // (n_items * 2)
+    if counts is not None:
+        n_samples = min(n_samples, counts)
+
+    if np is not None:
+        table = decode_data_region(
+            data, list(plan.order), n_samples, {}, {}, plan.module, plan=plan
         )
-        out.append(val)
+        return list(iter_physical_rows(table, plan.order))
 
-    return out
+    fmt = struct.Struct(f">{n_items}h")
+    view = memoryview(data)[:n_samples * fmt.size]
+    return [plan.convert_row(raw_row) for raw_row in fmt.iter_unpack(view)]
 
 
 def build_column_names_with_units(
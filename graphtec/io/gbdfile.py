@@ -0,0 +1,283 @@
+"""
+Lectura de archivos .GBD locales con acceso aleatorio (mmap).
+
+GBDFile mapea el archivo en memoria y parsea la header region (hasta
+HeaderSiz) con GraphtecCapture._parse_header. La región de datos no se
+lee ni se copia:
+
+    with GBDFile("REC.GBD") as f:
+        f.raw                      # vista int16 (counts, n_cols), sin copia
+        f[1000]                    # fila física (como convert_row_physical)
+        sl = f[1000:2000]          # GBDSlice: O(1), nada decodificado aún
+        sl.physical()              # float64 (n, n_cols) vía LUT, NaN = especial
+        f.between(t0, t1).rows()   # por timestamp, filas físicas
+
+La vista numpy y la conversión vectorizada requieren numpy; sin él,
+GBDFile[i], GBDSlice.rows() e iter_chunks() siguen funcionando.
+"""
+
+import os
+import mmap
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Iterator, List, Optional, Tuple
+
+from graphtec.io.capture import GraphtecCapture
+from graphtec.io.decoder import _require_numpy, decode_data_region, decode_rows, iter_physical_rows
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él no hay vistas ni conversión vectorizada
+    np = None
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["GBDFile", "GBDSlice"]
+
+END_HEADER = b"$EndHeader"
+# Hasta dónde se busca $EndHeader (HeaderSiz real: unos pocos KB)
+MAX_HEADER_SCAN = 1 << 20
+
+
+class GBDSlice:
+    """
+    Rango [start, stop) de muestras de un GBDFile. Crearlo no lee nada;
+    cada conversión se hace al pedirla.
+    """
+
+    def __init__(self, gbd: "GBDFile", start: int, stop: int):
+        self.gbd = gbd
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __repr__(self) -> str:
+        return f"GBDSlice({os.path.basename(self.gbd.path)!r}, {self.start}, {self.stop})"
+
+    @property
+    def data(self) -> memoryview:
+        """Bytes crudos (16-bit big-endian) del rango, sin copia."""
+        bps = self.gbd.bytes_per_sample
+        return self.gbd.data[self.start * bps:self.stop * bps]
+
+    @property
+    def raw(self) -> "np.ndarray":
+        """Vista int16 (n, n_cols) del rango, sin copia."""
+        return self.gbd.raw[self.start:self.stop]
+
+    def physical(self, return_flags: bool = False) -> Any:
+        """
+        Tabla float64 (n, n_cols) en unidades físicas (igual que
+        decode_data_region): NaN en códigos especiales, crudo en los
+        campos no canal. Con return_flags=True devuelve (tabla, flags).
+        """
+        m = self.gbd.meta
+        return decode_data_region(
+            self.data,
+            m["order"],
+            len(self),
+            m["amp_info"],
+            m["spans"],
+            m["module"],
+            plan=m["plan"],
+            return_flags=return_flags,
+        )
+
+    def column(self, name: str) -> "np.ndarray":
+        """Un solo canal en unidades físicas (float64, NaN = especial)."""
+        _require_numpy()
+        idx = self.gbd.order.index(name)
+        col = self.gbd.plan.columns[idx]
+        raw = self.raw[:, idx]
+        if col.kind == "raw":
+            return raw.astype(np.float64)
+        return col.lut().values[raw.view(">u2")]
+
+    def rows(self) -> List[List[Optional[float]]]:
+        """Filas físicas con el formato de convert_row_physical."""
+        if np is not None:
+            return list(iter_physical_rows(self.physical(), self.gbd.order))
+        return decode_rows(self.data, self.gbd.plan, len(self))
+
+    def timestamps(self) -> List[Optional[datetime]]:
+        start_dt, delta = self.gbd.start_dt, self.gbd.sample_delta
+        if start_dt is None:
+            return [None] * len(self)
+        return [start_dt + i * delta for i in range(self.start, self.stop)]
+
+
+class GBDFile:
+    """
+    Archivo .GBD local (descargado con download_file o GbdWriter)
+    mapeado en memoria.
+
+    Atributos:
+        meta:   metadatos de GraphtecCapture._parse_header
+        counts: muestras presentes (Counts, limitado a lo que hay en disco)
+        data:   memoryview de la región de datos
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Archivo GBD vacío: {path}")
+
+        self.meta = GraphtecCapture._parse_header(self._read_header_text())
+        if not self.meta["order"]:
+            self.close()
+            raise ValueError(f"Header GBD sin Order en {path}")
+
+        self.header_siz: int = self.meta["header_siz"]
+        self.bytes_per_sample: int = self.meta["bytes_per_sample"]
+        available = max(0, len(self._mm) - self.header_siz) // self.bytes_per_sample
+        self.counts = min(self.meta["counts"], available)
+        if self.counts < self.meta["counts"]:
+            logger.warning(
+                "[GBDFile] %s solo tiene datos para %d muestras (header indicaba %d).",
+                path,
+                self.counts,
+                self.meta["counts"],
+            )
+
+        self.data = memoryview(self._mm)[self.header_siz:self.header_siz + self.counts * self.bytes_per_sample]
+        self._raw = None
+
+    def _read_header_text(self) -> str:
+        """Texto ASCII de la header region (hasta $EndHeader o HeaderSiz)."""
+        end = self._mm.find(END_HEADER, 0, MAX_HEADER_SCAN)
+        if end < 0:
+            raise ValueError(f"No se encuentra {END_HEADER.decode()} en {self.path}")
+        end = self._mm.find(b"\n", end)
+        end = len(self._mm) if end < 0 else end + 1
+        return self._mm[:end].decode("ascii", errors="ignore")
+
+    # ============================================================
+    # Metadatos
+    # ============================================================
+    @property
+    def header_text(self) -> str:
+        return self.meta["header_text"]
+
+    @property
+    def order(self) -> List[str]:
+        return self.meta["order"]
+
+    @property
+    def columns(self) -> List[str]:
+        return self.meta["columns"]
+
+    @property
+    def plan(self):
+        return self.meta["plan"]
+
+    @property
+    def start_dt(self) -> Optional[datetime]:
+        return self.meta["start_dt"]
+
+    @property
+    def sample_delta(self) -> timedelta:
+        return self.meta["sample_delta"]
+
+    def __len__(self) -> int:
+        return self.counts
+
+    def __repr__(self) -> str:
+        return f"GBDFile({self.path!r}, module={self.meta['module']}, counts={self.counts})"
+
+    # ============================================================
+    # Acceso aleatorio
+    # ============================================================
+    @property
+    def raw(self) -> "np.ndarray":
+        """Región de datos como vista int16 big-endian (counts, n_cols), sin copia."""
+        if self._raw is None:
+            _require_numpy()
+            raw = np.frombuffer(self.data, dtype=">i2")
+            self._raw = raw.reshape(self.counts, len(self.order))
+        return self._raw
+
+    def __getitem__(self, key):
+        """
+        f[i]           → fila física de la muestra i
+        f[a:b]         → GBDSlice por índice de muestra
+        f[t0:t1]       → GBDSlice por timestamp (datetime), ver between()
+        """
+        if isinstance(key, slice):
+            if isinstance(key.start, datetime) or isinstance(key.stop, datetime):
+                return self.between(key.start, key.stop)
+            start, stop, step = key.indices(self.counts)
+            if step != 1:
+                raise ValueError("GBDFile solo admite slices con paso 1")
+            return GBDSlice(self, start, max(start, stop))
+
+        index = key + self.counts if key < 0 else key
+        if not 0 <= index < self.counts:
+            raise IndexError(f"Muestra {key} fuera de rango (counts={self.counts})")
+        return GBDSlice(self, index, index + 1).rows()[0]
+
+    def index_at(self, when: datetime) -> int:
+        """
+        Primera muestra con timestamp >= when (acotada a [0, counts]).
+        O(1): se calcula a partir de Start y Sample.
+        """
+        if self.start_dt is None or not self.sample_delta:
+            raise ValueError("El header no tiene Start/Sample: no se puede indexar por tiempo")
+        index = -((self.start_dt - when) // self.sample_delta)
+        return min(max(index, 0), self.counts)
+
+    def between(self, t0: Optional[datetime] = None, t1: Optional[datetime] = None) -> GBDSlice:
+        """Muestras con t0 <= timestamp < t1 (None = sin límite)."""
+        start = 0 if t0 is None else self.index_at(t0)
+        stop = self.counts if t1 is None else self.index_at(t1)
+        return GBDSlice(self, start, max(start, stop))
+
+    def timestamp(self, index: int) -> Optional[datetime]:
+        if self.start_dt is None:
+            return None
+        return self.start_dt + index * self.sample_delta
+
+    def iter_chunks(
+        self,
+        chunk_samples: int = 4096,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Fragmentos (first, raw) de la región de datos (vistas sin copia),
+        con el mismo contrato que GraphtecCapture._iter_file_chunks.
+        """
+        stop = self.counts if stop is None else min(stop, self.counts)
+        bps = self.bytes_per_sample
+        for first in range(start, stop, chunk_samples):
+            last = min(first + chunk_samples, stop)
+            yield first, self.data[first * bps:last * bps]
+
+    # ============================================================
+    # Ciclo de vida
+    # ============================================================
+    def close(self) -> None:
+        """
+        Libera el mapeo. Si quedan vistas vivas (raw, slices) el mapeo
+        se libera cuando desaparezcan.
+        """
+        self._raw = None
+        data, self.data = getattr(self, "data", None), memoryview(b"")
+        try:
+            if data is not None:
+                data.release()
+            self._mm.close()
+        except BufferError:
+            logger.debug("[GBDFile] %s: vistas en uso, el mapeo se libera al recogerlas", self.path)
+        self._file.close()
+
+    def __enter__(self) -> "GBDFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
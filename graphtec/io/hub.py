@@ -0,0 +1,623 @@
+"""
+DeviceHub: muchos GL100 atendidos desde un único bucle selectors.
+
+En lugar de un Graphtec + hilo de sondeo por equipo, el hub registra el
+descriptor de cada conexión (puerto serie o socket) en un selector y
+avanza todas las operaciones desde un solo hilo:
+
+  - Cada equipo tiene como mucho una consulta en vuelo (el GL100 es
+    petición/respuesta). Las respuestas se reconstruyen de forma
+    incremental con FrameScanner a medida que llegan bytes.
+  - Sondeo en tiempo real (poll) con plazos fijos t0 + k*interval; los
+    huecos imposibles se saltan y se cuentan (missed).
+  - Operaciones largas (descargas TRANS, lectura de canales) son
+    secuencias de graphtec.io.protocol: entre dos peticiones de una
+    descarga siempre se atiende antes un sondeo pendiente, así que una
+    descarga nunca retrasa el tiempo real más de un fragmento.
+  - Las muestras decodificadas se publican como Sample(device_id,
+    timestamp, values) en la cola 'samples' (acotada) y/o en on_sample.
+  - El hub es dueño de cada conexión añadida hasta remove()/close():
+    lee y escribe el descriptor directamente, sin pasar por el arbiter
+    ni la PacingPolicy de la conexión (ver DeviceHub.add).
+
+Uso:
+    hub = DeviceHub()
+    for name, port in PUERTOS.items():
+        conn = SerialConnection(port=port); conn.open()
+        hub.add(name, conn)
+        hub.poll(name, interval=1.0)
+    hub.start()
+    ...
+    sample = hub.samples.get()
+"""
+
+import os
+import time
+import queue
+import select
+import socket
+import logging
+import selectors
+import threading
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from graphtec.connection.base import REPLY_BLOCK
+from graphtec.core.commands import MEAS
+from graphtec.core.exceptions import ConnectionError, DataError, DisconnectedError
+from graphtec.core.exceptions import TimeoutError as GraphtecTimeoutError
+from graphtec.io.capture import DEFAULT_FORMATS, GraphtecCapture
+from graphtec.io.chunking import ChunkerConfig
+from graphtec.io.decoder import FrameScanner
+from graphtec.io.protocol import FLUSH, Request, Steps, channels_steps, trans_download_steps
+from graphtec.io.realtime import ChannelSnapshot, GraphtecRealtime
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DeviceHub", "HubJob", "Sample"]
+
+# Máximo de bytes leídos por evento (reparto equitativo entre equipos)
+_READ_SIZE = 65536
+
+
+class Sample(NamedTuple):
+    """Muestra en tiempo real de un equipo del hub."""
+
+    device_id: str
+    timestamp: float  # reloj de pared, punto medio petición/respuesta
+    values: Dict[str, Any]
+
+
+class HubJob:
+    """Operación en curso en un equipo del hub (resultado tipo future)."""
+
+    def __init__(self, device_id: str, name: str, steps: Steps):
+        self.device_id = device_id
+        self.name = name
+        self.steps = steps
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Espera al final de la operación y devuelve su resultado (o relanza su error)."""
+        if not self._done.wait(timeout):
+            raise GraphtecTimeoutError(f"[DeviceHub] {self.name} en {self.device_id} no ha terminado")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _finish(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        self.result = result
+        self.error = error
+        self._done.set()
+
+
+class _Endpoint:
+    """
+    Descriptor no bloqueante de una conexión (socket o puerto serie POSIX).
+    Guarda el modo (bloqueante / timeout) original y lo restaura en release().
+    """
+
+    def __init__(self, connection):
+        raw = getattr(connection, "_connection", connection)
+        if raw is None:
+            raise ConnectionError("[DeviceHub] La conexión no está abierta")
+        self.conn = connection
+        self.raw = raw
+        self.is_socket = isinstance(raw, socket.socket)
+        if self.is_socket:
+            self._saved = raw.gettimeout()
+            raw.setblocking(False)
+        else:
+            self._saved = os.get_blocking(raw.fileno())
+            os.set_blocking(raw.fileno(), False)
+
+    def release(self) -> None:
+        """Devuelve el descriptor al modo en que estaba antes de entrar en el hub."""
+        try:
+            if self.is_socket:
+                self.raw.settimeout(self._saved)
+            else:
+                os.set_blocking(self.raw.fileno(), self._saved)
+        except (OSError, ValueError) as e:  # descriptor ya cerrado
+            logger.debug(f"[DeviceHub] No se pudo restaurar el modo del descriptor: {e}")
+            return
+        # El lector síncrono de la conexión vuelve a aplicar su timeout
+        reader = getattr(self.conn, "reader", None)
+        if reader is not None:
+            reader.clear()
+            reader.transport_timeout_changed()
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
+
+    def recv(self, size: int) -> Optional[bytes]:
+        """Bytes disponibles; None si no hay nada que leer, b"" si se cerró."""
+        try:
+            if self.is_socket:
+                return self.raw.recv(size)
+            return os.read(self.raw.fileno(), size)
+        except (BlockingIOError, InterruptedError):
+            return None
+
+    def write(self, data: bytes) -> None:
+        # Los comandos son cortos: basta con reintentar hasta vaciarlos
+        view = memoryview(data)
+        while view:
+            try:
+                n = self.raw.send(view) if self.is_socket else os.write(self.raw.fileno(), view)
+            except (BlockingIOError, InterruptedError):
+                select.select([], [self.raw], [], 1.0)
+                continue
+            view = view[n:]
+
+
+class _Device:
+    """Estado de un equipo dentro del hub."""
+
+    def __init__(self, device_id: str, connection, timeout: float, channels=None):
+        self.id = device_id
+        self.conn = connection
+        # Se crea al registrarse en el hub (pasa el descriptor a no bloqueante)
+        self.ep: Optional[_Endpoint] = None
+        self.timeout = timeout
+        self.scanner = FrameScanner()
+        self.amp = ChannelSnapshot(channels)
+        self.realtime = GraphtecRealtime(SimpleNamespace(amp=self.amp, measure=None))
+        self.closed = False
+
+        # Sondeo en tiempo real
+        self.interval: Optional[float] = None
+        self.next_poll = 0.0
+        self.missed = 0
+        self.samples = 0
+        self.errors = 0
+
+        # Operaciones (una activa; el resto en cola)
+        self.jobs: Deque[HubJob] = deque()
+        self.job: Optional[HubJob] = None
+        self.next_req: Optional[Tuple[List[str], Request]] = None
+
+        # Consulta en vuelo: (qué, t_envío, plazo)
+        self.inflight: Optional[Tuple[str, float, float]] = None
+
+
+def _encode(command: str) -> bytes:
+    data = command.encode()
+    return data if data.endswith(b"\r\n") else data + b"\r\n"
+
+
+class DeviceHub:
+    """Bucle selectors para muchos GL100 con pocos hilos."""
+
+    def __init__(
+        self,
+        on_sample: Optional[Callable[[Sample], None]] = None,
+        max_samples: int = 100_000,
+        timeout: float = 3.0,
+        chunk_samples: Optional[int] = None,
+        chunk_bytes: int = 8192,
+        target_rtt: float = 1.0,
+    ):
+        """
+        Args:
+            on_sample: callback (en el hilo del hub) por cada muestra.
+            max_samples: tamaño de la cola 'samples' (las que no caben se cuentan en dropped).
+            timeout: plazo por respuesta.
+            chunk_samples, chunk_bytes, target_rtt: fragmentos TRANS, como en GraphtecCapture.
+        """
+        self.on_sample = on_sample
+        self.samples: "queue.Queue[Sample]" = queue.Queue(maxsize=max_samples)
+        self.dropped = 0
+        self.timeout = timeout
+        self.chunk_config = ChunkerConfig(chunk_samples, chunk_bytes, target_rtt)
+
+        self._sel = selectors.DefaultSelector()
+        self._devices: Dict[str, _Device] = {}
+        self._order: List[str] = []
+        self._turn = 0
+        self._wall_offset = time.time() - time.monotonic()
+
+        # Llamadas desde otros hilos → se ejecutan en el hilo del bucle
+        self._calls: Deque[Callable[[], None]] = deque()
+        # Equipos de add() aún no registrados por el bucle
+        self._adding: set = set()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ, None)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ============================================================
+    # API (se puede llamar desde cualquier hilo)
+    # ============================================================
+    def add(self, device_id: str, connection, channels: Optional[Dict[int, Dict[str, Any]]] = None) -> Optional[HubJob]:
+        """
+        Añade un equipo con su conexión ya abierta (SerialConnection,
+        WLANConnection o un socket). Sin 'channels' se leen del equipo y
+        se devuelve el HubJob correspondiente.
+
+        Desde aquí hasta remove()/close() el hub es el dueño del
+        descriptor: lo pasa a modo no bloqueante y lee/escribe en él
+        directamente, sin el arbiter ni la PacingPolicy de la conexión.
+        No debe usarse la conexión por otra vía mientras tanto. Al salir
+        del hub se restaura su modo original (la conexión no se cierra).
+        """
+        if device_id in self._devices or device_id in self._adding:
+            raise ValueError(f"Equipo duplicado en el hub: {device_id}")
+        if getattr(connection, "_connection", connection) is None:
+            raise ConnectionError("[DeviceHub] La conexión no está abierta")
+
+        dev = _Device(device_id, connection, self.timeout, channels)
+        job = None if channels else HubJob(device_id, "channels", self._channels_steps(dev))
+
+        def register():
+            self._adding.discard(device_id)
+            # Puede haberse añadido otro con el mismo id entre la comprobación y aquí
+            if device_id in self._devices:
+                self._reject(job, ValueError(f"Equipo duplicado en el hub: {device_id}"))
+                return
+            try:
+                dev.ep = _Endpoint(connection)
+                self._sel.register(dev.ep, selectors.EVENT_READ, dev)
+            except Exception as e:
+                if dev.ep is not None:
+                    dev.ep.release()
+                self._reject(job, e)
+                return
+            self._devices[device_id] = dev
+            self._order.append(device_id)
+            if job is not None:
+                dev.jobs.append(job)
+            logger.info(f"[DeviceHub] Equipo {device_id} añadido")
+
+        self._adding.add(device_id)
+        self._call(register)
+        return job
+
+    def remove(self, device_id: str) -> None:
+        """Quita un equipo (sus operaciones pendientes terminan con error)."""
+        self._call(lambda: self._drop(device_id, ConnectionError(f"[DeviceHub] {device_id} retirado del hub")))
+
+    def poll(self, device_id: str, interval: Optional[float]) -> None:
+        """Sondea :MEAS:OUTP:ONE? cada 'interval' segundos (None = parar)."""
+
+        self._require(device_id)
+
+        def set_poll():
+            dev = self._devices.get(device_id)
+            if dev is None:
+                logger.warning(f"[DeviceHub] Sondeo de {device_id} ignorado: no está en el hub")
+                return
+            dev.interval = interval
+            dev.next_poll = time.monotonic()
+
+        self._call(set_poll)
+
+    def download(
+        self,
+        device_id: str,
+        path_in_gl: str,
+        dest_folder: str,
+        formats: Tuple[str, ...] = DEFAULT_FORMATS,
+    ) -> HubJob:
+        """Descarga TRANS (como GraphtecCapture.download, sin resume) intercalada con los sondeos."""
+        steps = trans_download_steps(
+            path_in_gl,
+            dest_folder,
+            tuple(formats),
+            self.chunk_config.make,
+            max_retries=GraphtecCapture.MAX_RETRIES,
+        )
+        return self.submit(device_id, steps, name=f"download {path_in_gl}")
+
+    def submit(self, device_id: str, steps: Steps, name: str = "job") -> HubJob:
+        """Encola cualquier secuencia de graphtec.io.protocol en un equipo."""
+        self._require(device_id)
+        job = HubJob(device_id, name, steps)
+
+        def enqueue():
+            dev = self._devices.get(device_id)
+            if dev is None:
+                self._reject(job, KeyError(f"Equipo desconocido en el hub: {device_id}"))
+                return
+            dev.jobs.append(job)
+
+        self._call(enqueue)
+        return job
+
+    def _require(self, device_id: str) -> None:
+        """KeyError en el hilo llamante si el equipo no está (ni va a estar) en el hub."""
+        if device_id not in self._devices and device_id not in self._adding:
+            raise KeyError(f"Equipo desconocido en el hub: {device_id}")
+
+    @staticmethod
+    def _reject(job: Optional[HubJob], error: BaseException) -> None:
+        """Termina con error una operación que no llega a encolarse."""
+        logger.error(f"[DeviceHub] {error}")
+        if job is not None:
+            job.steps.close()
+            job._finish(error=error)
+
+    def stats(self) -> Dict[str, Any]:
+        devices = {
+            dev.id: {
+                "samples": dev.samples,
+                "errors": dev.errors,
+                "missed": dev.missed,
+                "jobs": len(dev.jobs) + (dev.job is not None),
+                "closed": dev.closed,
+            }
+            for dev in list(self._devices.values())
+        }
+        return {"devices": devices, "dropped": self.dropped}
+
+    # ============================================================
+    # Bucle
+    # ============================================================
+    def start(self) -> "DeviceHub":
+        """Ejecuta el bucle en un hilo propio."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="graphtec-hub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self) -> None:
+        """Detiene el bucle y libera el selector (no cierra las conexiones)."""
+        self.stop()
+        self._run_calls()
+        for device_id in list(self._devices):
+            self._drop(device_id, ConnectionError("[DeviceHub] Hub cerrado"))
+        self._sel.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def __enter__(self) -> "DeviceHub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once(0.5)
+            except Exception:
+                logger.exception("[DeviceHub] Error en el bucle")
+
+    def run_once(self, max_wait: float = 0.5) -> None:
+        """Una vuelta del bucle: despacha, espera E/S (como mucho max_wait) y atiende."""
+        self._run_calls()
+
+        now = time.monotonic()
+        self._dispatch(now)
+
+        for key, _ in self._sel.select(self._select_timeout(now, max_wait)):
+            if key.data is None:
+                try:
+                    while self._wake_r.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+                continue
+            self._on_readable(key.data)
+
+        self._check_timeouts(time.monotonic())
+
+    # ------------------------------------------------------------
+    # Internos (solo en el hilo del bucle)
+    # ------------------------------------------------------------
+    def _call(self, fn: Callable[[], None]) -> None:
+        self._calls.append(fn)
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run_calls(self) -> None:
+        while self._calls:
+            self._calls.popleft()()
+
+    def _select_timeout(self, now: float, max_wait: float) -> float:
+        timeout = max_wait
+        for dev in self._devices.values():
+            if dev.inflight is not None:
+                timeout = min(timeout, dev.inflight[2] - now)
+            elif dev.interval and dev.amp.channels:
+                timeout = min(timeout, dev.next_poll - now)
+        return max(0.0, timeout)
+
+    def _dispatch(self, now: float) -> None:
+        """Envía la siguiente consulta de cada equipo libre, por turnos."""
+        n = len(self._order)
+        for i in range(n):
+            dev = self._devices.get(self._order[(self._turn + i) % n])
+            if dev is not None and not dev.closed and dev.inflight is None:
+                self._service(dev, now)
+        self._turn = (self._turn + 1) % max(1, n)
+
+    def _service(self, dev: _Device, now: float) -> None:
+        # 1) Sondeo en tiempo real pendiente (prioridad sobre las operaciones)
+        if dev.interval and dev.amp.channels and now >= dev.next_poll:
+            late = now - dev.next_poll
+            if late >= dev.interval:
+                skipped = int(late // dev.interval)
+                dev.missed += skipped
+                dev.next_poll += skipped * dev.interval
+            dev.next_poll += dev.interval
+            self._send(dev, [], Request(MEAS.READ_ONCE, REPLY_BLOCK), "poll")
+            return
+
+        # 2) Siguiente petición de la operación activa (o de la siguiente en cola)
+        if dev.next_req is None and dev.job is None and dev.jobs:
+            dev.job = dev.jobs.popleft()
+            self._step(dev)
+        if dev.next_req is not None:
+            prefix, req = dev.next_req
+            dev.next_req = None
+            self._send(dev, prefix, req, "job")
+
+    def _send(self, dev: _Device, prefix: List[str], req: Request, what: str) -> None:
+        dev.scanner.expect(req.kind)
+        try:
+            dev.ep.write(b"".join(_encode(c) for c in prefix + [req.command]))
+        except OSError as e:
+            self._drop(dev.id, ConnectionError(f"[DeviceHub] Error de escritura en {dev.id}: {e}"))
+            return
+        t = time.monotonic()
+        dev.inflight = (what, t, t + dev.timeout)
+
+    def _step(self, dev: _Device, reply: Any = None, error: Optional[BaseException] = None) -> None:
+        """Avanza la operación activa hasta su siguiente consulta con respuesta."""
+        job = dev.job
+        prefix: List[str] = []
+        while True:
+            try:
+                req = job.steps.throw(error) if error is not None else job.steps.send(reply)
+            except StopIteration as stop:
+                self._flush(dev, prefix)
+                self._end_job(dev, result=stop.value)
+                return
+            except Exception as e:
+                self._end_job(dev, error=e)
+                return
+            reply = error = None
+            if req.kind == FLUSH:
+                self._discard_input(dev)
+                continue
+            if req.kind is None:
+                # Comandos sin respuesta: se envían junto con la siguiente consulta
+                prefix.append(req.command)
+                continue
+            dev.next_req = (prefix, req)
+            return
+
+    def _discard_input(self, dev: _Device) -> None:
+        """Descarta lo ya recibido (restos de un bloque fallido) antes de reintentar."""
+        dev.scanner.reset()
+        try:
+            while dev.ep.recv(_READ_SIZE):
+                pass
+        except OSError as e:
+            logger.debug(f"[DeviceHub] {dev.id}: error descartando la entrada: {e}")
+
+    def _flush(self, dev: _Device, prefix: List[str]) -> None:
+        if prefix:
+            try:
+                dev.ep.write(b"".join(_encode(c) for c in prefix))
+            except OSError as e:
+                logger.warning(f"[DeviceHub] Error de escritura en {dev.id}: {e}")
+
+    def _end_job(self, dev: _Device, result: Any = None, error: Optional[BaseException] = None) -> None:
+        job, dev.job, dev.next_req = dev.job, None, None
+        if error is not None:
+            logger.error(f"[DeviceHub] {job.name} en {dev.id} falló: {error}")
+        job._finish(result, error)
+
+    def _on_readable(self, dev: _Device) -> None:
+        data = dev.ep.recv(_READ_SIZE)
+        if data is None:
+            return
+        if not data:
+            self._drop(dev.id, DisconnectedError(f"[DeviceHub] {dev.id} desconectado"))
+            return
+        if dev.inflight is None:
+            logger.debug(f"[DeviceHub] {dev.id}: {len(data)} bytes sin consulta pendiente")
+            return
+
+        try:
+            reply = dev.scanner.feed(data)
+        except ValueError as e:
+            self._complete(dev, error=DataError(f"[DeviceHub] {dev.id}: {e}"))
+            return
+        if reply is not None:
+            self._complete(dev, reply=reply)
+
+    def _complete(self, dev: _Device, reply: Any = None, error: Optional[BaseException] = None) -> None:
+        what, t_sent, _ = dev.inflight
+        dev.inflight = None
+        if error is not None:
+            dev.scanner.reset()
+
+        if what == "poll":
+            if error is not None:
+                dev.errors += 1
+                logger.warning(f"[DeviceHub] Sondeo fallido en {dev.id}: {error}")
+                return
+            self._publish(dev, t_sent, time.monotonic(), reply)
+        elif dev.job is not None:
+            self._step(dev, reply=reply, error=error)
+
+    def _check_timeouts(self, now: float) -> None:
+        for dev in list(self._devices.values()):
+            if dev.inflight is not None and now > dev.inflight[2]:
+                self._complete(dev, error=GraphtecTimeoutError(f"[DeviceHub] Timeout esperando a {dev.id}"))
+
+    def _publish(self, dev: _Device, t_sent: float, t_done: float, reply: bytes) -> None:
+        payload = dev.realtime.strip_prefix(reply)
+        if not payload:
+            dev.errors += 1
+            return
+        try:
+            values = dev.realtime.decode_payload(payload)
+        except Exception as e:
+            dev.errors += 1
+            logger.warning(f"[DeviceHub] Trama no decodificable de {dev.id}: {e}")
+            return
+
+        sample = Sample(dev.id, self._wall_offset + (t_sent + t_done) / 2, values)
+        dev.samples += 1
+        if self.on_sample is not None:
+            try:
+                self.on_sample(sample)
+            except Exception:
+                logger.exception("[DeviceHub] Error en on_sample")
+        try:
+            self.samples.put_nowait(sample)
+        except queue.Full:
+            self.dropped += 1
+
+    def _channels_steps(self, dev: _Device) -> Steps:
+        channels = yield from channels_steps()
+        dev.amp.update(channels)
+        return channels
+
+    def _drop(self, device_id: str, error: BaseException) -> None:
+        dev = self._devices.pop(device_id, None)
+        if dev is None:
+            return
+        self._order.remove(device_id)
+        dev.closed = True
+        if dev.ep is not None:
+            try:
+                self._sel.unregister(dev.ep)
+            except (KeyError, ValueError):
+                pass
+            dev.ep.release()
+        if dev.job is not None:
+            dev.job.steps.close()
+            dev.job._finish(error=error)
+        for job in dev.jobs:
+            job.steps.close()
+            job._finish(error=error)
+        dev.jobs.clear()
+        logger.info(f"[DeviceHub] Equipo {device_id} fuera del hub ({error})")
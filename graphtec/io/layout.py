@@ -0,0 +1,322 @@
+"""
+Layouts compilados para las tramas :MEAS:OUTP:ONE? (tiempo real).
+
+A partir de la configuración de canales (AmpModule.get_channels()) se
+genera un FrameLayout: un struct.Struct con toda la trama y una tabla
+de campos (emisores) que se aplica sobre la tupla resultante. Cada
+trama se decodifica así con un único unpack_from.
+
+Además de los diccionarios de read(), el layout expone columns y
+decode_values(): una lista de valores en orden fijo (sin flags, None si
+el dato es un código especial) para consumidores como RealtimeStream
+que no quieren crear un dict por muestra.
+
+Los módulos con bloque propio (TH, ACC, LXUV, CO2) pueden llevar al
+final A / AO / STATUS; por eso se compilan dos variantes: con y sin esos
+trailers. Las tramas cuyo tamaño no encaja con ninguna (truncadas,
+módulos mezclados) las decodifica GraphtecRealtime con el recorrido
+canal a canal de siempre.
+"""
+
+import struct
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from graphtec.io.decoder import decode_special, channel_conversion
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["FrameLayout", "compile_frame_layout", "channels_signature"]
+
+# (valores del unpack, diccionario de salida) → None
+Emitter = Callable[[Tuple[int, ...], Dict[str, Any]], None]
+
+# valores del unpack → valor físico de una columna (None si no hay dato)
+ValueFn = Callable[[Tuple[int, ...]], Any]
+
+# A, AO, STATUS
+_TRAILER_SIZE = 6
+
+
+# ============================================================
+# EMISORES (tabla de campos)
+# ============================================================
+def _emit_lookup(idx: int, key: str, flag_key: str, conv, keep_none: bool) -> Emitter:
+    lookup = conv.lookup
+
+    def emit(vals, out):
+        v, flag = lookup(vals[idx])
+        if keep_none or v is not None:
+            out[key] = v
+        if flag:
+            out[flag_key] = flag
+
+    return emit
+
+
+def _emit_special(idx: int, key: str, flag_key: str) -> Emitter:
+    def emit(vals, out):
+        val, flag = decode_special(vals[idx])
+        out[key] = val
+        if flag:
+            out[flag_key] = flag
+
+    return emit
+
+
+def _emit_value(idx: int, key: str, divisor: Optional[float] = None) -> Emitter:
+    if divisor is None:
+        def emit(vals, out):
+            out[key] = vals[idx]
+    else:
+        def emit(vals, out):
+            out[key] = vals[idx] / divisor
+    return emit
+
+
+def _value_fn(idx: int, divisor: Optional[float] = None, u32: bool = False,
+              lookup=None, special: bool = False) -> ValueFn:
+    """Función de valor de una columna (mismas conversiones que los emisores)."""
+    if lookup is not None:
+        return lambda vals: lookup(vals[idx])[0]
+    if special:
+        return lambda vals: decode_special(vals[idx])[0]
+    if u32:
+        if divisor is None:
+            return lambda vals: (vals[idx] << 16) | vals[idx + 1]
+        return lambda vals: ((vals[idx] << 16) | vals[idx + 1]) / divisor
+    if divisor is None:
+        return lambda vals: vals[idx]
+    return lambda vals: vals[idx] / divisor
+
+
+def _emit_u32(idx: int, key: str, divisor: Optional[float] = None) -> Emitter:
+    """Acumulados de 32 bits en dos words (alto, bajo)."""
+    if divisor is None:
+        def emit(vals, out):
+            out[key] = (vals[idx] << 16) | vals[idx + 1]
+    else:
+        def emit(vals, out):
+            out[key] = ((vals[idx] << 16) | vals[idx + 1]) / divisor
+    return emit
+
+
+# ============================================================
+# COMPILADOR
+# ============================================================
+class _Builder:
+    """Acumula el formato struct y los emisores de una variante."""
+
+    def __init__(self, trailers: bool):
+        self.with_trailers = trailers
+        self.fmt: List[str] = [">"]
+        self.n_values = 0
+        self.emitters: List[Emitter] = []
+        self.columns: List[Tuple[str, ValueFn]] = []
+        self.n_trailers = 0
+        self.trailer_last = False
+
+    def pad(self, n_bytes: int) -> None:
+        self.fmt.append(f"{n_bytes}x")
+        self.trailer_last = False
+
+    def words(self, code: str, n: int = 1) -> int:
+        """Añade n words y devuelve el índice del primero en la tupla."""
+        idx = self.n_values
+        self.fmt.append(f"{n}{code}")
+        self.n_values += n
+        self.trailer_last = False
+        return idx
+
+    def trailer(self, prefix: str) -> None:
+        """A, AO, STATUS opcionales al final de un bloque de módulo."""
+        self.n_trailers += 1
+        if self.with_trailers:
+            idx = self.words("H", 3)
+            for i, name in enumerate(("Alarm", "AlarmOut", "Status")):
+                key = f"{prefix}_{name}"
+                self.emit(key, _emit_value(idx + i, key), _value_fn(idx + i))
+        self.trailer_last = True
+
+    def emit(self, key: str, emitter: Emitter, value: ValueFn) -> None:
+        """Campo 'key': emisor para el dict de read() y función de valor para columns."""
+        self.emitters.append(emitter)
+        self.columns.append((key, value))
+
+
+def _scaled(b: _Builder, idx: int, key: str, divisor: Optional[float] = None) -> None:
+    b.emit(key, _emit_value(idx, key, divisor), _value_fn(idx, divisor))
+
+
+def _accum(b: _Builder, idx: int, key: str, divisor: Optional[float] = None) -> None:
+    b.emit(key, _emit_u32(idx, key, divisor), _value_fn(idx, divisor, u32=True))
+
+
+def _build(channels: Dict[int, Dict[str, Any]], trailers: bool) -> _Builder:
+    """Mismo recorrido canal a canal que GraphtecRealtime.read, pero generando código."""
+    b = _Builder(trailers)
+    seen = set()
+    temp = channel_conversion("GS-4VT", "TEMP", "")
+
+    for ch in range(1, 5):
+        info = channels[ch]
+        tipo = info["type"]
+        entrada = info["input"]
+        rango = info["range"]
+
+        # En 4VT/4TSR hay un word por canal aunque esté OFF
+        if entrada == "OFF" and tipo in ("VT", "TSR"):
+            b.pad(2)
+            continue
+
+        if tipo == "VT":
+            idx = b.words("h")
+            if entrada == "DC_V":
+                conv = channel_conversion("GS-4VT", "DC_V", rango)
+                key = f"CH{ch}_V"
+                b.emit(key, _emit_lookup(idx, key, f"{key}_Flag", conv, keep_none=False),
+                       _value_fn(idx, lookup=conv.lookup))
+            elif entrada in ("TC-K", "TC-T"):
+                key = f"CH{ch}_Temp_{entrada}"
+                b.emit(key, _emit_lookup(idx, key, f"{key}_Flag", temp, keep_none=True),
+                       _value_fn(idx, lookup=temp.lookup))
+            else:
+                key = f"CH{ch}_raw"
+                b.emit(key, _emit_special(idx, key, f"CH{ch}_Flag"), _value_fn(idx, special=True))
+            continue
+
+        if tipo == "TSR":
+            idx = b.words("h")
+            key = f"CH{ch}_Temp_TSR"
+            b.emit(key, _emit_lookup(idx, key, f"{key}_Flag", temp, keep_none=True),
+                   _value_fn(idx, lookup=temp.lookup))
+            continue
+
+        # Módulos con una sola trama (dummy inicial) compartida por los canales
+        block = "LXUV" if tipo in ("LUX", "UV") else tipo
+        if block in ("TH", "ACC", "LXUV", "CO2"):
+            if block in seen:
+                continue
+            seen.add(block)
+            b.pad(2)  # Data1 dummy
+
+            if block == "TH":
+                idx = b.words("H", 5)
+                _scaled(b, idx, f"CH{ch}_Temp_C", 10.0)
+                _scaled(b, idx + 1, f"CH{ch}_Humidity_%", 200.0)
+                _scaled(b, idx + 2, f"CH{ch}_Dew_C", 100.0)
+                _accum(b, idx + 3, f"CH{ch}_AccumTemp", 100.0)
+                b.trailer(f"CH{ch}")
+            elif block == "ACC":
+                idx = b.words("h", 4)
+                _scaled(b, idx, f"CH{ch}_X")
+                _scaled(b, idx + 1, f"CH{ch}_Y")
+                _scaled(b, idx + 2, f"CH{ch}_Z")
+                _scaled(b, idx + 3, f"CH{ch}_Temp", 10.0)
+                b.trailer(f"CH{ch}")
+            elif block == "LXUV":
+                lux_ch = next((i for i, c in channels.items() if c.get("type") == "LUX"), None)
+                uv_ch = next((i for i, c in channels.items() if c.get("type") == "UV"), None)
+                idx = b.words("H", 6)
+                if lux_ch is not None:
+                    _scaled(b, idx, f"CH{lux_ch}_LUX")
+                if uv_ch is not None:
+                    _scaled(b, idx + 1, f"CH{uv_ch}_UV")
+                _accum(b, idx + 2, "AccumLux")
+                _accum(b, idx + 4, "AccumUV")
+                b.trailer("LXUV")
+            else:  # CO2
+                idx = b.words("H")
+                _scaled(b, idx, f"CH{ch}_CO2_ppm", 4.0)
+                b.trailer(f"CH{ch}")
+            continue
+
+        # Genérico: cualquier cosa no contemplada
+        idx = b.words("h")
+        key = f"CH{ch}_raw"
+        b.emit(key, _emit_special(idx, key, f"CH{ch}_Flag"), _value_fn(idx, special=True))
+
+    return b
+
+
+class FrameLayout:
+    """
+    Layout compilado de una configuración de canales.
+
+    - full / full_fields: trama con todos los trailers A/AO/STATUS
+    - base / base_fields: trama sin trailers
+    - columns: claves de valor en orden fijo (las de la variante full)
+    """
+
+    def __init__(self, full: _Builder, base: _Builder):
+        self.full = struct.Struct("".join(full.fmt))
+        self.full_fields = full.emitters
+        self.base = struct.Struct("".join(base.fmt))
+        self.base_fields = base.emitters
+
+        self.columns: List[str] = [key for key, _ in full.columns]
+        self._full_values = [fn for _, fn in full.columns]
+        position = {key: i for i, key in enumerate(self.columns)}
+        self._base_values = [(position[key], fn) for key, fn in base.columns]
+
+        # Sin trailers al final de la trama no se puede saber, solo por
+        # tamaño, si un bloque intermedio los lleva: solo 'full' es fiable.
+        self._base_ok = full.n_trailers == 1 and full.trailer_last
+
+    def select(self, n_bytes: int) -> Optional[Tuple[struct.Struct, List[Emitter]]]:
+        """Variante aplicable a una trama de n_bytes (None → recorrido canal a canal)."""
+        if n_bytes >= self.full.size:
+            return self.full, self.full_fields
+        if self._base_ok and self.base.size <= n_bytes < self.base.size + _TRAILER_SIZE:
+            return self.base, self.base_fields
+        return None
+
+    def decode(self, payload) -> Optional[Dict[str, Any]]:
+        """Decodifica una trama con un solo unpack_from, o None si no encaja."""
+        variant = self.select(len(payload))
+        if variant is None:
+            return None
+        layout, fields = variant
+        vals = layout.unpack_from(payload)
+        out: Dict[str, Any] = {}
+        for emit in fields:
+            emit(vals, out)
+        return out
+
+    def decode_values(self, payload) -> Optional[List[Any]]:
+        """
+        Valores de la trama alineados con columns (None = código especial
+        o trailer ausente), o None si la trama no encaja.
+        """
+        n_bytes = len(payload)
+        if n_bytes >= self.full.size:
+            vals = self.full.unpack_from(payload)
+            return [fn(vals) for fn in self._full_values]
+        if self._base_ok and self.base.size <= n_bytes < self.base.size + _TRAILER_SIZE:
+            vals = self.base.unpack_from(payload)
+            out: List[Any] = [None] * len(self.columns)
+            for i, fn in self._base_values:
+                out[i] = fn(vals)
+            return out
+        return None
+
+
+def channels_signature(channels: Dict[int, Dict[str, Any]]) -> Tuple:
+    """Clave hashable de una configuración de canales."""
+    return tuple(
+        (ch, info.get("type"), info.get("input"), info.get("range"))
+        for ch, info in sorted(channels.items())
+    )
+
+
+def compile_frame_layout(channels: Dict[int, Dict[str, Any]]) -> FrameLayout:
+    """Compila la configuración de canales en un FrameLayout."""
+    layout = FrameLayout(_build(channels, trailers=True), _build(channels, trailers=False))
+    logger.debug(
+        "[layout] Trama compilada: %s (%d bytes), sin trailers %s (%d bytes)",
+        layout.full.format,
+        layout.full.size,
+        layout.base.format,
+        layout.base.size,
+    )
+    return layout
@@ -0,0 +1,184 @@
+"""
+Descarga TRANS en modo productor/consumidor.
+
+En el bucle secuencial cada :TRANS:OUTP:DATA espera a que el fragmento
+anterior se haya decodificado y escrito. Aquí:
+
+  - Un hilo lector es el único que usa la conexión: ejecuta la misma
+    política que el bucle secuencial (trans_data_steps: rangos según el
+    AdaptiveChunker, verificación, reintentos y resync), recibe cada
+    bloque en un buffer de un pool y encola los datos verificados en una
+    cola acotada.
+  - El hilo consumidor (el que itera TransPipeline) los entrega en orden
+    a los escritores y devuelve el buffer al pool.
+
+La cola y el pool acotan la memoria a (depth + 1) fragmentos.
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from graphtec.io.chunking import BLOCK_OVERHEAD, AdaptiveChunker, FetchRange, run_data_steps, trans_data_steps
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["TransPipeline"]
+
+# Periodo de sondeo del evento de parada en las esperas bloqueantes
+_POLL_S = 0.05
+
+
+class _ReaderDone:
+    """Marca encolada por el lector al terminar (error=None) o al fallar."""
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class TransPipeline:
+    """
+    Iterable de (índice 0-based de la primera muestra, DATA) con el mismo
+    contrato que GraphtecCapture._iter_data_chunks: cada DATA solo es
+    válida hasta la siguiente iteración.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int, bytearray], Any],
+        chunker: AdaptiveChunker,
+        counts: int,
+        bytes_per_sample: int,
+        depth: int = 4,
+        max_retries: int = 3,
+        start: int = 0,
+        resync: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            fetch: fetch(first, last, buffer) → bloque '#6******' crudo del
+                rango [first, last] (1-based), leído en buffer si es posible.
+            chunker: controlador de tamaño de fragmento.
+            counts: muestras totales.
+            bytes_per_sample: bytes por muestra.
+            depth: bloques en vuelo entre lector y consumidor.
+            max_retries: reintentos por rango antes de abandonar.
+            start: muestras (0-based) que ya se tienen; se pide desde start + 1.
+            resync: se llama antes de cada reintento para descartar lo
+                pendiente en la línea (restos de un bloque fallido).
+        """
+        self.fetch = fetch
+        self.chunker = chunker
+        self.counts = counts
+        self.bytes_per_sample = bytes_per_sample
+        self.depth = max(1, depth)
+        self.max_retries = max_retries
+        self.start = start
+        self.resync = resync
+
+        self._stop = threading.Event()
+        self._blocks: "queue.Queue[Any]" = queue.Queue(maxsize=self.depth)
+        # Cada buffer admite el mayor bloque que puede pedir el chunker
+        # ('#6******' + STATUS + DATA + CHECKSUM): no se realoja al crecer
+        self.buffer_size = self.chunker.max_block_bytes + BLOCK_OVERHEAD
+        self._pool: "queue.Queue[bytearray]" = queue.Queue()
+        for _ in range(self.depth + 1):
+            self._pool.put(bytearray(self.buffer_size))
+
+        # Actualizado por trans_data_steps desde el hilo lector
+        self._stats: Dict[str, Any] = chunker.stats()
+
+        # Tiempo que cada lado pasa esperando al otro
+        self.reader_wait = 0.0
+        self.consumer_wait = 0.0
+
+    # ------------------------------------------------------------
+    # Estadísticas
+    # ------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats.update(
+            pipelined=True,
+            depth=self.depth,
+            reader_wait_s=self.reader_wait,
+            consumer_wait_s=self.consumer_wait,
+        )
+        return stats
+
+    # ------------------------------------------------------------
+    # Hilo lector
+    # ------------------------------------------------------------
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._blocks.put(item, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _take_buffer(self) -> Optional[bytearray]:
+        """Buffer libre del pool (fuera del RTT medido por el chunker)."""
+        t0 = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return self._pool.get(timeout=_POLL_S)
+                except queue.Empty:
+                    continue
+            return None
+        finally:
+            self.reader_wait += time.monotonic() - t0
+
+    def _read_loop(self) -> None:
+        buf = self._take_buffer()
+
+        def fetch(req: FetchRange) -> Any:
+            nonlocal buf
+            if len(buf) < req.size:  # no debería ocurrir (ver buffer_size)
+                buf = bytearray(req.size)
+            return self.fetch(req.first, req.last, buf)
+
+        meta = {"counts": self.counts, "bytes_per_sample": self.bytes_per_sample}
+        steps = trans_data_steps(meta, self.chunker, self.max_retries, self.start, stats=self._stats)
+        try:
+            if buf is None:
+                return
+            # Tras un fallo el mismo buffer se reutiliza en el reintento
+            for first, data in run_data_steps(steps, fetch, self.resync):
+                if not self._put((first, data, buf)):
+                    return
+                buf = self._take_buffer()
+                if buf is None:
+                    return
+            self._put(_ReaderDone())
+        except BaseException as e:  # se propaga al consumidor
+            self._put(_ReaderDone(e))
+        finally:
+            steps.close()
+
+    # ------------------------------------------------------------
+    # Consumidor
+    # ------------------------------------------------------------
+    def __iter__(self) -> Iterator[Tuple[int, memoryview]]:
+        reader = threading.Thread(target=self._read_loop, name="graphtec-trans-reader", daemon=True)
+        reader.start()
+        try:
+            while True:
+                t0 = time.monotonic()
+                item = self._blocks.get()
+                self.consumer_wait += time.monotonic() - t0
+
+                if isinstance(item, _ReaderDone):
+                    if item.error is not None:
+                        raise item.error
+                    return
+
+                first, data, buf = item
+                yield first, data
+                self._pool.put(buf)
+        finally:
+            self._stop.set()
+            reader.join()
@@ -0,0 +1,271 @@
+"""
+Secuencias de comandos del GL100 sin E/S (estilo sans-IO).
+
+Cada operación es un generador que produce Request(command, kind) y
+recibe, vía send(), la respuesta completa (o None si kind es None, es
+decir, comando sin respuesta). Los timeouts y las tramas inválidas se
+inyectan con throw(). Request(..., FLUSH) no envía nada: pide descartar
+lo que quede pendiente en la línea antes de un reintento.
+Así la misma lógica la ejecutan:
+
+  - AsyncGraphtecCapture / AsyncGraphtec (await conn.query / conn.send)
+  - DeviceHub (bucle selectors con muchos equipos)
+
+Operaciones:
+  - channels_steps():        configuración de los 4 canales (3 queries c/u)
+  - trans_download_steps():  descarga TRANS completa hacia los escritores
+"""
+
+import os
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Generator, List, NamedTuple, Optional, Tuple
+
+from graphtec.connection.base import REPLY_ASCII, REPLY_BLOCK, REPLY_OPEN, REPLY_TRANS_DATA
+from graphtec.core.commands import AMP, TRANS
+from graphtec.core.exceptions import TimeoutError as GraphtecTimeoutError
+from graphtec.io.capture import GraphtecCapture
+from graphtec.io.chunking import RETRYABLE_ERRORS, AdaptiveChunker, DataChunk, FetchRange, trans_data_steps
+from graphtec.io.decoder import parse_head_block
+from graphtec.io.writers import CaptureChunk
+from graphtec.utils.utils import get_last_token, to_str
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Request", "Steps", "FLUSH", "channels_steps", "trans_download_steps", "run_steps_async"]
+
+# Pseudo-respuesta: descartar lo pendiente en la línea (sin comando)
+FLUSH = "flush"
+
+
+class Request(NamedTuple):
+    """Comando a enviar y forma de su respuesta (None = sin respuesta)."""
+
+    command: str
+    kind: Optional[str] = REPLY_ASCII
+
+
+# Generador de Request que recibe respuestas y devuelve un resultado
+Steps = Generator[Request, Any, Any]
+
+
+# ============================================================
+# EJECUCIÓN
+# ============================================================
+async def run_steps_async(
+    conn,
+    steps: Steps,
+    offload: bool = False,
+    executor: Optional[Executor] = None,
+) -> Any:
+    """
+    Ejecuta una secuencia sobre una conexión asyncio (send/query awaitables).
+
+    Con offload=True cada avance del generador (lo que hace entre dos
+    peticiones: verificar, decodificar, escribir) corre en 'executor'
+    vía loop.run_in_executor, así el bucle de eventos no se bloquea.
+
+    Un error no reintentable o una cancelación se lanzan dentro de la
+    secuencia (throw) para que cierre TRANS y sus escritores, como el
+    finally del camino síncrono, y después se propagan.
+    """
+    loop = asyncio.get_running_loop()
+
+    def advance(reply: Any, error: Optional[BaseException]) -> Tuple[bool, Any]:
+        # StopIteration no puede atravesar un Future: se devuelve como (True, valor)
+        try:
+            return False, steps.throw(error) if error is not None else steps.send(reply)
+        except StopIteration as stop:
+            return True, stop.value
+
+    async def advance_offloaded(reply: Any, error: Optional[BaseException]) -> Tuple[bool, Any]:
+        fut = loop.run_in_executor(executor, advance, reply, error)
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # El generador sigue en el executor: no se toca hasta que lo suelte
+            await asyncio.wait([fut])
+            raise
+
+    reply: Any = None
+    error: Optional[BaseException] = None
+    fatal: Optional[BaseException] = None
+    try:
+        while True:
+            try:
+                if offload and fatal is None:
+                    done, req = await advance_offloaded(reply, error)
+                else:
+                    done, req = advance(reply, error)
+            except asyncio.CancelledError as e:
+                if fatal is not None:
+                    raise fatal
+                fatal = error = e
+                reply = None
+                continue
+            if done:
+                if fatal is not None:
+                    raise fatal
+                return req
+
+            reply = error = None
+            try:
+                if req.kind == FLUSH:
+                    if hasattr(conn, "flush_buffer"):
+                        await conn.flush_buffer()
+                elif req.kind is None:
+                    await conn.send(req.command)
+                else:
+                    reply = await conn.query(req.command)
+            except RETRYABLE_ERRORS as e:
+                error = e
+            except BaseException as e:
+                if fatal is not None:
+                    # Falló también el cierre: se propaga el error original
+                    raise fatal
+                logger.error(f"[protocol] Secuencia interrumpida: {e!r}")
+                fatal = error = e
+    finally:
+        steps.close()
+
+
+# ============================================================
+# CANALES
+# ============================================================
+def channels_steps() -> Steps:
+    """Lee tipo, entrada y rango de los 4 canales (como AmpModule.get_channels)."""
+    channels: Dict[int, Dict[str, str]] = {}
+    for ch in range(1, 5):
+        info = {}
+        for field, cmd in (
+            ("type", AMP.GET_CHANNEL_TYPE),
+            ("input", AMP.GET_CHANNEL_INPUT),
+            ("range", AMP.GET_CHANNEL_RANGE),
+        ):
+            resp = yield Request(cmd.format(ch=ch))
+            info[field] = get_last_token(to_str(resp))
+        channels[ch] = info
+    return channels
+
+
+# ============================================================
+# DESCARGA TRANS
+# ============================================================
+def trans_download_steps(
+    path_in_gl: str,
+    dest_folder: str,
+    formats: Tuple[str, ...],
+    make_chunker: Callable[[int], AdaptiveChunker],
+    max_retries: int = 3,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Steps:
+    """
+    Misma transferencia que GraphtecCapture._download_core (sin resume):
+    TRANS:OPEN → HEAD → DATA por fragmentos adaptativos con reintentos
+    (trans_data_steps) → CLOSE, alimentando los escritores de graphtec.io.writers.
+
+    Args:
+        make_chunker: bytes_per_sample → AdaptiveChunker.
+        stats: si se indica, se actualiza con chunker.stats().
+
+    Returns:
+        {"folder", "hdr", "bin", <formato>: ruta, ..., "samples"} o None.
+    """
+    base_name = os.path.splitext(os.path.basename(path_in_gl))[0]
+    out_dir = os.path.join(dest_folder, base_name)
+    os.makedirs(out_dir, exist_ok=True)
+    hdr_path = os.path.join(out_dir, base_name + ".hdr")
+
+    # Validar formatos antes de tocar el dispositivo
+    writers = GraphtecCapture._make_writers(("bin",) + tuple(formats), out_dir, base_name)
+
+    logger.info(f"[protocol] Descargando {path_in_gl} → {out_dir}")
+    yield Request(TRANS.SET_TRANS_SOURCE.format(source="DISK", path=f'"{path_in_gl}"'), None)
+
+    resp = yield Request(TRANS.TRANS_OPEN, REPLY_OPEN)
+    if not GraphtecCapture._trans_open_ok(resp):
+        logger.error(f"[protocol] TRANS:OPEN? falló → {resp}")
+        return None
+
+    try:
+        block = yield Request(TRANS.TRANS_SEND_HEADER, REPLY_BLOCK)
+        header_text = parse_head_block(block)
+        with open(hdr_path, "w", encoding="utf-8") as f:
+            f.write(header_text)
+
+        meta = GraphtecCapture._parse_header(header_text)
+        if not meta["order"] or meta["counts"] <= 0:
+            logger.error("[protocol] Header sin Order o Counts válidos.")
+            result = None
+        else:
+            samples = yield from _data_steps(writers, meta, make_chunker, max_retries, stats)
+            result = {"folder": out_dir, "hdr": hdr_path}
+            for fmt, w in writers.items():
+                result[fmt] = w.path
+                logger.info(f"[protocol] {fmt.upper()} generado en {w.path}")
+            result["samples"] = samples
+    except GeneratorExit:
+        raise
+    except BaseException:
+        yield from _close_steps()
+        raise
+
+    yield from _close_steps()
+    return result
+
+
+def _close_steps() -> Steps:
+    """Cierra TRANS (la respuesta es opcional)."""
+    try:
+        yield Request(TRANS.TRANS_CLOSE)
+    except (TimeoutError, GraphtecTimeoutError):
+        pass
+
+
+def _data_steps(
+    writers: Dict[str, Any],
+    meta: Dict[str, Any],
+    make_chunker: Callable[[int], AdaptiveChunker],
+    max_retries: int,
+    stats: Optional[Dict[str, Any]],
+) -> Steps:
+    """
+    Región de datos: traduce trans_data_steps (la política común de
+    rangos y reintentos, ver graphtec.io.chunking) a Request y alimenta
+    los escritores. Devuelve las muestras recibidas.
+    """
+    chunker = make_chunker(meta["bytes_per_sample"])
+    steps = trans_data_steps(meta, chunker, max_retries, stats=stats)
+
+    opened: List[Any] = []
+    reply: Any = None
+    error: Optional[BaseException] = None
+    try:
+        for w in writers.values():
+            w.open(meta)
+            opened.append(w)
+
+        while True:
+            try:
+                item = steps.throw(error) if error is not None else steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+            reply = error = None
+
+            if isinstance(item, FetchRange):
+                yield Request(TRANS.SET_TRANS_DATA.format(start=item.first, end=item.last), None)
+                try:
+                    reply = yield Request(TRANS.TRANS_SEND_DATA, REPLY_TRANS_DATA)
+                except RETRYABLE_ERRORS as e:
+                    error = e
+            elif isinstance(item, DataChunk):
+                chunk = CaptureChunk(meta, item.first, item.data)
+                for w in opened:
+                    w.feed(chunk)
+            else:
+                yield Request("", FLUSH)
+    finally:
+        steps.close()
+        for w in opened:
+            w.close()
@@ -1,16 +1,39 @@
 import struct
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, Tuple
 
+from graphtec.connection.arbiter import PRIORITY_REALTIME, transaction
 from graphtec.io.decoder import (
     extract_meas_payload,
     decode_special,
     convert_4vt_voltage,
+    channel_conversion,
 )
+from graphtec.io.layout import FrameLayout, compile_frame_layout, channels_signature
+from graphtec.io.scheduler import FixedRateScheduler
 
 logger = logging.getLogger(__name__)
 
 
+class ChannelSnapshot:
+    """
+    Configuración de canales ya leída (misma interfaz que AmpModule para
+    GraphtecRealtime) en equipos que no usan GraphtecDevice: AsyncGraphtec
+    y DeviceHub la rellenan con graphtec.io.protocol.channels_steps.
+    """
+
+    def __init__(self, channels: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.channels: Dict[int, Dict[str, Any]] = channels or {}
+        self.config_version = 1 if channels else 0
+
+    def get_channels(self) -> Dict[int, Dict[str, Any]]:
+        return self.channels
+
+    def update(self, channels: Dict[int, Dict[str, Any]]) -> None:
+        self.channels = channels
+        self.config_version += 1
+
+
 class GraphtecRealtime:
     """
     Módulo de lectura en tiempo real del GL100.
@@ -21,14 +44,20 @@ class GraphtecRealtime:
         device debe proporcionar al menos:
           - device.measure.read_one_measurement() -> bytes
           - device.amp.get_channels() -> dict[int, {"type","input","range"}]
+            (snapshot de AmpModule: no consulta el equipo en cada lectura)
         """
         self.device = device
+        # Layout compilado de la trama y la configuración para la que vale
+        self._layout: Optional[FrameLayout] = None
+        self._layout_key: Any = None
 
     # ---------------------------------------------------------
     # Lectura RAW
     # ---------------------------------------------------------
     def read_raw(self) -> bytes:
-        raw = self.device.measure.read_one_measurement()
+        # Prioridad de tiempo real: pasa por delante de los fragmentos TRANS en espera
+        with transaction(getattr(self.device, "connection", None), PRIORITY_REALTIME):
+            raw = self.device.measure.read_one_measurement()
         if not raw:
             logger.warning("[GL100Realtime] No se recibió ningún dato.")
             return b""
@@ -37,15 +66,20 @@ class GraphtecRealtime:
     # ---------------------------------------------------------
     # Limpieza de cabecera #6xxxxxx
     # ---------------------------------------------------------
-    def _strip_prefix(self, data: bytes) -> bytes:
+    def strip_prefix(self, data: bytes) -> bytes:
         """
-        Usa la utilidad común extract_meas_payload para quitar
-        la cabecera #6****** de :MEAS:OUTP:ONE?.
+        Quita la cabecera #6****** de una respuesta :MEAS:OUTP:ONE?
+        (utilidad común extract_meas_payload). La usan también quienes
+        hacen su propia E/S (AsyncGraphtec, DeviceHub).
         """
         if isinstance(data, str):
             data = data.encode("latin-1", errors="ignore")
         return extract_meas_payload(data)
 
+    def read_payload(self) -> bytes:
+        """Lee una trama :MEAS:OUTP:ONE? y devuelve los datos sin cabecera."""
+        return self.strip_prefix(self.read_raw())
+
     # ---------------------------------------------------------
     # Conversión oficial de voltaje GS-4VT (reutiliza decoder)
     # ---------------------------------------------------------
@@ -72,12 +106,72 @@ class GraphtecRealtime:
           - GS-LXUV: lux, UV y acumulados
           - GS-CO2: CO2 + alarmas
         """
-        raw = self.read_raw()
-        payload = self._strip_prefix(raw)
+        payload = self.read_payload()
         if not payload:
             return {}
 
-        channels: Dict[int, Dict[str, Any]] = self.device.amp.get_channels()
+        return self.decode_payload(payload)
+
+    def decode_payload(self, payload: bytes, channels: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Decodifica una trama ya sin cabecera #6 (layout compilado o canal a canal)."""
+        if channels is None:
+            channels = self.device.amp.get_channels()
+
+        parsed = self.layout(channels).decode(payload)
+        if parsed is None:
+            # Trama truncada o de tamaño inesperado → recorrido canal a canal
+            parsed = self.decode_interpreted(payload, channels)
+        return parsed
+
+    def poll(
+        self,
+        interval: float,
+        count: Optional[int] = None,
+        scheduler: Optional[FixedRateScheduler] = None,
+    ) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """
+        Lecturas periódicas sin deriva: genera (timestamp, read()) cada
+        'interval' segundos. El timestamp es el punto medio de la consulta;
+        los huecos perdidos y el jitter quedan en scheduler.stats().
+        """
+        if scheduler is None:
+            scheduler = FixedRateScheduler(interval)
+        return scheduler.run(self.read, count=count)
+
+    def layout(self, channels: Optional[Dict[int, Dict[str, Any]]] = None) -> FrameLayout:
+        """
+        Layout compilado para la configuración actual de canales. Se
+        recompila solo cuando cambia (AmpModule.config_version, o la
+        propia configuración si el módulo no lo expone). Con 'channels'
+        explícitos la clave es siempre su firma (channels_signature):
+        config_version describe los canales del equipo, no los pasados.
+        """
+        amp = self.device.amp
+        version = None
+        if channels is None:
+            channels = amp.get_channels()
+            version = getattr(amp, "config_version", None)
+
+        key = ("version", version) if version is not None else ("channels", channels_signature(channels))
+
+        if self._layout is None or key != self._layout_key:
+            self._layout = compile_frame_layout(channels)
+            self._layout_key = key
+        return self._layout
+
+    def decode_interpreted(
+        self,
+        payload: bytes,
+        channels: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Decodificación canal a canal (referencia del layout compilado y
+        respaldo cuando la trama no encaja con él). Tolera tramas
+        truncadas: devuelve lo que se haya podido leer. Sin 'channels'
+        usa la configuración actual del equipo.
+        """
+        if channels is None:
+            channels = self.device.amp.get_channels()
         parsed: Dict[str, Any] = {}
 
         offset = 0
@@ -112,29 +206,26 @@ class GraphtecRealtime:
                     break
                 raw_val = struct.unpack_from(">h", payload, offset)[0]
                 offset += 2
-                val, flag = decode_special(raw_val)
 
-                # Voltaje DC_V
+                # Voltaje DC_V (LUT de la tabla oficial GS-4VT)
                 if entrada == "DC_V":
-                    if val is not None:
-                        try:
-                            v = self._convert_voltage(val, rango)
-                            parsed[f"CH{ch}_V"] = v
-                        except Exception:
-                            parsed[f"CH{ch}_raw"] = val
+                    v, flag = channel_conversion("GS-4VT", "DC_V", rango).lookup(raw_val)
+                    if v is not None:
+                        parsed[f"CH{ch}_V"] = v
                     if flag:
                         parsed[f"CH{ch}_V_Flag"] = flag
                     continue
 
-                # Termopares TC-K / TC-T
+                # Termopares TC-K / TC-T → raw / 10
                 if entrada in ("TC-K", "TC-T"):
                     key = f"CH{ch}_Temp_{entrada}"
-                    parsed[key] = None if val is None else val / 10.0
+                    parsed[key], flag = channel_conversion("GS-4VT", "TEMP", "").lookup(raw_val)
                     if flag:
                         parsed[f"{key}_Flag"] = flag
                     continue
 
                 # Otros casos VT → valor crudo
+                val, flag = decode_special(raw_val)
                 parsed[f"CH{ch}_raw"] = val
                 if flag:
                     parsed[f"CH{ch}_Flag"] = flag
@@ -148,9 +239,8 @@ class GraphtecRealtime:
                     break
                 raw_val = struct.unpack_from(">h", payload, offset)[0]
                 offset += 2
-                val, flag = decode_special(raw_val)
                 key = f"CH{ch}_Temp_TSR"
-                parsed[key] = None if val is None else val / 10.0
+                parsed[key], flag = channel_conversion("GS-4VT", "TEMP", "").lookup(raw_val)
                 if flag:
                     parsed[f"{key}_Flag"] = flag
                 continue
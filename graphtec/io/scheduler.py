@@ -0,0 +1,164 @@
+"""
+Planificador de lecturas en tiempo real a frecuencia fija.
+
+Con time.sleep(interval) entre lecturas cada iteración se retrasa lo que
+tarda la propia consulta, y la serie se desplaza con el tiempo. Aquí:
+
+  - Los plazos se calculan como t0 + k * interval sobre time.monotonic(),
+    así que el error no se acumula.
+  - La consulta se lanza adelantada la mitad de la latencia medida
+    (media móvil), para que el punto medio petición/respuesta caiga
+    sobre el plazo.
+  - Si una lectura se alarga más de un periodo, los huecos perdidos se
+    saltan y se cuentan (missed) en vez de encadenar lecturas seguidas.
+  - Cada muestra lleva como timestamp (reloj de pared) el punto medio
+    entre petición y respuesta.
+
+stats() resume latencia y jitter (punto medio - plazo) para dimensionar
+el intervalo de muestreo según el enlace.
+"""
+
+import math
+import time
+import logging
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["FixedRateScheduler"]
+
+
+class FixedRateScheduler:
+    """Plazos monotónicos sin deriva + compensación de latencia."""
+
+    def __init__(
+        self,
+        interval: float,
+        latency_alpha: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        wall: Callable[[], float] = time.time,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """
+        Args:
+            interval: periodo de muestreo en segundos.
+            latency_alpha: peso de la última medida en la media de latencia.
+            clock: reloj monotónico (inyectable en tests).
+            wall: reloj de pared para los timestamps.
+            sleep: espera; p. ej. Event.wait para poder interrumpirla.
+        """
+        if interval <= 0:
+            raise ValueError("interval debe ser > 0")
+        self.interval = float(interval)
+        self.latency_alpha = latency_alpha
+        self.clock = clock
+        self.wall = wall
+        self.sleep = sleep
+        self.reset()
+
+    def reset(self) -> None:
+        """Reinicia plazos y estadísticas (el primer plazo es 'ahora')."""
+        self._t0: Optional[float] = None
+        self._wall_offset = 0.0
+        self.slot = 0
+        self.samples = 0
+        self.missed = 0
+        self.latency: Optional[float] = None  # media móvil
+        self.latency_max = 0.0
+        self._jitter_mean = 0.0
+        self._jitter_m2 = 0.0
+        self.jitter_max = 0.0
+
+    # ------------------------------------------------------------
+    # Plazos
+    # ------------------------------------------------------------
+    def deadline(self, slot: Optional[int] = None) -> float:
+        """Plazo monotónico del hueco 'slot' (por defecto, el siguiente)."""
+        if self._t0 is None:
+            return self.clock()
+        return self._t0 + (self.slot if slot is None else slot) * self.interval
+
+    def wait(self) -> int:
+        """
+        Espera hasta el momento de lanzar la siguiente consulta y devuelve
+        el índice de su hueco. Los huecos ya imposibles se cuentan en missed.
+        """
+        now = self.clock()
+        if self._t0 is None:
+            self._t0 = now
+            self._wall_offset = self.wall() - now
+            return self.slot
+
+        lead = (self.latency or 0.0) / 2
+        late = now - (self.deadline() - lead)
+        if late >= self.interval:
+            skipped = int(late // self.interval)
+            self.missed += skipped
+            self.slot += skipped
+            logger.debug(f"[scheduler] {skipped} huecos perdidos (retraso {late:.3f} s)")
+            late -= skipped * self.interval
+        if late < 0:
+            self.sleep(-late)
+        return self.slot
+
+    def measure(self, fn: Callable[[], Any]) -> Tuple[float, Any]:
+        """
+        Ejecuta fn() en el hueco actual y devuelve (timestamp, resultado);
+        el timestamp (reloj de pared) es el punto medio petición/respuesta.
+        """
+        slot = self.slot
+        t_req = self.clock()
+        try:
+            result = fn()
+        finally:
+            t_resp = self.clock()
+            self.slot = slot + 1
+        mid = (t_req + t_resp) / 2
+
+        rtt = t_resp - t_req
+        if self.latency is None:
+            self.latency = rtt
+        else:
+            self.latency += self.latency_alpha * (rtt - self.latency)
+        self.latency_max = max(self.latency_max, rtt)
+
+        # Welford: media y varianza del jitter
+        jitter = mid - self.deadline(slot)
+        self.samples += 1
+        delta = jitter - self._jitter_mean
+        self._jitter_mean += delta / self.samples
+        self._jitter_m2 += delta * (jitter - self._jitter_mean)
+        self.jitter_max = max(self.jitter_max, abs(jitter))
+
+        return self._wall_offset + mid, result
+
+    def run(
+        self,
+        fn: Callable[[], Any],
+        count: Optional[int] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[Tuple[float, Any]]:
+        """Genera (timestamp, fn()) a frecuencia fija hasta count muestras o stop()."""
+        n = 0
+        while count is None or n < count:
+            self.wait()
+            if stop is not None and stop():
+                return
+            yield self.measure(fn)
+            n += 1
+
+    # ------------------------------------------------------------
+    # Estadísticas
+    # ------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        std = math.sqrt(self._jitter_m2 / (self.samples - 1)) if self.samples > 1 else 0.0
+        return {
+            "interval": self.interval,
+            "samples": self.samples,
+            "missed": self.missed,
+            "latency_s": self.latency or 0.0,
+            "latency_max_s": self.latency_max,
+            "jitter_mean_s": self._jitter_mean,
+            "jitter_std_s": std,
+            "jitter_max_s": self.jitter_max,
+        }
@@ -0,0 +1,262 @@
+"""
+Adquisición en tiempo real en segundo plano con buffer circular.
+
+RealtimeStream lee :MEAS:OUTP:ONE? en un hilo dedicado y guarda cada
+muestra decodificada en un buffer circular NumPy preasignado
+(timestamps + una columna por valor del FrameLayout), sin crear un dict
+por muestra. La memoria es fija: al llenarse se sobrescriben las
+muestras más antiguas. Cada timestamp es el punto medio entre petición
+y respuesta; con interval > 0 las lecturas siguen un FixedRateScheduler.
+
+Accesos (no bloqueantes, devuelven copias):
+  - latest():          última muestra
+  - window(seconds):   muestras de los últimos 'seconds' segundos
+  - drain():           muestras nuevas desde el último drain()
+
+Uso:
+    with RealtimeStream(gl.realtime, capacity=100_000) as stream:
+        ...
+        ts, values = stream.drain()
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from graphtec.io.scheduler import FixedRateScheduler
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional salvo para el stream
+    np = None
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RealtimeStream"]
+
+
+class RealtimeStream:
+    """Bucle de adquisición en un hilo + buffer circular NumPy."""
+
+    def __init__(
+        self,
+        realtime,
+        capacity: int = 100_000,
+        interval: float = 0.0,
+        error_backoff: float = 0.5,
+    ):
+        """
+        Args:
+            realtime: GraphtecRealtime (o compatible: read_payload(), layout()).
+            capacity: muestras que caben en el buffer circular.
+            interval: periodo de muestreo en segundos, con plazos fijos
+                (FixedRateScheduler); 0 = tan rápido como permita el enlace.
+            error_backoff: espera tras un error de lectura antes de reintentar.
+        """
+        if np is None:
+            raise ImportError("RealtimeStream requiere numpy (pip install numpy).")
+        if capacity <= 0:
+            raise ValueError("capacity debe ser > 0")
+
+        self.realtime = realtime
+        self.capacity = int(capacity)
+        self.interval = float(interval)
+        self.error_backoff = float(error_backoff)
+        # Plazos fijos sin deriva; la espera es interrumpible con stop()
+        self.scheduler: Optional[FixedRateScheduler] = None
+        if self.interval > 0:
+            self.scheduler = FixedRateScheduler(self.interval, sleep=self._wait)
+
+        self.columns: List[str] = []
+        self._ts = np.full(self.capacity, np.nan)
+        self._data = np.empty((self.capacity, 0))
+        self._layout = None
+        self._col_map: Optional[List[int]] = None  # None = columnas idénticas
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.count = 0       # muestras escritas desde start()
+        self._drained = 0    # siguiente muestra que devolverá drain()
+        self.dropped = 0     # muestras sobrescritas antes de drain()
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------
+    def start(self) -> "RealtimeStream":
+        """Fija las columnas según el layout actual y arranca el hilo."""
+        if self.running:
+            return self
+
+        layout = self.realtime.layout()
+        self._layout = layout
+        self._col_map = None
+        self.columns = list(layout.columns)
+        self._ts.fill(np.nan)
+        self._data = np.full((self.capacity, len(self.columns)), np.nan)
+        self.count = self._drained = self.dropped = self.errors = 0
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="graphtec-realtime", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"[RealtimeStream] Iniciado: {len(self.columns)} columnas, capacidad {self.capacity}"
+        )
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Detiene el hilo (espera a que termine la lectura en curso)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info(f"[RealtimeStream] Detenido tras {self.count} muestras ({self.errors} errores)")
+
+    def _wait(self, seconds: float) -> None:
+        self._stop.wait(seconds)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> "RealtimeStream":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------
+    # Hilo de adquisición
+    # ------------------------------------------------------------
+    def _run(self) -> None:
+        sched = self.scheduler
+        if sched is not None:
+            sched.reset()
+        while not self._stop.is_set():
+            try:
+                if sched is not None:
+                    sched.wait()
+                    if self._stop.is_set():
+                        break
+                    ts, payload = sched.measure(self.realtime.read_payload)
+                else:
+                    t_req = time.time()
+                    payload = self.realtime.read_payload()
+                    ts = (t_req + time.time()) / 2
+                if payload:
+                    self._append(ts, payload)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                logger.warning(f"[RealtimeStream] Error de lectura: {e}")
+                self._stop.wait(self.error_backoff)
+
+    def _values(self, payload: bytes) -> Optional[List[Any]]:
+        """Valores de la trama en el orden de self.columns."""
+        layout = self.realtime.layout()
+        if layout is not self._layout:
+            self._remap(layout)
+
+        values = layout.decode_values(payload)
+        if values is None:
+            # Trama que no encaja con el layout: recorrido canal a canal
+            parsed = self.realtime.decode_interpreted(payload)
+            return [parsed.get(col) for col in self.columns]
+
+        if self._col_map is None:
+            return values
+        row: List[Any] = [None] * len(self.columns)
+        for j, v in zip(self._col_map, values):
+            if j >= 0:
+                row[j] = v
+        return row
+
+    def _remap(self, layout) -> None:
+        """La configuración de canales cambió: mapear columnas por nombre."""
+        self._layout = layout
+        if list(layout.columns) == self.columns:
+            self._col_map = None
+            return
+        self._col_map = [self.columns.index(c) if c in self.columns else -1 for c in layout.columns]
+        lost = [c for c in layout.columns if c not in self.columns]
+        logger.warning(
+            "[RealtimeStream] Configuración de canales cambiada; columnas nuevas ignoradas: %s",
+            lost,
+        )
+
+    def _append(self, ts: float, payload: bytes) -> None:
+        values = self._values(payload)
+        with self._lock:
+            i = self.count % self.capacity
+            self._ts[i] = ts
+            self._data[i, :] = values
+            self.count += 1
+
+    # ------------------------------------------------------------
+    # Accesos
+    # ------------------------------------------------------------
+    def _ordered(self, start: int, stop: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Copias de las muestras [start, stop) en orden cronológico (con el lock tomado)."""
+        n = stop - start
+        if n <= 0:
+            return np.empty(0), np.empty((0, len(self.columns)))
+        a = start % self.capacity
+        b = a + n
+        if b <= self.capacity:
+            return self._ts[a:b].copy(), self._data[a:b].copy()
+        b -= self.capacity
+        return (
+            np.concatenate((self._ts[a:], self._ts[:b])),
+            np.concatenate((self._data[a:], self._data[:b])),
+        )
+
+    def latest(self) -> Optional[Tuple[float, "np.ndarray"]]:
+        """(timestamp, valores) de la última muestra, o None si aún no hay."""
+        with self._lock:
+            if self.count == 0:
+                return None
+            i = (self.count - 1) % self.capacity
+            return float(self._ts[i]), self._data[i].copy()
+
+    def window(self, seconds: float) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(timestamps, valores) de las muestras de los últimos 'seconds' segundos."""
+        with self._lock:
+            oldest = max(0, self.count - self.capacity)
+            if self.count == 0:
+                return self._ordered(0, 0)
+            t_min = self._ts[(self.count - 1) % self.capacity] - seconds
+
+            # Búsqueda binaria sobre los índices lógicos (timestamps crecientes)
+            lo, hi = oldest, self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._ts[mid % self.capacity] < t_min:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return self._ordered(lo, self.count)
+
+    def drain(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(timestamps, valores) de las muestras nuevas desde el último drain()."""
+        with self._lock:
+            oldest = max(0, self.count - self.capacity)
+            if self._drained < oldest:
+                self.dropped += oldest - self._drained
+                self._drained = oldest
+            out = self._ordered(self._drained, self.count)
+            self._drained = self.count
+            return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "samples": self.count,
+            "buffered": min(self.count, self.capacity),
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "capacity": self.capacity,
+            "timing": self.scheduler.stats() if self.scheduler is not None else None,
+        }
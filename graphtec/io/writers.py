@@ -0,0 +1,390 @@
+"""
+Escritores en streaming para las descargas de GraphtecCapture.
+
+Cada escritor recibe la cabecera parseada (meta) al abrirse y luego
+fragmentos (CaptureChunk) de la región de datos según llegan por TRANS,
+de modo que la memoria no crece con el tamaño del archivo.
+
+Los escritores "appendable" pueden continuar un archivo existente
+(descarga reanudada o sync): resume_from() indica cuántas muestras
+contiene ya y state() devuelve lo necesario para el checkpoint.
+
+Formatos:
+  - bin:  datos puros 16-bit big-endian
+  - gbd:  GBD reconstruido (header + padding hasta HeaderSiz + datos)
+  - csv:  timestamp + valores en unidades físicas
+  - xlsx: igual que CSV pero en Excel (modo constant_memory)
+  - parquet: columnar (requiere pyarrow), un row group por fragmento;
+    al continuar se escribe un archivo parte <nombre>.<muestra>.parquet
+"""
+
+import os
+import re
+import csv
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import xlsxwriter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional: solo para exportar a Parquet
+    pa = None
+    pq = None
+
+from graphtec.io.decoder import decode_rows
+
+logger = logging.getLogger(__name__)
+
+HAS_PYARROW = pa is not None
+
+__all__ = [
+    "CaptureChunk",
+    "CaptureWriter",
+    "BinWriter",
+    "GbdWriter",
+    "CsvWriter",
+    "ExcelWriter",
+    "ParquetWriter",
+    "HAS_PYARROW",
+    "WRITERS",
+    "make_writer",
+]
+
+
+class CaptureChunk:
+    """
+    Fragmento de la región de datos de una captura.
+
+    - first: índice (0-based) de la primera muestra del fragmento
+    - raw:   bytes-like con n_samples * len(order) words 16-bit BE
+
+    La decodificación física se hace bajo demanda y una sola vez,
+    aunque varios escritores la usen.
+    """
+
+    def __init__(self, meta: Dict[str, Any], first: int, raw: Any):
+        self.meta = meta
+        self.first = first
+        self.raw = raw
+        self.n_samples = len(raw) // (len(meta["order"]) * 2)
+        self._rows: Optional[List[List[Optional[float]]]] = None
+
+    def tail(self, first: int) -> "CaptureChunk":
+        """Fragmento con las muestras [first, fin) de éste (vista, sin copia)."""
+        skip = first - self.first
+        sub = CaptureChunk(self.meta, first, memoryview(self.raw)[skip * len(self.meta["order"]) * 2:])
+        if self._rows is not None:
+            sub._rows = self._rows[skip:]
+        return sub
+
+    def rows(self) -> List[List[Optional[float]]]:
+        if self._rows is None:
+            self._rows = decode_rows(self.raw, self.meta["plan"], self.n_samples)
+        return self._rows
+
+    def timestamps(self) -> List[Optional[datetime]]:
+        start_dt = self.meta["start_dt"]
+        if start_dt is None:
+            return [None] * self.n_samples
+        delta = self.meta["sample_delta"]
+        return [start_dt + (self.first + i) * delta for i in range(self.n_samples)]
+
+
+class CaptureWriter:
+    """Interfaz común de los escritores en streaming."""
+
+    extension = ""
+
+    # Puede continuar un archivo existente (resume_from)
+    appendable = False
+
+    def __init__(self, path: str):
+        self.path = path
+        self.resume_samples = 0
+        self.resume_offset: Optional[int] = None
+        self.samples = 0
+
+    def resume_from(self, samples: int, offset: Optional[int] = None) -> None:
+        """
+        El archivo ya contiene 'samples' muestras (y ocupa 'offset' bytes
+        válidos): se continúa a partir de ahí. Solo si appendable.
+        """
+        self.resume_samples = samples
+        self.resume_offset = offset
+        self.samples = samples
+
+    def feed(self, chunk: CaptureChunk) -> None:
+        """
+        Escribe la parte del fragmento que aún no está en el archivo
+        (un fragmento puede empezar antes del punto de reanudación si
+        el tamaño de fragmento cambió entre ejecuciones).
+        """
+        end = chunk.first + chunk.n_samples
+        if end <= self.resume_samples:
+            return
+        if chunk.first < self.resume_samples:
+            chunk = chunk.tail(self.resume_samples)
+        self.write(chunk)
+        self.samples = end
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        """
+        Estado para el checkpoint ({"samples", "offset"}) o None si el
+        formato no puede continuarse.
+        """
+        return None
+
+    def open(self, meta: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def write(self, chunk: CaptureChunk) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class _FileWriter(CaptureWriter):
+    """Base de los escritores sobre un único archivo que se puede truncar y continuar."""
+
+    appendable = True
+
+    _f = None
+    # Offset tras el último fragmento escrito entero
+    _offset: Optional[int] = None
+
+    def _reopen(self, mode: str, default_offset: int, **kwargs):
+        """Abre para continuar: trunca al offset válido y se sitúa al final."""
+        f = open(self.path, mode, **kwargs)
+        f.truncate(self.resume_offset if self.resume_offset is not None else default_offset)
+        f.seek(0, os.SEEK_END)
+        return f
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def feed(self, chunk: CaptureChunk) -> None:
+        if self._offset is None:
+            self._offset = self._f.tell()
+        super().feed(chunk)
+        self._offset = self._f.tell()
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        if self._f is None:
+            # Aún sin abrir: su estado es el de la reanudación
+            if not self.resume_samples:
+                return None
+            return {"samples": self.resume_samples, "offset": self.resume_offset}
+        if not self._f.closed:
+            self._f.flush()
+        # Un fallo a mitad de write() deja bytes de más tras _offset,
+        # que se truncan al reanudar
+        offset = self._offset
+        if offset is None:
+            offset = self._end if self._f.closed else self._f.tell()
+        return {"samples": self.samples, "offset": offset}
+
+    def close(self) -> None:
+        self._end = self._f.tell()
+        self._f.close()
+
+
+class BinWriter(_FileWriter):
+    """Datos puros concatenados (.bin)."""
+
+    extension = ".bin"
+
+    def open(self, meta: Dict[str, Any]) -> None:
+        if self.resume_samples > 0:
+            self._f = self._reopen("r+b", self.resume_samples * meta["bytes_per_sample"])
+        else:
+            self._f = open(self.path, "wb")
+
+    def write(self, chunk: CaptureChunk) -> None:
+        self._f.write(chunk.raw)
+
+
+class GbdWriter(_FileWriter):
+    """
+    GBD reconstruido:
+
+      [Header region] + [Padding hasta HeaderSiz] + [Data region]
+
+    Al continuar se reescribe la header region en su sitio (Counts
+    cambia en archivos que siguen creciendo).
+    """
+
+    extension = ".GBD"
+
+    def open(self, meta: Dict[str, Any]) -> None:
+        header = pad_header(meta["header_text"], meta["header_siz"])
+        if self.resume_samples > 0:
+            self._f = self._reopen(
+                "r+b", meta["header_siz"] + self.resume_samples * meta["bytes_per_sample"]
+            )
+            if len(header) == meta["header_siz"]:
+                self._f.seek(0)
+                self._f.write(header)
+                self._f.seek(0, os.SEEK_END)
+            else:
+                logger.warning("[writers] Header mayor que HeaderSiz, no se actualiza en %s", self.path)
+        else:
+            self._f = open(self.path, "wb")
+            self._f.write(header)
+
+    def write(self, chunk: CaptureChunk) -> None:
+        self._f.write(chunk.raw)
+
+
+class CsvWriter(_FileWriter):
+    """CSV en unidades físicas."""
+
+    extension = ".csv"
+
+    def open(self, meta: Dict[str, Any]) -> None:
+        if self.resume_samples > 0 and self.resume_offset is not None:
+            self._f = self._reopen("r+", self.resume_offset, newline="", encoding="utf-8")
+            self._w = csv.writer(self._f)
+            return
+        self._f = open(self.path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow(["TimeStamp"] + meta["columns"])
+
+    def write(self, chunk: CaptureChunk) -> None:
+        for ts, row in zip(chunk.timestamps(), chunk.rows()):
+            self._w.writerow([ts.isoformat() if ts is not None else ""] + row)
+
+
+class ExcelWriter(CaptureWriter):
+    """
+    Excel (.xlsx). Se usa el modo constant_memory de xlsxwriter, que
+    vuelca cada fila a disco en cuanto se completa.
+    """
+
+    extension = ".xlsx"
+
+    def open(self, meta: Dict[str, Any]) -> None:
+        self._wb = xlsxwriter.Workbook(self.path, {"constant_memory": True})
+        self._ws = self._wb.add_worksheet("Data")
+        self._ws.write_row(0, 0, ["TimeStamp"] + meta["columns"])
+        self._row = 1
+
+    def write(self, chunk: CaptureChunk) -> None:
+        ws = self._ws
+        for ts, row in zip(chunk.timestamps(), chunk.rows()):
+            ws.write(self._row, 0, ts.isoformat() if ts is not None else "")
+            ws.write_row(self._row, 1, row)
+            self._row += 1
+
+    def close(self) -> None:
+        self._wb.close()
+
+
+class ParquetWriter(CaptureWriter):
+    """
+    Parquet: TimeStamp + una columna por elemento del Order
+    (float64 para canales, int64 para Logic/Alarm). Cada fragmento
+    se escribe como un row group.
+    """
+
+    extension = ".parquet"
+
+    # Un Parquet no se puede ampliar: al continuar se escribe un archivo
+    # parte <nombre>.<primera muestra>.parquet junto al principal.
+    appendable = True
+
+    def __init__(self, path: str):
+        if pa is None:
+            raise ImportError("La exportación a Parquet requiere pyarrow (pip install pyarrow).")
+        super().__init__(path)
+        self._closed = False
+
+    def part_paths(self) -> List[str]:
+        """Archivo principal + partes, en orden de muestra."""
+        folder, name = os.path.split(self.path)
+        stem = name[: -len(self.extension)]
+        pattern = re.compile(re.escape(stem) + r"\.(\d{10})" + re.escape(self.extension) + "$")
+        parts = sorted(f for f in os.listdir(folder or ".") if pattern.match(f))
+        return [os.path.join(folder, stem + self.extension)] + [os.path.join(folder, f) for f in parts]
+
+    def open(self, meta: Dict[str, Any]) -> None:
+        fields = [pa.field("TimeStamp", pa.timestamp("us"))]
+        for name, col in zip(meta["columns"], meta["plan"].columns):
+            fields.append(pa.field(name, pa.int64() if col.kind == "raw" else pa.float64()))
+        self._schema = pa.schema(fields)
+
+        self._w = None
+        self._closed = False
+        if self.resume_samples > 0:
+            # La parte se crea con el primer fragmento nuevo (sync sin datos → nada)
+            stem = self.path[: -len(self.extension)]
+            self._part_path = f"{stem}.{self.resume_samples:010d}{self.extension}"
+        else:
+            for stale in self.part_paths()[1:]:
+                os.remove(stale)
+            self._w = pq.ParquetWriter(self.path, self._schema)
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        # Las filas solo son legibles una vez cerrado el archivo (footer)
+        return {"samples": self.samples if self._closed else self.resume_samples, "offset": None}
+
+    def write(self, chunk: CaptureChunk) -> None:
+        rows = chunk.rows()
+        if not rows:
+            return
+        if self._w is None:
+            self.path = self._part_path
+            self._w = pq.ParquetWriter(self.path, self._schema)
+        arrays = [pa.array(chunk.timestamps(), type=pa.timestamp("us"))]
+        for idx, field in enumerate(self._schema):
+            if idx == 0:
+                continue
+            arrays.append(pa.array([row[idx - 1] for row in rows], type=field.type))
+        self._w.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        if self._w is not None:
+            self._w.close()
+        self._closed = True
+
+
+WRITERS = {
+    "bin": BinWriter,
+    "gbd": GbdWriter,
+    "csv": CsvWriter,
+    "xlsx": ExcelWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def make_writer(fmt: str, folder: str, base_name: str) -> CaptureWriter:
+    """Crea el escritor del formato indicado ("bin", "gbd", "csv", "xlsx", "parquet")."""
+    key = fmt.lower().lstrip(".")
+    if key == "excel":
+        key = "xlsx"
+    cls = WRITERS.get(key)
+    if cls is None:
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+    return cls(os.path.join(folder, base_name + cls.extension))
+
+
+def pad_header(header_text: str, header_siz: int) -> bytes:
+    """
+    Header region del GBD: texto ASCII tal cual devuelto por HEAD,
+    rellenado con espacios (0x20) hasta HeaderSiz bytes.
+    """
+    header_bytes = header_text.encode("ascii", errors="ignore")
+
+    if len(header_bytes) > header_siz:
+        logger.warning(
+            "[writers] header_bytes (%d) > HeaderSiz (%d). "
+            "Guardando sin recortar (puede no ser estándar).",
+            len(header_bytes),
+            header_siz,
+        )
+        return header_bytes
+
+    return header_bytes + b" " * (header_siz - len(header_bytes))
@@ -0,0 +1,31 @@
+"""
+GL100 simulado para pruebas y benchmarks sin hardware
+=====================================================
+
+- device: GL100Simulator (estado + respuestas) y SimFile (archivos GBD
+  sintéticos, opcionalmente creciendo).
+- link: SimLink (velocidad de línea, latencia, fallos inyectados) y
+  SimConnection, un SerialConnection en proceso.
+- server: endpoints TCP (SimTCPServer) y pty (SimPty).
+- gbd: archivos .GBD sintéticos escritos por fragmentos (write_gbd).
+"""
+
+from graphtec.sim.device import MODULE_PRESETS, GL100Simulator, SimFile, build_header
+from graphtec.sim.gbd import iter_gbd, write_gbd, write_module_set
+from graphtec.sim.link import Fault, SimConnection, SimLink
+from graphtec.sim.server import SimPty, SimTCPServer
+
+__all__ = [
+    "GL100Simulator",
+    "SimFile",
+    "build_header",
+    "MODULE_PRESETS",
+    "iter_gbd",
+    "write_gbd",
+    "write_module_set",
+    "Fault",
+    "SimLink",
+    "SimConnection",
+    "SimTCPServer",
+    "SimPty",
+]
@@ -0,0 +1,549 @@
+"""
+Estado y respuestas de un GL100 simulado.
+
+GL100Simulator recibe líneas de comando (sin CRLF) y devuelve los bytes
+que respondería el equipo (None = comando sin respuesta), con el mismo
+formato que el GL100 real:
+
+  - ASCII terminado en CRLF (getters AMP/STATUS, :FILE:LIST?, ...)
+  - :TRANS:OPEN?        → 3 bytes (bit 0 del tercero = error)
+  - :TRANS:OUTP:HEAD?   → '#6******' + header ASCII
+  - :TRANS:OUTP:DATA?   → '#6******' + STATUS(2) + DATA + CHECKSUM(2)
+  - :MEAS:OUTP:ONE?     → '#6******' + words de la trama en tiempo real
+
+Los archivos (SimFile) tienen un header GBD y una región de datos
+sintética que se calcula por rangos al vuelo (nada se guarda en
+memoria), así que pueden ser tan grandes como se quiera y crecer con
+el tiempo como el archivo de una medida en curso.
+
+El simulador no sabe nada del transporte: la latencia, la velocidad de
+línea y los fallos los añade graphtec.sim.link.
+"""
+
+import re
+import sys
+import time
+import struct
+import threading
+import logging
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from graphtec.io.layout import compile_frame_layout
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["GL100Simulator", "SimFile", "build_header", "MODULE_PRESETS"]
+
+# Códigos especiales GL100 (ver decoder.decode_special)
+OVER_FS = 0x7FFC
+BURNOUT = 0x7FFD
+UNDER_FS = -0x7FFF
+SPECIALS = (OVER_FS, BURNOUT, UNDER_FS)
+
+# STATUS de :TRANS:OUTP:DATA? (Data Reception Specifications)
+STATUS_ERROR = 0x0001
+STATUS_END_ERROR = 0x0002
+STATUS_START_ERROR = 0x0004
+
+# Errores de :STAT:ERR?
+ERR_COMMAND = 16
+ERR_CHANNEL = 17
+
+# Configuración por defecto (misma forma que AmpModule.get_channels())
+DEFAULT_CHANNELS: Dict[int, Dict[str, str]] = {
+    1: {"type": "VT", "input": "DC_V", "range": "5V"},
+    2: {"type": "VT", "input": "TC-K", "range": "TCK"},
+    3: {"type": "VT", "input": "DC_V", "range": "1V"},
+    4: {"type": "VT", "input": "OFF", "range": "5V"},
+}
+
+
+# Order, $Amp (tipo, entrada, rango) y $$Span típicos de cada módulo
+MODULE_PRESETS: Dict[str, Tuple[List[str], Dict[str, Tuple[str, str, str]], Dict[str, Tuple[int, int]]]] = {
+    "4VT": (
+        ["CH1", "CH2", "CH3", "CH4", "Logic", "Alarm"],
+        {
+            "CH1": ("VT", "DC", "5V"),
+            "CH2": ("VT", "TEMP", "TCK"),
+            "CH3": ("VT", "DC", "1V"),
+            "CH4": ("VT", "DC", "20MV"),
+        },
+        {},
+    ),
+    "TH": (
+        ["CH1", "CH2", "CH3", "Alarm"],
+        {"CH1": ("TH", "TEMP", "-"), "CH2": ("TH", "HUM", "-"), "CH3": ("TH", "DEW", "-")},
+        {"CH1": (-4000, 8500), "CH2": (0, 10000), "CH3": (-4000, 8500)},
+    ),
+    "3AT": (
+        ["CH1", "CH2", "CH3", "CH4", "Alarm"],
+        {
+            "CH1": ("ACC", "ACC", "2G"),
+            "CH2": ("ACC", "ACC", "2G"),
+            "CH3": ("ACC", "ACC", "2G"),
+            "CH4": ("ACC", "TEMP", "-"),
+        },
+        {"CH1": (-2000, 2000), "CH2": (-2000, 2000), "CH3": (-2000, 2000), "CH4": (-1000, 6000)},
+    ),
+    "LXUV": (
+        ["CH1", "CH2", "Alarm"],
+        {"CH1": ("LXUV", "LUX", "20KLX"), "CH2": ("LXUV", "UV", "30MW")},
+        {"CH1": (0, 20000000), "CH2": (0, 30000)},
+    ),
+    "CO2": (
+        ["CH1", "Alarm"],
+        {"CH1": ("CO2", "CO2", "10000PPM")},
+        {"CH1": (0, 10000)},
+    ),
+    "DPA-AC": (
+        ["CH1", "CH2", "CH3", "Logic"],
+        {"CH1": ("DPA", "A", "50A"), "CH2": ("DPA", "V", "300V"), "CH3": ("DPA", "W", "15KW")},
+        {"CH1": (0, 50000), "CH2": (0, 300), "CH3": (0, 15000)},
+    ),
+}
+
+
+def _block(payload: bytes) -> bytes:
+    return b"#6%06d" % len(payload) + payload
+
+
+def build_header(
+    order: List[str],
+    counts: int,
+    amp: Dict[str, Tuple[str, str, str]],
+    spans: Optional[Dict[str, Tuple[int, int]]] = None,
+    module: str = "4VT",
+    sample: str = "1s",
+    start: Optional[datetime] = None,
+    header_siz: int = 2048,
+) -> str:
+    """
+    Header GBD en el formato que parsea GraphtecCapture._parse_header.
+
+    Args:
+        order: columnas de $$Data Order (ej. ["CH1", "CH2", "Logic"]).
+        amp: {"CH1": (tipo, entrada, rango)} del bloque $Amp.
+        spans: {"CH1": (min, max)} del bloque $$Span (opcional).
+    """
+    start = start or datetime(2024, 1, 1)
+    lines = [
+        "$Header",
+        f"HeaderSiz  = {header_siz}",
+        "$$Data",
+        f"Order      = {', '.join(order)}",
+        f"Counts     = {counts}",
+        f"Sample     = {sample}",
+        f"Start      = {start:%Y-%m-%d}, {start:%H:%M:%S}",
+        "$Amp",
+    ]
+    for ch, (tipo, entrada, rango) in amp.items():
+        lines.append(f"{ch:<10} = {tipo:<5}, {entrada:<5}, {rango:>8}, Off   ,    Off,      +0")
+    if spans:
+        lines.append("$$Span")
+        for ch, (smin, smax) in spans.items():
+            lines.append(f"{ch:<10} = {smin:7d}, {smax:+d}")
+    lines += [f"UnitOrder  = {module}", "$EndHeader"]
+    return "\r\n".join(lines) + "\r\n"
+
+
+class SimFile:
+    """
+    Archivo de medida simulado: header GBD + datos sintéticos deterministas
+    (la muestra i vale siempre lo mismo, aunque el archivo crezca).
+
+    Columnas CH*: onda triangular distinta por columna; con
+    special_every > 0, una de cada special_every muestras es un código
+    especial (OverFS, Burnout, UnderFS). Columnas no canal (Logic,
+    Alarm, AlOut...): patrón de bits.
+    """
+
+    def __init__(
+        self,
+        order: Optional[List[str]] = None,
+        counts: int = 1000,
+        amp: Optional[Dict[str, Tuple[str, str, str]]] = None,
+        spans: Optional[Dict[str, Tuple[int, int]]] = None,
+        module: str = "4VT",
+        sample: str = "1s",
+        start: Optional[datetime] = None,
+        header_siz: int = 2048,
+        growth: float = 0.0,
+        special_every: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            counts: muestras al crear el archivo.
+            growth: muestras por segundo que se añaden (medida en curso).
+            special_every: cada cuántas muestras hay un código especial (0 = nunca).
+        """
+        self.order = list(order or ["CH1", "CH2", "CH3", "CH4", "Logic", "Alarm"])
+        if amp is None:
+            amp = {
+                ch: ("VT", "DC", "5V") for ch in self.order if ch.startswith("CH")
+            }
+        self.amp = amp
+        self.spans = spans
+        self.module = module
+        self.sample = sample
+        self.start = start or datetime(2024, 1, 1)
+        self.header_siz = header_siz
+        self.growth = growth
+        self.special_every = special_every
+        self._clock = clock
+        self._base_counts = counts
+        self._t0 = clock()
+
+    @property
+    def counts(self) -> int:
+        """Muestras disponibles ahora (crecen con growth)."""
+        if not self.growth:
+            return self._base_counts
+        return self._base_counts + int((self._clock() - self._t0) * self.growth)
+
+    @property
+    def bytes_per_sample(self) -> int:
+        return len(self.order) * 2
+
+    @property
+    def size(self) -> int:
+        """Tamaño del .GBD equivalente (header region + datos)."""
+        return self.header_siz + self.counts * self.bytes_per_sample
+
+    def header(self) -> str:
+        """Header con el Counts actual."""
+        return build_header(
+            self.order,
+            self.counts,
+            self.amp,
+            self.spans,
+            self.module,
+            self.sample,
+            self.start,
+            self.header_siz,
+        )
+
+    @classmethod
+    def for_module(cls, module: str, counts: int = 1000, **kwargs) -> "SimFile":
+        """Archivo con el Order/$Amp/$$Span típicos de un módulo (ver MODULE_PRESETS)."""
+        order, amp, spans = MODULE_PRESETS[module.upper()]
+        return cls(order=order, counts=counts, amp=amp, spans=spans, module=module.upper(), **kwargs)
+
+    def _period(self, col: int) -> int:
+        """Periodo (en muestras) del patrón de la columna 'col'."""
+        if not self.order[col].startswith("CH"):
+            return 16 << col
+        return 400 + 100 * col
+
+    def value(self, index: int, col: int) -> int:
+        """Valor crudo de la muestra 'index' (0-based) en la columna 'col'."""
+        if (
+            self.special_every
+            and self.order[col].startswith("CH")
+            and index % self.special_every == self.special_every - 1
+        ):
+            return SPECIALS[(index // self.special_every + col) % len(SPECIALS)]
+        return self._wave(index, col)
+
+    def _wave(self, index: int, col: int) -> int:
+        """Patrón periódico de la columna (sin códigos especiales)."""
+        if not self.order[col].startswith("CH"):
+            return (index >> col) & 0x0F
+        period = self._period(col)
+        phase = index % period
+        tri = phase if phase < period // 2 else period - phase
+        return (tri * 4000) // period - 1000
+
+    def rows(self, first: int, n: int) -> bytes:
+        """
+        Región de datos de las muestras [first, first + n) (int16 big-endian).
+
+        Cada columna es periódica: se calcula un periodo con value() y se
+        repite con operaciones de array, así que generar millones de
+        muestras no cuesta una llamada Python por valor.
+        """
+        n_cols = len(self.order)
+        words = array("h", bytes(2 * n * n_cols))
+        for col, name in enumerate(self.order):
+            period = self._period(col)
+            start = first % period
+            pattern = array("h", (self._wave(i, col) for i in range(period)))
+            seq = (pattern * ((start + n) // period + 1))[start:start + n]
+            if self.special_every and name.startswith("CH"):
+                every = self.special_every
+                for i in range(-(-(first + 1) // every) * every - 1, first + n, every):
+                    seq[i - first] = self.value(i, col)
+            words[col::n_cols] = seq
+        if sys.byteorder == "little":
+            words.byteswap()
+        return words.tobytes()
+
+
+class GL100Simulator:
+    """
+    GL100 con estado: configuración de canales, sistema de archivos con
+    SimFile, sesión TRANS (SOUR/OPEN/HEAD/DATA/CLOSE) y medida en tiempo
+    real. Seguro entre hilos (varias conexiones pueden compartirlo).
+
+        sim = GL100Simulator()
+        sim.add_file(path, SimFile(counts=10_000))
+        sim.handle(f':TRANS:SOUR DISK,"{path}"')
+        sim.handle(":TRANS:OPEN?")   # → 3 bytes, bit 0 del tercero a 0
+    """
+
+    def __init__(
+        self,
+        channels: Optional[Dict[int, Dict[str, str]]] = None,
+        files: Optional[Dict[str, SimFile]] = None,
+        idn: str = "GRAPHTEC,GL100,0,01.45",
+    ):
+        self.channels = {ch: dict(info) for ch, info in (channels or DEFAULT_CHANNELS).items()}
+        self.files: Dict[str, SimFile] = {}
+        self.idn = idn
+        self.cwd = "\\MEM\\LOG\\"
+        self.list_form = "LONG"
+        self.list_filter = "OFF"
+        self.settings: Dict[str, str] = {}
+        self.error = 0
+        self.measuring = False
+
+        # Sesión TRANS
+        self.trans_source: Optional[str] = None
+        self.trans_file: Optional[SimFile] = None
+        self.trans_range: Tuple[int, int] = (1, 1)
+
+        self._frame_words = 0
+        self._frames = 0
+        self._lock = threading.Lock()
+        self._stats = {"commands": 0, "queries": 0, "unknown": 0, "data_bytes": 0}
+
+        for path, f in (files or {}).items():
+            self.add_file(path, f)
+
+    # ============================================================
+    # Archivos
+    # ============================================================
+    @staticmethod
+    def _norm_path(path: str) -> str:
+        return path.strip().strip('"').upper()
+
+    def add_file(self, path: str, sim_file: SimFile) -> SimFile:
+        """Añade (o reemplaza) un archivo en la ruta completa 'path'."""
+        with self._lock:
+            self.files[self._norm_path(path)] = sim_file
+        return sim_file
+
+    # ============================================================
+    # Comandos
+    # ============================================================
+    def handle(self, line: str | bytes) -> Optional[bytes]:
+        """Procesa una línea de comando y devuelve la respuesta (None = sin respuesta)."""
+        if isinstance(line, (bytes, bytearray)):
+            line = bytes(line).decode("ascii", errors="replace")
+        line = line.strip()
+        if not line:
+            return None
+
+        head, _, arg = line.partition(" ")
+        head = head.upper()
+        arg = arg.strip()
+
+        with self._lock:
+            self._stats["commands"] += 1
+            if head.endswith("?"):
+                self._stats["queries"] += 1
+            try:
+                reply = self._dispatch(head, arg)
+            except (ValueError, IndexError, KeyError):
+                logger.debug(f"[GL100Sim] Argumento inválido: {line!r}")
+                self.error = ERR_COMMAND
+                reply = None
+        if reply is not None:
+            logger.debug(f"[GL100Sim] {line!r} → {len(reply)} bytes")
+        return reply
+
+    def _dispatch(self, head: str, arg: str) -> Optional[bytes]:
+        if head == "*IDN?":
+            return f"*IDN {self.idn}\r\n".encode()
+        if head == "*CLS":
+            self.error = 0
+            return None
+
+        if head.startswith(":AMP:CH"):
+            return self._amp(head, arg)
+        if head.startswith(":STAT:"):
+            return self._status(head)
+        if head.startswith(":FILE:"):
+            return self._file(head, arg)
+        if head.startswith(":TRANS:"):
+            return self._trans(head, arg)
+
+        if head == ":MEAS:START":
+            self.measuring = True
+            return None
+        if head == ":MEAS:STOP":
+            self.measuring = False
+            return None
+        if head == ":MEAS:OUTP:ONE?":
+            return self._frame()
+
+        return self._generic(head, arg)
+
+    def _generic(self, head: str, arg: str) -> Optional[bytes]:
+        """Setters sin modelo propio se guardan; su getter devuelve lo guardado."""
+        if head.endswith("?"):
+            value = self.settings.get(head[:-1])
+            if value is None:
+                self._stats["unknown"] += 1
+                self.error = ERR_COMMAND
+                return None
+            return f"{head[:-1]} {value}\r\n".encode()
+        self.settings[head] = arg
+        return None
+
+    # ------------------------------------------------------------
+    # AMP
+    # ------------------------------------------------------------
+    _AMP_FIELDS = {"TYP": "type", "INP": "input", "RANG": "range"}
+
+    def _amp(self, head: str, arg: str) -> Optional[bytes]:
+        m = re.match(r":AMP:CH(\d+):(\w+)(\?)?$", head)
+        field = self._AMP_FIELDS.get(m.group(2)) if m else None
+        if field is None:
+            return self._generic(head, arg)
+
+        ch = int(m.group(1))
+        if ch not in self.channels:
+            self.error = ERR_CHANNEL
+            return None
+        if m.group(3):
+            return f"{head[:-1]} {self.channels[ch][field]}\r\n".encode()
+
+        self.channels[ch][field] = arg.upper()
+        self._frame_words = 0  # la trama cambia con la configuración
+        return None
+
+    # ------------------------------------------------------------
+    # STATUS
+    # ------------------------------------------------------------
+    def _status(self, head: str) -> Optional[bytes]:
+        if head == ":STAT:POW?":
+            return b":STAT:POW USB\r\n"
+        if head == ":STAT:COND?":
+            # Bit 0 REC (midiendo), bit 5 ACS (acceso a disco: TRANS abierto)
+            cond = (0x01 if self.measuring else 0) | (0x20 if self.trans_file else 0)
+            return f":STAT:COND {cond}\r\n".encode()
+        if head == ":STAT:ERR?":
+            err, self.error = self.error, 0
+            return f":STAT:ERR {err or 'NONE'}\r\n".encode()
+        return self._generic(head, "")
+
+    # ------------------------------------------------------------
+    # FILE
+    # ------------------------------------------------------------
+    def _file(self, head: str, arg: str) -> Optional[bytes]:
+        if head == ":FILE:CD":
+            path = self._norm_path(arg)
+            self.cwd = path if path.endswith("\\") else path + "\\"
+            return None
+        if head == ":FILE:CD?":
+            return f':FILE:CD "{self.cwd}"\r\n'.encode()
+        if head == ":FILE:LIST:FORM":
+            self.list_form = arg.upper()
+            return None
+        if head == ":FILE:LIST:FILT":
+            self.list_filter = self._norm_path(arg)
+            return None
+        if head == ":FILE:LIST?":
+            return (":FILE:LIST " + ",".join(self._listing()) + "\r\n").encode()
+        if head == ":FILE:NUM?":
+            return f":FILE:NUM {len(self._listing())}\r\n".encode()
+        return self._generic(head, arg)
+
+    def _listing(self) -> List[str]:
+        """Entradas entre comillas del directorio actual (carpetas con '\\' final)."""
+        entries: List[str] = []
+        folders = set()
+        for path, f in sorted(self.files.items()):
+            if not path.startswith(self.cwd):
+                continue
+            rest = path[len(self.cwd):]
+            if "\\" in rest:
+                folders.add(rest.split("\\", 1)[0] + "\\")
+                continue
+            if self.list_filter != "OFF" and not rest.endswith("." + self.list_filter):
+                continue
+            if self.list_form == "LONG":
+                entries.append(f'"{rest} {f.size} {f.start:%Y/%m/%d %H:%M:%S}"')
+            else:
+                entries.append(f'"{rest}"')
+        return [f'"{d}"' for d in sorted(folders)] + entries
+
+    # ------------------------------------------------------------
+    # TRANS
+    # ------------------------------------------------------------
+    def _trans(self, head: str, arg: str) -> Optional[bytes]:
+        if head == ":TRANS:SOUR":
+            _, _, path = arg.partition(",")
+            self.trans_source = self._norm_path(path)
+            return None
+
+        if head == ":TRANS:OPEN?":
+            f = self.files.get(self.trans_source or "")
+            self.trans_file = f
+            return b"\x00\x00\x00" if f is not None else b"\x00\x00\x01"
+
+        if head == ":TRANS:CLOSE?":
+            self.trans_file = None
+            return b"OK\r\n"
+
+        f = self.trans_file
+        if head == ":TRANS:OUTP:HEAD?":
+            return _block((f.header() if f else "").encode("ascii"))
+        if head == ":TRANS:OUTP:SIZE?":
+            return f":TRANS:OUTP:SIZE {f.size if f else 0}\r\n".encode()
+        if head == ":TRANS:OUTP:DATA":
+            first, last = (int(x) for x in arg.split(","))
+            self.trans_range = (first, last)
+            return None
+        if head == ":TRANS:OUTP:DATA?":
+            return self._trans_data(f)
+        return self._generic(head, arg)
+
+    def _trans_data(self, f: Optional[SimFile]) -> bytes:
+        """'#6******' + STATUS + DATA + CHECKSUM del rango pedido."""
+        first, last = self.trans_range
+        status = 0
+        data = b""
+        if f is None:
+            status = STATUS_ERROR
+        else:
+            counts = f.counts
+            if first < 1 or first > counts:
+                status |= STATUS_START_ERROR
+            else:
+                if last > counts or last < first:
+                    status |= STATUS_END_ERROR
+                    last = min(max(last, first), counts)
+                data = f.rows(first - 1, last - first + 1)
+        self._stats["data_bytes"] += len(data)
+        checksum = sum(data) & 0xFFFF
+        return b"#6%06d" % len(data) + struct.pack(">H", status) + data + struct.pack(">H", checksum)
+
+    # ------------------------------------------------------------
+    # MEAS (tiempo real)
+    # ------------------------------------------------------------
+    def _frame(self) -> bytes:
+        """Trama de :MEAS:OUTP:ONE? con el tamaño del layout de la configuración actual."""
+        if not self._frame_words:
+            self._frame_words = compile_frame_layout(self.channels).full.size // 2
+        self._frames += 1
+        k = self._frames
+        words = [((k * 7 + i * 311) % 2000) for i in range(self._frame_words)]
+        return _block(struct.pack(f">{len(words)}h", *words))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, frames=self._frames, files=len(self.files))
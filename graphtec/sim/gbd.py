@@ -0,0 +1,138 @@
+"""
+Generador de archivos .GBD sintéticos para pruebas de escala.
+
+El archivo se escribe por fragmentos a partir de un SimFile:
+
+    [pad_header(header, HeaderSiz)] + [región de datos int16 big-endian]
+
+igual que GraphtecCapture._build_gbd_file / GbdWriter, y su header lo
+parsean los _extract_* de GraphtecCapture. La región de datos lleva
+ondas triangulares por canal, códigos especiales (OverFS, Burnout,
+UnderFS) cada special_every muestras y patrones de bits en las columnas
+Logic/Alarm. La memoria usada depende de chunk_samples, no del tamaño
+del archivo.
+
+    python -m graphtec.sim.gbd salida.GBD --module TH --counts 10M
+"""
+
+import os
+import sys
+import argparse
+import logging
+from typing import Dict, Iterable, Iterator, Optional
+
+from graphtec.io.writers import pad_header
+from graphtec.sim.device import MODULE_PRESETS, SimFile
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["iter_gbd", "write_gbd", "write_module_set"]
+
+HEADER_BLOCK = 2048
+DEFAULT_CHUNK_SAMPLES = 1 << 16
+
+
+def _fit_header(f: SimFile) -> str:
+    """Header de f con HeaderSiz ampliado (múltiplo de 2048) si no cabe."""
+    header = f.header()
+    needed = -(-len(header.encode("ascii")) // HEADER_BLOCK) * HEADER_BLOCK
+    if needed > f.header_siz:
+        f.header_siz = needed
+        header = f.header()
+    return header
+
+
+def iter_gbd(f: SimFile, chunk_samples: int = DEFAULT_CHUNK_SAMPLES) -> Iterator[bytes]:
+    """
+    Bytes del .GBD de f por fragmentos: primero la header region y
+    después la región de datos en bloques de chunk_samples muestras.
+    """
+    header = _fit_header(f)
+    yield pad_header(header, f.header_siz)
+
+    counts = f.counts
+    for first in range(0, counts, chunk_samples):
+        yield f.rows(first, min(chunk_samples, counts - first))
+
+
+def write_gbd(
+    path: str,
+    f: Optional[SimFile] = None,
+    module: str = "4VT",
+    counts: int = 1000,
+    special_every: int = 97,
+    chunk_samples: int = DEFAULT_CHUNK_SAMPLES,
+    **kwargs,
+) -> Dict[str, int]:
+    """
+    Escribe un .GBD sintético en 'path'.
+
+    Args:
+        f: SimFile a volcar. Sin él se crea SimFile.for_module(module,
+            counts, special_every=..., **kwargs).
+        chunk_samples: muestras por escritura (fija la memoria usada).
+
+    Returns:
+        {"counts", "header_siz", "bytes"}
+    """
+    if f is None:
+        f = SimFile.for_module(module, counts=counts, special_every=special_every, **kwargs)
+
+    written = 0
+    with open(path, "wb") as out:
+        for block in iter_gbd(f, chunk_samples):
+            out.write(block)
+            written += len(block)
+
+    logger.info("[sim.gbd] %s: %s, %d muestras, %d bytes", path, f.module, f.counts, written)
+    return {"counts": f.counts, "header_siz": f.header_siz, "bytes": written}
+
+
+def write_module_set(
+    folder: str,
+    counts: int,
+    modules: Iterable[str] = tuple(MODULE_PRESETS),
+    **kwargs,
+) -> Dict[str, str]:
+    """Un .GBD por módulo en 'folder' ({módulo: ruta})."""
+    os.makedirs(folder, exist_ok=True)
+    paths = {}
+    for module in modules:
+        path = os.path.join(folder, f"SIM_{module.upper().replace('-', '_')}.GBD")
+        write_gbd(path, module=module, counts=counts, **kwargs)
+        paths[module] = path
+    return paths
+
+
+# ============================================================
+# CLI
+# ============================================================
+def _parse_count(text: str) -> int:
+    text = text.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000, "g": 1_000_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if mult > 1 else text) * mult)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Genera un .GBD sintético")
+    parser.add_argument("path", help="archivo .GBD (o carpeta con --all-modules)")
+    parser.add_argument("--module", default="4VT", choices=sorted(MODULE_PRESETS))
+    parser.add_argument("--all-modules", action="store_true", help="un archivo por módulo")
+    parser.add_argument("--counts", type=_parse_count, default=1000, help="muestras (ej. 10k, 5M)")
+    parser.add_argument("--sample", default="1s", help="periodo de muestreo del header")
+    parser.add_argument("--special-every", type=int, default=97, help="0 = sin códigos especiales")
+    parser.add_argument("--chunk-samples", type=_parse_count, default=DEFAULT_CHUNK_SAMPLES)
+    args = parser.parse_args(argv)
+
+    kw = dict(sample=args.sample, special_every=args.special_every, chunk_samples=args.chunk_samples)
+    if args.all_modules:
+        for module, path in write_module_set(args.path, args.counts, **kw).items():
+            print(f"{module:7s} {path}")
+    else:
+        info = write_gbd(args.path, module=args.module, counts=args.counts, **kw)
+        print(f"{args.path}: {info['counts']} muestras, {info['bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Enlace simulado con el GL100: velocidad de línea, latencia y fallos.
+
+SimLink se comporta como un puerto pyserial (write/flush/readinto/
+in_waiting/timeout) conectado a un GL100Simulator:
+
+  - baudrate: cada byte tarda 10 / baudrate s en la línea (8N1), en
+    los dos sentidos; None = sin límite.
+  - latency: tiempo de proceso del equipo antes de empezar a responder.
+  - faults: lista de Fault que alteran las respuestas a comandos
+    concretos (sin respuesta, truncada, resto que llega tarde,
+    checksum corrupto, ruido delante).
+
+SimConnection es un SerialConnection que abre un SimLink en lugar del
+puerto serie, así que el envío (pacing, arbiter) y la recepción
+(FramedReader) son exactamente los del transporte real. Los endpoints
+TCP y pty de graphtec.sim.server usan el mismo SimLink.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from graphtec.connection.serial_connection import SerialConnection
+from graphtec.sim.device import GL100Simulator
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Fault", "SimLink", "SimConnection"]
+
+FAULT_KINDS = ("drop", "truncate", "late", "corrupt", "noise")
+
+
+@dataclass
+class Fault:
+    """
+    Fallo inyectado en las respuestas a los comandos que empiezan por 'match'.
+
+    - drop:     sin respuesta (el cliente agota su timeout)
+    - truncate: solo llega la fracción 'keep' de la respuesta
+    - late:     la fracción 'keep' llega a tiempo y el resto 'delay' s después
+    - corrupt:  último byte alterado (el CHECKSUM en TRANS DATA)
+    - noise:    bytes basura antes de la respuesta
+
+    Afecta a 'times' respuestas (0 = todas) tras dejar pasar 'skip'.
+    """
+
+    kind: str
+    match: str = ":TRANS:OUTP:DATA?"
+    times: int = 1
+    skip: int = 0
+    keep: float = 0.5
+    delay: float = 0.5
+    noise: bytes = b"\xff\x00\r\n"
+
+    def __post_init__(self):
+        if self.kind not in FAULT_KINDS:
+            raise ValueError(f"Fallo desconocido: {self.kind!r} (válidos: {FAULT_KINDS})")
+        self.seen = 0
+        self.fired = 0
+
+    def applies(self, command: str) -> bool:
+        """Cuenta la respuesta a 'command' y dice si este fallo la altera."""
+        if not command.upper().startswith(self.match.upper()):
+            return False
+        self.seen += 1
+        if self.seen <= self.skip or (self.times and self.fired >= self.times):
+            return False
+        self.fired += 1
+        return True
+
+    def apply(self, reply: bytes) -> List[Tuple[float, bytes]]:
+        """Trozos (retraso extra, bytes) en que se convierte la respuesta."""
+        cut = int(len(reply) * self.keep)
+        if self.kind == "drop":
+            return []
+        if self.kind == "truncate":
+            return [(0.0, reply[:cut])]
+        if self.kind == "late":
+            return [(0.0, reply[:cut]), (self.delay, reply[cut:])]
+        if self.kind == "corrupt":
+            return [(0.0, reply[:-1] + bytes([reply[-1] ^ 0xFF]))]
+        return [(0.0, self.noise + reply)]
+
+
+class SimLink:
+    """Puerto serie simulado (interfaz pyserial mínima) hacia un GL100Simulator."""
+
+    def __init__(
+        self,
+        simulator: GL100Simulator,
+        baudrate: Optional[int] = None,
+        latency: float = 0.0,
+        faults: Sequence[Fault] = (),
+        timeout: Optional[float] = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.simulator = simulator
+        self.byte_time = 10.0 / baudrate if baudrate else 0.0
+        self.latency = latency
+        self.faults: List[Fault] = list(faults)
+        self.timeout = timeout  # como serial.Serial.timeout (None = sin límite)
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        # Respuestas en la línea: [inicio de transmisión, bytes, consumidos]
+        self._segments: Deque[List[Any]] = deque()
+        self._line = bytearray()
+        self._tx_free = 0.0  # la línea hacia el host queda libre en este instante
+        self._rx_free = 0.0  # el último comando termina de llegar al equipo
+        self.is_open = True
+
+        self._stats = {"bytes_out": 0, "bytes_in": 0, "commands": 0, "faults": 0}
+
+    # ============================================================
+    # Host → equipo
+    # ============================================================
+    def write(self, data: bytes) -> int:
+        """Entrega 'data' al simulador; cada línea completa genera su respuesta."""
+        if not self.is_open:
+            raise OSError("[SimLink] Enlace cerrado")
+        with self._cond:
+            now = self._clock()
+            self._rx_free = max(now, self._rx_free) + len(data) * self.byte_time
+            self._stats["bytes_out"] += len(data)
+            self._line += data
+            while True:
+                idx = self._line.find(b"\n")
+                if idx < 0:
+                    break
+                line = bytes(self._line[:idx]).strip()
+                del self._line[:idx + 1]
+                if line:
+                    self._command(line.decode("ascii", errors="replace"))
+            self._cond.notify_all()
+        return len(data)
+
+    def _command(self, command: str) -> None:
+        self._stats["commands"] += 1
+        reply = self.simulator.handle(command)
+        if not reply:
+            return
+
+        pieces = [(0.0, reply)]
+        for fault in self.faults:
+            if fault.applies(command):
+                self._stats["faults"] += 1
+                logger.debug(f"[SimLink] Fallo '{fault.kind}' en {command!r}")
+                pieces = fault.apply(reply)
+                break
+
+        start = max(self._rx_free + self.latency, self._tx_free)
+        for extra, data in pieces:
+            start += extra
+            if data:
+                self._segments.append([start, data, 0])
+                start += len(data) * self.byte_time
+        self._tx_free = start
+
+    def flush(self) -> None:
+        """Espera a que el último comando haya salido por la línea."""
+        wait = self._rx_free - self._clock()
+        if wait > 0:
+            time.sleep(wait)
+
+    # ============================================================
+    # Equipo → host
+    # ============================================================
+    def _ready(self, seg: List[Any], now: float) -> int:
+        """Bytes de un trozo que ya han llegado y no se han leído."""
+        start, data, used = seg
+        if now < start:
+            return 0
+        if not self.byte_time:
+            return len(data) - used
+        return min(len(data), int((now - start) / self.byte_time)) - used
+
+    def _available(self, now: float) -> int:
+        total = 0
+        for seg in self._segments:
+            n = self._ready(seg, now)
+            if n <= 0:
+                break
+            total += n
+            if seg[2] + n < len(seg[1]):
+                break
+        return total
+
+    @property
+    def in_waiting(self) -> int:
+        with self._cond:
+            return self._available(self._clock())
+
+    def _next_byte(self, now: float) -> Optional[float]:
+        """Instante en que llega el siguiente byte (None si no hay nada en camino)."""
+        if not self._segments:
+            return None
+        start, data, used = self._segments[0]
+        return max(now, start + (used + 1) * self.byte_time)
+
+    def readinto(self, view) -> int:
+        """Como serial.Serial.readinto: espera hasta 'timeout' por el primer byte."""
+        view = memoryview(view).cast("B")
+        deadline = None if self.timeout is None else self._clock() + self.timeout
+        with self._cond:
+            while True:
+                now = self._clock()
+                n = self._take(view, now)
+                if n or not self.is_open:
+                    return n
+                if deadline is not None and now >= deadline:
+                    return 0
+                nxt = self._next_byte(now)
+                wait = None if nxt is None else nxt - now
+                if deadline is not None:
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+                self._cond.wait(wait)
+
+    def read(self, size: int = 1) -> bytes:
+        buf = bytearray(size)
+        n = self.readinto(buf)
+        return bytes(buf[:n])
+
+    def _take(self, view: memoryview, now: float) -> int:
+        got = 0
+        while self._segments and got < len(view):
+            seg = self._segments[0]
+            n = min(self._ready(seg, now), len(view) - got)
+            if n <= 0:
+                break
+            used = seg[2]
+            view[got:got + n] = seg[1][used:used + n]
+            seg[2] += n
+            got += n
+            if seg[2] >= len(seg[1]):
+                self._segments.popleft()
+        self._stats["bytes_in"] += got
+        return got
+
+    def reset_input_buffer(self) -> None:
+        """Descarta lo ya recibido (lo que siga en camino llegará después)."""
+        with self._cond:
+            now = self._clock()
+            while self._segments:
+                seg = self._segments[0]
+                seg[2] += max(0, self._ready(seg, now))
+                if seg[2] < len(seg[1]):
+                    break
+                self._segments.popleft()
+
+    def reset_output_buffer(self) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(self._stats, pending=sum(len(s[1]) - s[2] for s in self._segments))
+
+
+class SimConnection(SerialConnection):
+    """
+    SerialConnection sobre un SimLink en proceso: mismo código de envío y
+    recepción que con un GL100 real, sin puerto serie.
+
+        sim = GL100Simulator(files={path: SimFile(counts=100_000)})
+        conn = SimConnection(sim, baudrate=115200, latency=0.002)
+        conn.open()
+        GraphtecCapture(conn).download(path, "out")
+    """
+
+    def __init__(
+        self,
+        simulator: Optional[GL100Simulator] = None,
+        baudrate: Optional[int] = None,
+        latency: float = 0.0,
+        faults: Sequence[Fault] = (),
+        timeout: float = 3,
+        pacing=None,
+    ):
+        """
+        Args:
+            simulator: equipo simulado (uno nuevo si no se indica).
+            baudrate: velocidad de línea simulada (None = sin límite).
+            latency: tiempo de proceso por comando (s).
+            faults: fallos a inyectar (ver Fault).
+        """
+        super().__init__(port="sim", baudrate=baudrate or 0, timeout=timeout, pacing=pacing)
+        self.simulator = simulator if simulator is not None else GL100Simulator()
+        self.latency = latency
+        self.faults = list(faults)
+        self.link: Optional[SimLink] = None
+
+    def open(self):
+        self.link = SimLink(
+            self.simulator,
+            baudrate=self.baudrate or None,
+            latency=self.latency,
+            faults=self.faults,
+            timeout=self.timeout,
+        )
+        self._connection = self.link
+        logger.info("[SimConnection] Conexión abierta con el GL100 simulado")
@@ -0,0 +1,201 @@
+"""
+Endpoints del GL100 simulado para clientes fuera del proceso.
+
+  - SimTCPServer: escucha como el módulo LAN del GL100 (puerto 8023)
+    y sirve a cualquier cliente TCP (WLANConnection, telnet, ...).
+  - SimPty: pseudo-terminal POSIX; SerialConnection(port=pty.port)
+    lo abre como un puerto serie más.
+
+Cada cliente tiene su propio SimLink (velocidad de línea, latencia y
+fallos) sobre el GL100Simulator compartido. Dos hilos por cliente:
+uno pasa los comandos al enlace y otro escribe lo que el enlace deja
+disponible.
+
+    with SimTCPServer(sim, latency=0.002) as server:
+        conn = WLANConnection(*server.address)
+"""
+
+import os
+import select
+import socket
+import threading
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from graphtec.sim.device import GL100Simulator
+from graphtec.sim.link import Fault, SimLink
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SimTCPServer", "SimPty"]
+
+# Espera máxima de los hilos antes de comprobar si deben parar
+_POLL = 0.05
+
+
+def _pump_out(link: SimLink, write, stop: threading.Event) -> None:
+    """Enlace → cliente, hasta que el enlace se cierre o se pida parar."""
+    buf = bytearray(65536)
+    while not stop.is_set() and link.is_open:
+        n = link.readinto(buf)
+        if n:
+            try:
+                write(bytes(buf[:n]))
+            except OSError:
+                break
+    link.close()
+
+
+class _Endpoint:
+    """Parte común: simulador, opciones del enlace y ciclo de vida de los hilos."""
+
+    def __init__(
+        self,
+        simulator: Optional[GL100Simulator] = None,
+        baudrate: Optional[int] = None,
+        latency: float = 0.0,
+        faults: Sequence[Fault] = (),
+    ):
+        self.simulator = simulator if simulator is not None else GL100Simulator()
+        self.baudrate = baudrate
+        self.latency = latency
+        self.faults = list(faults)
+        self.links: List[SimLink] = []
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _new_link(self) -> SimLink:
+        link = SimLink(
+            self.simulator,
+            baudrate=self.baudrate,
+            latency=self.latency,
+            faults=self.faults,
+            timeout=_POLL,
+        )
+        self.links.append(link)
+        return link
+
+    def _spawn(self, target, *args) -> None:
+        t = threading.Thread(target=target, args=args, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def close(self) -> None:
+        self._stop.set()
+        for link in self.links:
+            link.close()
+        for t in self._threads:
+            t.join(1.0)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SimTCPServer(_Endpoint):
+    """Servidor TCP con el GL100 simulado (varios clientes a la vez)."""
+
+    def __init__(self, simulator: Optional[GL100Simulator] = None, host: str = "127.0.0.1", port: int = 0, **link):
+        """
+        Args:
+            port: puerto de escucha (0 = uno libre; ver address).
+            **link: baudrate, latency y faults de cada SimLink.
+        """
+        super().__init__(simulator, **link)
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(_POLL)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """(host, puerto) en el que escucha."""
+        return self._server.getsockname()[:2]
+
+    def start(self) -> "SimTCPServer":
+        self._spawn(self._accept_loop)
+        logger.info(f"[GL100Sim] Escuchando en {self.address[0]}:{self.address[1]}")
+        return self
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                client, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            link = self._new_link()
+            self._spawn(self._serve_in, client, link)
+            self._spawn(_pump_out, link, client.sendall, self._stop)
+
+    def _serve_in(self, client: socket.socket, link: SimLink) -> None:
+        client.settimeout(_POLL)
+        with client:
+            while not self._stop.is_set() and link.is_open:
+                try:
+                    data = client.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                if not data:
+                    break
+                link.write(data)
+            link.close()
+
+    def close(self) -> None:
+        self._server.close()
+        super().close()
+
+
+class SimPty(_Endpoint):
+    """GL100 simulado detrás de un pseudo-terminal (solo POSIX)."""
+
+    def __init__(self, simulator: Optional[GL100Simulator] = None, **link):
+        super().__init__(simulator, **link)
+        if not hasattr(os, "openpty"):
+            raise OSError("SimPty requiere pseudo-terminales POSIX (os.openpty)")
+        import tty
+
+        self._master, self._slave = os.openpty()
+        # Sin eco ni edición de línea hasta que el cliente configure el puerto
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+    def start(self) -> "SimPty":
+        link = self._new_link()
+        self._spawn(self._serve_in, link)
+        self._spawn(_pump_out, link, self._write, self._stop)
+        logger.info(f"[GL100Sim] Puerto serie simulado en {self.port}")
+        return self
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            n = os.write(self._master, view)
+            view = view[n:]
+
+    def _serve_in(self, link: SimLink) -> None:
+        while not self._stop.is_set() and link.is_open:
+            try:
+                ready, _, _ = select.select([self._master], [], [], _POLL)
+                if not ready:
+                    continue
+                data = os.read(self._master, 65536)
+            except OSError:
+                break
+            if not data:
+                break
+            link.write(data)
+        link.close()
+
+    def close(self) -> None:
+        super().close()
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
@@ -14,3 +14,40 @@ def test_amp_channel_off(device):
 
     assert amp.get_channel_input(3) == "OFF"
     assert amp.get_channel_range(3) == "NONE"
+
+
+def _count_channel_queries(amp, monkeypatch):
+    calls = []
+    for name, value in (("get_channel_type", "VT"), ("get_channel_input", "DC_V"), ("get_channel_range", "5V")):
+        monkeypatch.setattr(amp, name, lambda ch, _n=name, _v=value: calls.append((_n, ch)) or _v)
+    return calls
+
+
+def test_amp_get_channels_uses_snapshot(device, monkeypatch):
+    amp = device.amp
+    calls = _count_channel_queries(amp, monkeypatch)
+
+    channels = amp.get_channels()
+    assert channels[4] == {"type": "VT", "input": "DC_V", "range": "5V"}
+    assert len(calls) == 12
+
+    amp.get_channels()
+    assert len(calls) == 12
+
+    version = amp.config_version
+    amp.refresh()
+    assert len(calls) == 24
+    assert amp.config_version > version
+
+
+def test_amp_invalidate_forces_reload(device, monkeypatch):
+    amp = device.amp
+    calls = _count_channel_queries(amp, monkeypatch)
+
+    amp.get_channels()
+    version = amp.config_version
+    amp.invalidate()
+    assert amp.config_version > version
+
+    amp.get_channels()
+    assert len(calls) == 24
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from graphtec.connection.arbiter import (
+    PRIORITY_BULK,
+    PRIORITY_NORMAL,
+    PRIORITY_REALTIME,
+    CommandArbiter,
+)
+from graphtec.core.exceptions import TimeoutError as GraphtecTimeoutError
+
+
+def _wait_for(cond, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < end, "timeout"
+        time.sleep(0.001)
+
+
+def test_arbiter_grants_by_priority_then_fifo():
+    arb = CommandArbiter()
+    order = []
+
+    def worker(name, priority):
+        with arb.transaction(priority):
+            order.append(name)
+
+    with arb.transaction(PRIORITY_BULK):
+        threads = []
+        for name, prio in [("bulk", PRIORITY_BULK), ("normal", PRIORITY_NORMAL),
+                           ("rt1", PRIORITY_REALTIME), ("rt2", PRIORITY_REALTIME)]:
+            t = threading.Thread(target=worker, args=(name, prio))
+            t.start()
+            threads.append(t)
+            _wait_for(lambda: arb.waiting == len(threads))
+        # Reentrante en el hilo que la tiene
+        with arb.transaction(PRIORITY_NORMAL):
+            pass
+    for t in threads:
+        t.join(2)
+
+    assert order == ["rt1", "rt2", "normal", "bulk"]
+    assert arb.stats()["grants"] == {"realtime": 2, "normal": 1, "bulk": 2}
+
+
+def test_arbiter_timeout_leaves_queue_consistent():
+    arb = CommandArbiter()
+    holder_in, release = threading.Event(), threading.Event()
+
+    def holder():
+        with arb.transaction():
+            holder_in.set()
+            release.wait(2)
+
+    t = threading.Thread(target=holder)
+    t.start()
+    holder_in.wait(2)
+    with pytest.raises(GraphtecTimeoutError):
+        with arb.transaction(PRIORITY_REALTIME, timeout=0.02):
+            pass
+    assert arb.waiting == 0
+    release.set()
+    t.join(2)
+    with arb.transaction(timeout=0.5):
+        pass
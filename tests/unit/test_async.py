@@ -0,0 +1,183 @@
+import asyncio
+import struct
+
+import pytest
+
+from graphtec.api.async_public import AsyncGraphtec
+from graphtec.connection.async_connection import AsyncWLANConnection
+from graphtec.core.exceptions import DataError, DisconnectedError
+from graphtec.io.chunking import ChunkerConfig
+from graphtec.io.protocol import run_steps_async, trans_download_steps
+
+
+HEADER = (
+    "$Header\r\n"
+    "HeaderSiz  = 2048\r\n"
+    "$$Data\r\n"
+    "Order      = CH1, CH2, Logic\r\n"
+    "Counts     = 3\r\n"
+    "Sample     = 1s\r\n"
+    "Start      = 2024-01-01, 00:00:00\r\n"
+    "$Amp\r\n"
+    "CH1        = VT   , DC   ,       5V, Off   ,    Off,      +0\r\n"
+    "CH2        = VT   , TEMP ,      TCK, Off   ,    Off,      +0\r\n"
+    "UnitOrder  = 4VT\r\n"
+    "$EndHeader\r\n"
+)
+DATA = b"".join(struct.pack(">3h", *r) for r in [(2000, 251, 1), (-2000, 0x7ffd, 0), (0, -100, 3)])
+CHANNELS = {1: ("VT", "DC_V", "5V"), 2: ("VT", "TC-K", "TCK"), 3: ("VT", "OFF", "NONE"), 4: ("VT", "OFF", "NONE")}
+
+
+def _trans_block(data: bytes) -> bytes:
+    return b"#6%06d" % len(data) + b"\x00\x00" + data + struct.pack(">H", sum(data) & 0xFFFF)
+
+
+def _reply(cmd: str, state: dict):
+    """Respuestas del GL100 simulado (None = comando sin respuesta)."""
+    if cmd == "*IDN?":
+        return b"GRAPHTEC,GL100,0,1.00\r\n"
+    if cmd.startswith(":AMP:CH"):
+        ch = int(cmd[7])
+        field = {"TYP?": 0, "INP?": 1, "RANG?": 2}[cmd.split(":")[-1]]
+        return f"{cmd[:-1]} {CHANNELS[ch][field]}\r\n".encode()
+    if cmd == ":MEAS:OUTP:ONE?":
+        payload = struct.pack(">4h", 2000, 251, 0, 0)
+        return b"#6%06d" % len(payload) + payload
+    if cmd == ":FILE:LIST?":
+        return b'"A.GBD 100","LOG\\"\r\n'
+    if cmd == ":TRANS:OPEN?":
+        return b"\x00\x00\x00"
+    if cmd == ":TRANS:OUTP:HEAD?":
+        head = HEADER.encode("ascii")
+        return b"#6%06d" % len(head) + head
+    if cmd.startswith(":TRANS:OUTP:DATA "):
+        state["range"] = [int(x) for x in cmd.split()[-1].split(",")]
+        return None
+    if cmd == ":TRANS:OUTP:DATA?":
+        first, last = state["range"]
+        return _trans_block(DATA[(first - 1) * 6:last * 6])
+    if cmd == ":TRANS:CLOSE?":
+        return b"OK\r\n"
+    return None
+
+
+async def _serve():
+    async def handle(reader, writer):
+        state = {}
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            resp = _reply(line.decode().strip(), state)
+            if resp is not None:
+                writer.write(resp)
+                await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_async_connection_frames_replies():
+    async def main():
+        server, port = await _serve()
+        async with server, AsyncWLANConnection("127.0.0.1", port) as conn:
+            assert await conn.query("*IDN?") == b"GRAPHTEC,GL100,0,1.00\r\n"
+            assert await conn.query(":TRANS:OPEN?") == b"\x00\x00\x00"
+            await conn.send(":TRANS:OUTP:DATA 1,2")
+            assert await conn.query(":TRANS:OUTP:DATA?") == _trans_block(DATA[:12])
+
+    asyncio.run(main())
+
+
+def test_async_facade_multiplexes_devices(tmp_path):
+    async def main():
+        server, port = await _serve()
+        async with server:
+            devices = [AsyncGraphtec("lan", address="127.0.0.1", tcp_port=port, chunk_samples=2) for _ in range(3)]
+            for gl in devices:
+                await gl.connect()
+
+            readings = await asyncio.gather(*(gl.read_measurement() for gl in devices))
+            assert all(r == {"CH1_V": 0.5, "CH2_Temp_TC-K": 25.1} for r in readings)
+            assert await devices[0].list_files() == ["A.GBD"]
+
+            outs = await asyncio.gather(
+                *(gl.download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path / str(i))) for i, gl in enumerate(devices))
+            )
+            for gl in devices:
+                await gl.disconnect()
+        return outs
+
+    outs = asyncio.run(main())
+    for out in outs:
+        assert out["samples"] == 3
+        with open(out["bin"], "rb") as f:
+            assert f.read() == DATA
+        with open(out["csv"], encoding="utf-8") as f:
+            assert f.read().splitlines()[1] == "2024-01-01T00:00:00,0.5,25.1,1"
+
+
+def test_async_connection_rejects_truncated_block():
+    async def main():
+        async def handle(reader, writer):
+            await reader.readline()
+            writer.write(_trans_block(DATA)[:-5])
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, AsyncWLANConnection("127.0.0.1", port) as conn:
+            with pytest.raises(DataError):
+                await conn.query(":TRANS:OUTP:DATA?")
+
+    asyncio.run(main())
+
+
+class _FailingConn:
+    """Conexión asyncio falsa: falla al pedir DATA y registra lo enviado."""
+
+    def __init__(self, error):
+        self.error = error
+        self.sent = []
+        self.state = {}
+
+    async def send(self, command):
+        self.sent.append(command)
+        _reply(command, self.state)
+
+    async def query(self, command):
+        self.sent.append(command)
+        if command == ":TRANS:OUTP:DATA?":
+            raise self.error
+        return _reply(command, self.state)
+
+
+@pytest.mark.parametrize("error", [ConnectionResetError("reset"), asyncio.CancelledError()])
+def test_run_steps_async_closes_trans_on_fatal_error(tmp_path, error):
+    conn = _FailingConn(error)
+    steps = trans_download_steps("\\MEM\\LOG\\TEST.GBD", str(tmp_path), ("csv",), ChunkerConfig(2).make)
+
+    with pytest.raises(type(error)):
+        asyncio.run(run_steps_async(conn, steps, offload=True))
+
+    assert conn.sent[-1] == ":TRANS:CLOSE?"
+    assert steps.gi_frame is None  # generador terminado: escritores cerrados
+
+
+def test_async_connection_maps_eof_to_disconnected():
+    async def main():
+        async def handle(reader, writer):
+            await reader.readline()
+            writer.write(b"GRAPH")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, AsyncWLANConnection("127.0.0.1", port) as conn:
+            with pytest.raises(DisconnectedError):
+                await conn.query("*IDN?")
+
+    asyncio.run(main())
@@ -0,0 +1,400 @@
+import io
+import os
+import json
+import struct
+
+import pytest
+
+from graphtec.connection.serial_connection import SerialConnection
+from graphtec.io.capture import GraphtecCapture
+from graphtec.core.exceptions import DataError
+from graphtec.io.chunking import RESYNC, AdaptiveChunker, DataChunk, FetchRange, trans_data_steps
+from graphtec.io.pipeline import TransPipeline
+from graphtec.io.writers import CsvWriter
+from tests.mocks.mock_connection import MockConnection
+
+
+HEADER = (
+    "$Header\r\n"
+    "HeaderSiz  = 2048\r\n"
+    "$$Data\r\n"
+    "Order      = CH1, CH2, Logic\r\n"
+    "Counts     = 3\r\n"
+    "Sample     = 1s\r\n"
+    "Start      = 2024-01-01, 00:00:00\r\n"
+    "$Amp\r\n"
+    "CH1        = VT   , DC   ,       5V, Off   ,    Off,      +0\r\n"
+    "CH2        = VT   , TEMP ,      TCK, Off   ,    Off,      +0\r\n"
+    "UnitOrder  = 4VT\r\n"
+    "$EndHeader\r\n"
+)
+ROWS = [(2000, 251, 1), (-2000, 0x7ffd, 0), (0, -100, 3)]
+
+
+def _data_region() -> bytes:
+    return b"".join(struct.pack(">3h", *r) for r in ROWS)
+
+
+def _trans_block(data: bytes) -> bytes:
+    checksum = sum(data) & 0xFFFF
+    return b"#6%06d" % len(data) + b"\x00\x00" + data + struct.pack(">H", checksum)
+
+
+class RangeConnection(MockConnection):
+    """MockConnection que responde a :TRANS:OUTP:DATA? según el último rango pedido."""
+
+    def query(self, command):
+        cmd = self._norm(command)
+        if cmd == ":TRANS:OUTP:DATA?":
+            self.send(cmd)
+            rng = [c for c in self.sent_commands if c.startswith(":TRANS:OUTP:DATA ")][-1]
+            first, last = (int(x) for x in rng.split()[-1].split(","))
+            return _trans_block(_data_region()[(first - 1) * 6:last * 6])
+        return super().query(command)
+
+
+def _capture_conn(cls=MockConnection) -> MockConnection:
+    head = HEADER.encode("ascii")
+    conn = cls(
+        responses={
+            ":TRANS:OPEN?": b"\x00\x00\x00",
+            ":TRANS:OUTP:HEAD?": b"#6%06d" % len(head) + head,
+            ":TRANS:OUTP:DATA?": _trans_block(_data_region()),
+        },
+        strict=True,
+    )
+    conn.open()
+    return conn
+
+
+def test_download_csv(tmp_path):
+    cap = GraphtecCapture(_capture_conn())
+    out = cap.download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path))
+
+    with open(out["bin"], "rb") as f:
+        assert f.read() == _data_region()
+
+    with open(out["csv"], encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "TimeStamp,CH1_V,CH2_C,Logic"
+    assert lines[1] == "2024-01-01T00:00:00,0.5,25.1,1"
+    assert lines[2] == "2024-01-01T00:00:01,-0.5,,0"
+
+
+def test_download_file_gbd(tmp_path):
+    cap = GraphtecCapture(_capture_conn())
+    out = cap.download_file("\\MEM\\LOG\\TEST.GBD", str(tmp_path))
+
+    with open(out["gbd"], "rb") as f:
+        gbd = f.read()
+    assert len(gbd) == 2048 + len(_data_region())
+    assert gbd[2048:] == _data_region()
+
+
+def test_download_streams_in_chunks(tmp_path):
+    conn = _capture_conn(RangeConnection)
+    cap = GraphtecCapture(conn, chunk_samples=2)
+    out = cap.download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path))
+
+    assert ":TRANS:OUTP:DATA 1,2" in conn.sent_commands
+    assert ":TRANS:OUTP:DATA 3,3" in conn.sent_commands
+    with open(out["bin"], "rb") as f:
+        assert f.read() == _data_region()
+    with open(out["csv"], encoding="utf-8") as f:
+        assert f.read().splitlines()[3] == "2024-01-01T00:00:02,0.0,-10.0,3"
+
+
+def test_serial_read_binary_trans_data_into_reuses_buffer():
+    data = bytes(range(100))
+    conn = SerialConnection()
+    conn._connection = io.BytesIO(b"noise" + _trans_block(data))
+
+    buf = bytearray(256)
+    view = conn.read_binary_trans_data_into(buf)
+
+    assert view.obj is buf
+    assert bytes(view) == _trans_block(data)
+
+
+def test_download_many_formats_single_transfer(tmp_path):
+    conn = _capture_conn()
+    cap = GraphtecCapture(conn)
+    out = cap.download("\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("gbd", "csv"))
+
+    assert conn.sent_commands.count(":TRANS:OPEN?") == 1
+    assert set(out) >= {"folder", "hdr", "bin", "gbd", "csv"}
+    with open(out["gbd"], "rb") as f:
+        assert f.read()[2048:] == _data_region()
+
+
+def test_export_local_without_device(tmp_path):
+    out = GraphtecCapture(_capture_conn()).download_file("\\MEM\\LOG\\TEST.GBD", str(tmp_path))
+    with open(out["bin"], "rb") as f:
+        original_bin = f.read()
+
+    offline = MockConnection(responses={}, strict=True)
+    res = GraphtecCapture(offline, chunk_samples=2).export_local(out["folder"], formats=("csv",))
+
+    assert offline.sent_commands == []
+    with open(res["csv"], encoding="utf-8") as f:
+        assert f.read().splitlines()[3] == "2024-01-01T00:00:02,0.0,-10.0,3"
+    with open(res["bin"], "rb") as f:
+        assert f.read() == original_bin
+
+
+class FlakyConnection(RangeConnection):
+    """RangeConnection cuyo primer bloque DATA llega con checksum incorrecto."""
+
+    corrupted = False
+
+    def query(self, command):
+        block = super().query(command)
+        if self._norm(command) == ":TRANS:OUTP:DATA?" and not self.corrupted:
+            self.corrupted = True
+            return block[:-1] + bytes([block[-1] ^ 0xFF])
+        return block
+
+
+def test_download_retries_range_after_checksum_error(tmp_path):
+    conn = _capture_conn(FlakyConnection)
+    cap = GraphtecCapture(conn, chunk_bytes=6 * 2)
+    out = cap.download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path))
+
+    with open(out["bin"], "rb") as f:
+        assert f.read() == _data_region()
+    assert cap.last_stats["checksum_errors"] == 1
+    assert cap.last_stats["retries"] == 1
+    assert sum(cap.last_stats["chunk_sizes"].values()) == cap.last_stats["requests"]
+
+
+def test_adaptive_chunker_grows_and_shrinks():
+    chunker = AdaptiveChunker(bytes_per_sample=6, target_bytes=600, min_bytes=60, target_rtt=1.0)
+    assert chunker.samples == 100
+
+    chunker.record_success(100, 600, rtt=0.1)
+    assert chunker.samples == 200
+
+    chunker.record_success(200, 1200, rtt=0.8)
+    assert chunker.samples == 200
+
+    chunker.record_failure("timeout")
+    assert chunker.samples == 100
+    assert chunker.stats()["timeouts"] == 1
+
+    fixed = AdaptiveChunker(bytes_per_sample=6, fixed_samples=7)
+    fixed.record_success(7, 42, rtt=0.01)
+    fixed.record_failure("checksum")
+    assert fixed.next_samples(1000) == 7
+
+
+def test_trans_data_steps_retries_same_range_after_resync():
+    chunker = AdaptiveChunker(bytes_per_sample=6, fixed_samples=2)
+    steps = trans_data_steps({"counts": 3, "bytes_per_sample": 6}, chunker, max_retries=1)
+
+    assert next(steps) == FetchRange(1, 2, 2 * 6 + 32)
+    assert steps.throw(DataError("trama")) is RESYNC
+    assert next(steps) == FetchRange(1, 2, 2 * 6 + 32)
+    chunk = steps.send(_trans_block(_data_region()[:12]))
+    assert isinstance(chunk, DataChunk) and chunk.first == 0 and bytes(chunk.data) == _data_region()[:12]
+
+    assert next(steps) == FetchRange(3, 3, 6 + 32)
+    assert steps.send(_trans_block(_data_region()[12:])).first == 2
+    with pytest.raises(StopIteration) as stop:
+        next(steps)
+    assert stop.value.value == 3
+    assert chunker.stats()["retries"] == 1
+
+
+def test_pipelined_download_matches_sequential(tmp_path):
+    seq = GraphtecCapture(_capture_conn(RangeConnection), chunk_samples=1)
+    out_seq = seq.download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path / "seq"))
+
+    conn = _capture_conn(FlakyConnection)
+    pipe = GraphtecCapture(conn, chunk_samples=1, pipeline=True, pipeline_depth=2)
+    out_pipe = pipe.download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path / "pipe"))
+
+    for key in ("bin", "csv"):
+        with open(out_seq[key], "rb") as a, open(out_pipe[key], "rb") as b:
+            assert a.read() == b.read()
+    assert pipe.last_stats["pipelined"]
+    assert pipe.last_stats["checksum_errors"] == 1
+
+
+def test_pipeline_reuses_pool_buffers_while_chunker_grows():
+    data = bytes(range(256)) * 12  # 512 muestras de 6 bytes
+    buffers = set()
+
+    def fetch(first, last, buf):
+        buffers.add(id(buf))
+        return _trans_block(data[(first - 1) * 6:last * 6])
+
+    chunker = AdaptiveChunker(bytes_per_sample=6, target_bytes=60, min_bytes=60, max_bytes=1200)
+    pipe = TransPipeline(fetch, chunker, counts=512, bytes_per_sample=6, depth=2)
+    got = b"".join(bytes(chunk) for _, chunk in pipe)
+
+    assert got == data
+    assert chunker.samples > 10
+    assert len(buffers) <= 3
+
+
+class DyingConnection(RangeConnection):
+    """RangeConnection que pierde el enlace en el segundo bloque DATA."""
+
+    blocks = 0
+
+    def query(self, command):
+        if self._norm(command) == ":TRANS:OUTP:DATA?":
+            self.blocks += 1
+            if self.blocks == 2:
+                raise OSError("enlace perdido")
+        return super().query(command)
+
+
+def test_download_resumes_from_checkpoint(tmp_path):
+    cap = GraphtecCapture(_capture_conn(DyingConnection), chunk_samples=1)
+    with pytest.raises(OSError):
+        cap.download("\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv",), checkpoint=True)
+
+    conn = _capture_conn(RangeConnection)
+    out = GraphtecCapture(conn, chunk_samples=1).download(
+        "\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv",), resume=True
+    )
+
+    data_ranges = [c for c in conn.sent_commands if c.startswith(":TRANS:OUTP:DATA ")]
+    assert data_ranges == [":TRANS:OUTP:DATA 2,2", ":TRANS:OUTP:DATA 3,3"]
+    with open(out["bin"], "rb") as f:
+        assert f.read() == _data_region()
+    with open(out["csv"], encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 4
+    with open(out["ckpt"], encoding="utf-8") as f:
+        assert json.load(f)["complete"] is True
+
+
+def test_plain_download_leaves_no_checkpoint(tmp_path):
+    out = GraphtecCapture(_capture_conn(), chunk_samples=1).download_csv("\\MEM\\LOG\\TEST.GBD", str(tmp_path))
+    assert "ckpt" not in out
+    assert not any(name.endswith(".ckpt") for name in os.listdir(out["folder"]))
+    assert out["samples"] == out["new_samples"] == len(ROWS)
+
+
+def test_resume_restarts_when_bin_does_not_match_checkpoint(tmp_path):
+    out = GraphtecCapture(_capture_conn(), chunk_samples=1).download(
+        "\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=(), checkpoint=True
+    )
+    with open(out["bin"], "r+b") as f:
+        f.write(b"\xff\xff")  # corromper el prefijo
+
+    conn = _capture_conn(RangeConnection)
+    GraphtecCapture(conn, chunk_samples=3).download(
+        "\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=(), resume=True
+    )
+
+    assert ":TRANS:OUTP:DATA 1,3" in conn.sent_commands
+    with open(out["bin"], "rb") as f:
+        assert f.read() == _data_region()
+
+
+class GrowingConnection(RangeConnection):
+    """RangeConnection cuyo archivo va creciendo: el header anuncia 'counts' muestras."""
+
+    counts = len(ROWS)
+
+    def query(self, command):
+        if self._norm(command) == ":TRANS:OUTP:HEAD?":
+            self.send(command)
+            head = HEADER.replace("Counts     = 3", f"Counts     = {self.counts}").encode("ascii")
+            return b"#6%06d" % len(head) + head
+        return super().query(command)
+
+
+def test_sync_fetches_only_new_samples(tmp_path):
+    full = GraphtecCapture(_capture_conn()).download(
+        "\\MEM\\LOG\\TEST.GBD", str(tmp_path / "full"), formats=("csv", "gbd")
+    )
+
+    conn = _capture_conn(GrowingConnection)
+    cap = GraphtecCapture(conn, chunk_samples=10)
+    conn.counts = 2
+    first = cap.sync("\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv", "gbd"))
+    assert first["new_samples"] == 2
+
+    conn.counts = 3
+    conn.sent_commands.clear()
+    out = cap.sync("\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv", "gbd"))
+
+    assert [c for c in conn.sent_commands if c.startswith(":TRANS:OUTP:DATA ")] == [
+        ":TRANS:OUTP:DATA 3,3"
+    ]
+    assert out["samples"] == 3 and out["new_samples"] == 1
+    for key in ("bin", "csv", "gbd"):
+        with open(out[key], "rb") as a, open(full[key], "rb") as b:
+            assert a.read() == b.read()
+
+
+TEN_ROWS = [(100 * i, 250 + i, i & 1) for i in range(10)]
+
+
+class TenRowConnection(RangeConnection):
+    """RangeConnection con 10 muestras que pierde el enlace en el bloque die_at."""
+
+    die_at = 0
+    blocks = 0
+
+    def query(self, command):
+        cmd = self._norm(command)
+        if cmd == ":TRANS:OUTP:HEAD?":
+            self.send(cmd)
+            head = HEADER.replace("Counts     = 3", "Counts     = 10").encode("ascii")
+            return b"#6%06d" % len(head) + head
+        if cmd == ":TRANS:OUTP:DATA?":
+            self.blocks += 1
+            if self.blocks == self.die_at:
+                raise OSError("enlace perdido")
+            self.send(cmd)
+            rng = [c for c in self.sent_commands if c.startswith(":TRANS:OUTP:DATA ")][-1]
+            first, last = (int(x) for x in rng.split()[-1].split(","))
+            data = b"".join(struct.pack(">3h", *r) for r in TEN_ROWS[first - 1:last])
+            return _trans_block(data)
+        return super().query(command)
+
+
+def test_mixed_formats_resume_with_different_chunk_size(tmp_path):
+    full = GraphtecCapture(_capture_conn(TenRowConnection), chunk_samples=10).download(
+        "\\MEM\\LOG\\TEST.GBD", str(tmp_path / "full"), formats=("csv",)
+    )
+
+    dying = _capture_conn(TenRowConnection)
+    dying.die_at = 6
+    with pytest.raises(OSError):
+        GraphtecCapture(dying, chunk_samples=1).download(
+            "\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv", "xlsx"), checkpoint=True
+        )
+
+    out = GraphtecCapture(_capture_conn(TenRowConnection), chunk_samples=2).download(
+        "\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv", "xlsx"), resume=True
+    )
+
+    with open(out["csv"], encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 11
+    assert sum(line.startswith("2024-01-01T00:00:03,") for line in lines) == 1
+    with open(out["csv"], "rb") as a, open(full["csv"], "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_writer_resumes_inside_a_chunk(tmp_path):
+    meta = GraphtecCapture._parse_header(HEADER.replace("Counts     = 3", "Counts     = 10"))
+    data = b"".join(struct.pack(">3h", *r) for r in TEN_ROWS)
+
+    first = CsvWriter(str(tmp_path / "a.csv"))
+    GraphtecCapture._run_writers({"csv": first}, meta, iter([(0, memoryview(data)[:3 * 6])]))
+    state = first.state()
+
+    resumed = CsvWriter(str(tmp_path / "a.csv"))
+    resumed.resume_from(state["samples"], state["offset"])
+    chunks = ((i, memoryview(data)[i * 6:(i + 2) * 6]) for i in range(0, 10, 2))
+    GraphtecCapture._run_writers({"csv": resumed}, meta, chunks)
+
+    with open(tmp_path / "a.csv", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [line[:19] for line in lines[1:]] == [f"2024-01-01T00:00:0{i}" for i in range(10)]
@@ -0,0 +1,158 @@
+import math
+import struct
+import threading
+
+import pytest
+
+from graphtec.io import decoder
+
+np = pytest.importorskip("numpy")
+
+
+ORDER = ["CH1", "CH2", "CH3", "CH4", "Logic", "Alarm"]
+AMP_4VT = {
+    "CH1": {"type": "VT", "input": "DC", "range": "5V"},
+    "CH2": {"type": "VT", "input": "DC", "range": "20MV"},
+    "CH3": {"type": "VT", "input": "TEMP", "range": "TCK"},
+    "CH4": {"type": "VT", "input": "DC", "range": "1-5V"},
+}
+SPANS = {ch: (-10000, 10000) for ch in ("CH1", "CH2", "CH3", "CH4")}
+
+
+def _pack(rows):
+    return b"".join(struct.pack(f">{len(r)}h", *r) for r in rows)
+
+
+def _same(a, b):
+    if a is None or b is None:
+        return a is b
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+
+ROWS = [
+    [1234, -500, 251, 0x7ffc, 3, 0],
+    [-32768, 32767, -0x7fff, 0x7ffd, 0, 1],
+    [0, 1, 2, 3, 7, 2],
+]
+
+
+@pytest.mark.parametrize("module", ["GS-4VT", "GS-TH", "GS-3AT", "GS-4TSR", "GS-DPA-AC"])
+def test_decode_data_region_matches_row_path(module):
+    data = _pack(ROWS)
+
+    table = decoder.decode_data_region(data, ORDER, len(ROWS), AMP_4VT, SPANS, module)
+    rows = list(decoder.iter_physical_rows(table, ORDER))
+
+    for raw_row, row in zip(ROWS, rows):
+        expected = decoder.convert_row_physical(module, ORDER, raw_row, AMP_4VT, SPANS)
+        assert all(_same(e, v) for e, v in zip(expected, row)), (expected, row)
+
+
+def test_decode_data_region_truncated_data():
+    data = _pack(ROWS)[:-3]
+    table = decoder.decode_data_region(data, ORDER, 10, AMP_4VT, SPANS, "GS-4VT")
+    assert table.shape == (2, len(ORDER))
+
+
+def test_conversion_plan_cached_by_fingerprint():
+    plan_a = decoder.get_conversion_plan(ORDER, AMP_4VT, SPANS, "GS-4VT")
+    amp_copy = {ch: dict(info) for ch, info in AMP_4VT.items()}
+    plan_b = decoder.get_conversion_plan(list(ORDER), amp_copy, dict(SPANS), "GS-4VT")
+    assert plan_a is plan_b
+
+    other = dict(amp_copy, CH1={"type": "VT", "input": "DC", "range": "10V"})
+    plan_c = decoder.get_conversion_plan(ORDER, other, SPANS, "GS-4VT")
+    assert plan_c.fingerprint != plan_a.fingerprint
+
+
+def test_conversion_plan_columns():
+    plan = decoder.build_conversion_plan(ORDER, AMP_4VT, SPANS, "GS-4VT")
+    kinds = [c.kind for c in plan.columns]
+    assert kinds == ["scale", "scale", "scale", "scale", "raw", "raw"]
+    assert plan.convert_row([2000, 0, 251, 0x7ffd, 5, 1]) == [0.5, 0.0, 25.1, None, 5, 1]
+
+
+def test_channel_lut_matches_plan():
+    plan = decoder.build_conversion_plan(ORDER, AMP_4VT, SPANS, "GS-TH")
+    codes = np.arange(-32768, 32768, dtype=np.int16)
+
+    for col in plan.columns[:4]:
+        values, flags = col.lut().gather(codes.astype(">i2"))
+        expected = [col.convert(int(c)) for c in codes]
+        got = [None if math.isnan(v) else v for v in values.tolist()]
+        assert got == expected
+
+        assert decoder.FLAG_NAMES[flags[0x7ffd + 32768]] == "Burnout"
+        assert decoder.FLAG_NAMES[flags[-0x7fff + 32768]] == "UnderFS"
+        assert flags[32768] == 0
+
+
+def test_channel_lut_cache_is_lru():
+    decoder.clear_lut_cache()
+    col = decoder.channel_conversion("GS-4VT", "DC", "5V")
+    assert col.lut() is decoder.channel_conversion("GS-4VT", "dc", "5v").lut()
+
+    for i in range(decoder._LUT_CACHE_SIZE):
+        decoder.channel_conversion("GS-TH", "TEMP", "", span=(0, i + 1)).lut()
+    assert col.lut_key not in decoder._LUT_CACHE
+
+
+def test_column_lookup_flags():
+    col = decoder.channel_conversion("GS-4VT", "DC_V", "20V")
+    assert col.lookup(2000) == (2.0, None)
+    assert col.lookup(0x7ffc) == (None, "OverFS")
+
+
+def _trans_block(data: bytes, status: int = 0) -> bytes:
+    checksum = sum(data) & 0xFFFF
+    return b"#6%06d" % len(data) + struct.pack(">H", status) + data + struct.pack(">H", checksum)
+
+
+def test_extract_trans_data_view_is_zero_copy():
+    data = bytes(range(256)) * 4
+    buf = bytearray(b"\r\n" + _trans_block(data))
+
+    view, status, checksum_ok = decoder.extract_trans_data_view(buf)
+
+    assert isinstance(view, memoryview)
+    assert view.obj is buf
+    assert bytes(view) == data
+    assert status == 0
+    assert checksum_ok is True
+    assert decoder.extract_trans_data_block(bytes(buf)) == (data, 0, True)
+
+
+def test_extract_trans_data_view_bad_checksum():
+    block = bytearray(_trans_block(b"\x01\x02\x03\x04"))
+    block[-1] ^= 0xFF
+    _, _, checksum_ok = decoder.extract_trans_data_view(block)
+    assert checksum_ok is False
+
+
+def test_extract_meas_payload_view():
+    block = memoryview(b"xx#6000004\x00\x01\x00\x02")
+    assert bytes(decoder.extract_meas_payload_view(block)) == b"\x00\x01\x00\x02"
+    assert decoder.extract_meas_payload(bytes(block)) == b"\x00\x01\x00\x02"
+
+
+def test_lut_cache_is_thread_safe():
+    n = decoder._LUT_CACHE_SIZE * 2
+    cols = [decoder.channel_conversion("GS-TH", "TEMP", "", span=(0, i + 1)) for i in range(n)]
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(200):
+                decoder.get_channel_lut(cols[(i + offset) % len(cols)])
+        except Exception as e:  # pragma: no cover - solo si hay carrera
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(decoder._LUT_CACHE) <= decoder._LUT_CACHE_SIZE
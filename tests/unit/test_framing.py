@@ -0,0 +1,97 @@
+import struct
+import threading
+import time
+
+import pytest
+import serial
+
+from graphtec.connection.framing import FramedReader
+from graphtec.connection.serial_connection import SerialConnection
+from graphtec.core.exceptions import DataError
+from graphtec.core.exceptions import TimeoutError as GraphtecTimeoutError
+
+
+class ChunkedSource:
+    """Transporte simulado que entrega los datos en trozos de tamaño fijo."""
+
+    def __init__(self, data: bytes, piece: int):
+        self.data = data
+        self.piece = piece
+        self.calls = 0
+
+    def readinto(self, view) -> int:
+        self.calls += 1
+        n = min(len(view), self.piece, len(self.data))
+        view[:n] = self.data[:n]
+        self.data = self.data[n:]
+        return n
+
+
+def _trans_block(data: bytes) -> bytes:
+    return b"#6%06d" % len(data) + b"\x00\x00" + data + struct.pack(">H", sum(data) & 0xFFFF)
+
+
+def test_reader_frames_mixed_replies_across_pieces():
+    payload = bytes(range(256)) * 4
+    stream = b"OK\r\n" + b"\x00\x00\x01" + b"junk" + _trans_block(payload) + b"#6000004ABCD"
+    reader = FramedReader(ChunkedSource(stream, piece=7).readinto, timeout=0.1)
+
+    assert reader.read_until(b"\r\n") == b"OK\r\n"
+    assert reader.read_exact(3) == b"\x00\x00\x01"
+    assert reader.read_block(extra=4) == _trans_block(payload)
+    buf = bytearray(4)
+    assert bytes(reader.read_block_into(buf, extra=0)) == b"#6000004ABCD"
+    assert reader.buffered == 0
+
+
+def test_reader_short_block_and_bad_header_raise():
+    reader = FramedReader(ChunkedSource(b"#6000010ABC", piece=64).readinto, timeout=0.01)
+    with pytest.raises(GraphtecTimeoutError):
+        reader.read_block()
+
+    reader = FramedReader(ChunkedSource(b"#X000010", piece=64).readinto, timeout=0.01)
+    with pytest.raises(DataError):
+        reader.read_block()
+
+
+def test_serial_reads_blocks_through_reader():
+    conn = SerialConnection(timeout=2)
+    conn._connection = serial.serial_for_url("loop://", timeout=0.05)
+    payload = bytes(range(250)) * 80  # 20 kB
+    # loop:// tiene una cola de 4 kB: se escribe desde otro hilo mientras se lee
+    writer = threading.Thread(target=conn._connection.write, args=(_trans_block(payload),), daemon=True)
+    writer.start()
+
+    block = conn.read_binary_trans_data_into(bytearray(16))
+    writer.join(2)
+    assert bytes(block) == _trans_block(payload)
+
+    conn.reader.timeout = 0.05
+    conn._connection.write(b"#6000010ABC")
+    with pytest.raises(GraphtecTimeoutError):
+        conn.read_binary()
+
+
+class TricklingSource:
+    """Transporte que nunca se queda callado: 1 byte por lectura."""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def readinto(self, view) -> int:
+        time.sleep(0.001)
+        view[:1] = b"0"
+        return 1
+
+
+def test_reader_deadline_fires_while_data_keeps_arriving():
+    src = TricklingSource()
+    reader = FramedReader(src.readinto, timeout=0.05, settimeout=src.timeouts.append)
+    reader._buf[:8] = b"#6999999"
+    reader._end = 8
+    t0 = time.monotonic()
+    with pytest.raises(GraphtecTimeoutError):
+        reader.read_block()
+    assert time.monotonic() - t0 < 0.5
+    assert reader.buffered == 0
+    assert src.timeouts and max(src.timeouts) <= 0.05
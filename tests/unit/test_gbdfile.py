@@ -0,0 +1,61 @@
+import struct
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from graphtec.io.capture import GraphtecCapture
+from graphtec.io.decoder import convert_row_physical
+from graphtec.io.gbdfile import GBDFile
+from graphtec.sim import SimFile, write_gbd
+
+
+@pytest.fixture
+def gbd_path(tmp_path):
+    path = str(tmp_path / "REC.GBD")
+    write_gbd(path, module="TH", counts=5000, special_every=7, chunk_samples=1000)
+    return path
+
+
+def test_gbdfile_views_and_slices_match_reference(gbd_path):
+    sim = SimFile.for_module("TH", counts=5000, special_every=7)
+    ref = sim.rows(0, 5000)
+
+    with GBDFile(gbd_path) as f:
+        meta = f.meta
+        assert (len(f), f.order, f.header_siz) == (5000, sim.order, 2048)
+        assert f.raw.shape == (5000, len(sim.order))
+        assert not f.raw.flags.owndata and not f.raw.flags.writeable
+        assert f.raw.tobytes() == ref
+
+        n_cols = len(sim.order)
+        row = struct.unpack_from(f">{n_cols}h", ref, 1234 * n_cols * 2)
+        expected = convert_row_physical(meta["module"], meta["order"], row, meta["amp_info"], meta["spans"])
+        assert f[1234] == expected
+        assert f[-1] == f[4999]
+        assert f[1230:1240].rows()[4] == expected
+
+        table = f[100:200].physical()
+        assert table.shape == (100, n_cols)
+        assert np.isnan(table[4, 0])  # muestra 104: código especial
+        np.testing.assert_array_equal(f[100:200].column("CH2"), table[:, 1])
+
+        with pytest.raises(IndexError):
+            f[5000]
+
+
+def test_gbdfile_time_slicing(gbd_path):
+    with GBDFile(gbd_path) as f:
+        start = f.start_dt
+        assert start == datetime(2024, 1, 1)
+        sl = f[start + timedelta(seconds=10):start + timedelta(seconds=20, milliseconds=500)]
+        assert (sl.start, sl.stop) == (10, 21)
+        assert sl.timestamps()[0] == start + timedelta(seconds=10)
+        assert f.between(start - timedelta(hours=1), None).start == 0
+        assert f.between(start + timedelta(days=1)).start == 5000
+
+
+def test_export_local_from_gbd(gbd_path, tmp_path):
+    out = GraphtecCapture(None, chunk_samples=700).export_local(gbd_path, formats=("csv",))
+    with open(out["csv"], "r", encoding="utf-8") as fh:
+        assert sum(1 for _ in fh) == 5001
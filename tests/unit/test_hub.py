@@ -0,0 +1,182 @@
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from graphtec.core.exceptions import ConnectionError as GraphtecConnectionError
+from graphtec.io.hub import DeviceHub
+from graphtec.io.protocol import channels_steps
+
+
+HEADER = (
+    "$Header\r\n"
+    "HeaderSiz  = 2048\r\n"
+    "$$Data\r\n"
+    "Order      = CH1, CH2, Logic\r\n"
+    "Counts     = 3\r\n"
+    "Sample     = 1s\r\n"
+    "Start      = 2024-01-01, 00:00:00\r\n"
+    "$Amp\r\n"
+    "CH1        = VT   , DC   ,       5V, Off   ,    Off,      +0\r\n"
+    "CH2        = VT   , TEMP ,      TCK, Off   ,    Off,      +0\r\n"
+    "UnitOrder  = 4VT\r\n"
+    "$EndHeader\r\n"
+)
+DATA = b"".join(struct.pack(">3h", *r) for r in [(2000, 251, 1), (-2000, 0x7ffd, 0), (0, -100, 3)])
+CHANNELS = {1: ("VT", "DC_V", "5V"), 2: ("VT", "TC-K", "TCK"), 3: ("VT", "OFF", "NONE"), 4: ("VT", "OFF", "NONE")}
+
+
+def _block(data: bytes) -> bytes:
+    return b"#6%06d" % len(data) + data
+
+
+def _reply(cmd: str, state: dict):
+    """Respuestas del GL100 simulado (None = comando sin respuesta)."""
+    if cmd.startswith(":AMP:CH"):
+        ch = int(cmd[7])
+        field = {"TYP?": 0, "INP?": 1, "RANG?": 2}[cmd.split(":")[-1]]
+        return f"{cmd[:-1]} {CHANNELS[ch][field]}\r\n".encode()
+    if cmd == ":MEAS:OUTP:ONE?":
+        return _block(struct.pack(">4h", 2000, 251, 0, 0))
+    if cmd == ":TRANS:OPEN?":
+        return b"\x00\x00\x00"
+    if cmd == ":TRANS:OUTP:HEAD?":
+        return _block(HEADER.encode("ascii"))
+    if cmd.startswith(":TRANS:OUTP:DATA "):
+        state["range"] = [int(x) for x in cmd.split()[-1].split(",")]
+        return None
+    if cmd == ":TRANS:OUTP:DATA?":
+        first, last = state["range"]
+        data = DATA[(first - 1) * 6:last * 6]
+        return b"#6%06d" % len(data) + b"\x00\x00" + data + struct.pack(">H", sum(data) & 0xFFFF)
+    if cmd == ":TRANS:CLOSE?":
+        return b"OK\r\n"
+    return None
+
+
+def _fake_device():
+    """Par de sockets: el del hub y un hilo que responde como un GL100 (por bytes sueltos)."""
+    hub_side, dev_side = socket.socketpair()
+
+    def serve():
+        state, buf = {}, b""
+        with dev_side:
+            while True:
+                data = dev_side.recv(4096)
+                if not data:
+                    return
+                buf += data
+                while b"\r\n" in buf:
+                    line, buf = buf.split(b"\r\n", 1)
+                    resp = _reply(line.decode(), state)
+                    for i in range(0, len(resp or b""), 5):
+                        dev_side.sendall(resp[i:i + 5])  # respuestas fragmentadas
+
+    threading.Thread(target=serve, daemon=True).start()
+    return hub_side
+
+
+def _wait_for(cond, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < end, "timeout"
+        time.sleep(0.01)
+
+
+def test_hub_polls_many_devices_and_downloads(tmp_path):
+    socks = [_fake_device() for _ in range(4)]
+    with DeviceHub(chunk_samples=2) as hub:
+        jobs = [hub.add(f"gl{i}", s) for i, s in enumerate(socks)]
+        for job in jobs:
+            assert job.wait(5)[2] == {"type": "VT", "input": "TC-K", "range": "TCK"}
+        for i in range(4):
+            hub.poll(f"gl{i}", 0.02)
+
+        out = hub.download("gl0", "\\MEM\\LOG\\TEST.GBD", str(tmp_path), formats=("csv",)).wait(5)
+        _wait_for(lambda: all(d["samples"] >= 5 for d in hub.stats()["devices"].values()))
+
+    assert out["samples"] == 3
+    with open(out["bin"], "rb") as f:
+        assert f.read() == DATA
+    with open(out["csv"], encoding="utf-8") as f:
+        assert f.read().splitlines()[1] == "2024-01-01T00:00:00,0.5,25.1,1"
+
+    samples = []
+    while not hub.samples.empty():
+        samples.append(hub.samples.get())
+    assert {s.device_id for s in samples} == {"gl0", "gl1", "gl2", "gl3"}
+    assert all(s.values == {"CH1_V": 0.5, "CH2_Temp_TC-K": 25.1} for s in samples)
+    for s in socks:
+        s.close()
+
+
+def test_hub_fails_jobs_of_disconnected_device():
+    hub_side, dev_side = socket.socketpair()
+    hub = DeviceHub()
+    job = hub.add("gl0", hub_side)
+    dev_side.close()
+    for _ in range(10):
+        hub.run_once(0.05)
+        if job.done():
+            break
+    with pytest.raises(GraphtecConnectionError):
+        job.wait(0)
+    assert "gl0" not in hub.stats()["devices"]
+    hub.close()
+    hub_side.close()
+
+
+def test_hub_restores_socket_mode_on_remove():
+    hub_side, dev_side = socket.socketpair()
+    hub_side.settimeout(1.5)
+    hub = DeviceHub()
+    hub.add("gl0", hub_side, channels={1: {"type": "VT", "input": "DC", "range": "5V"}})
+    hub.run_once(0)
+    assert hub_side.gettimeout() == 0.0
+
+    hub.remove("gl0")
+    hub.run_once(0)
+    assert hub_side.gettimeout() == 1.5
+    hub.close()
+    hub_side.close()
+    dev_side.close()
+
+
+def test_hub_rejects_duplicate_and_unknown_devices_in_caller():
+    first, peer1 = socket.socketpair()
+    second, peer2 = socket.socketpair()
+    hub = DeviceHub()
+    hub.add("gl0", first, channels={1: {"type": "VT", "input": "DC", "range": "5V"}})
+    with pytest.raises(ValueError):
+        hub.add("gl0", second)
+    assert second.gettimeout() is None
+
+    with pytest.raises(KeyError):
+        hub.submit("glX", channels_steps())
+    with pytest.raises(KeyError):
+        hub.poll("glX", 1.0)
+
+    hub.poll("gl0", None)  # aún pendiente de registro: se acepta
+    hub.run_once(0)
+    assert "gl0" in hub.stats()["devices"]
+    hub.close()
+    for s in (first, peer1, second, peer2):
+        s.close()
+
+
+def test_hub_fails_job_of_device_removed_before_enqueue():
+    hub_side, dev_side = socket.socketpair()
+    hub = DeviceHub()
+    hub.add("gl0", hub_side, channels={1: {"type": "VT", "input": "DC", "range": "5V"}})
+    hub.run_once(0)
+    hub.remove("gl0")
+    job = hub.submit("gl0", channels_steps())
+    hub.run_once(0)
+    with pytest.raises(KeyError):
+        job.wait(0)
+    assert hub_side.gettimeout() is None
+    hub.close()
+    hub_side.close()
+    dev_side.close()
@@ -0,0 +1,41 @@
+from graphtec.connection.pacing import PacingPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, dt):
+        self.sleeps.append(round(dt, 6))
+        self.t += dt
+
+
+def test_pacing_waits_only_the_remaining_setter_gap():
+    clock = FakeClock()
+    pacing = PacingPolicy(setter_gap=0.05, gaps={":MEAS:START": 0.5}, clock=clock, sleep=clock.sleep)
+
+    for cmd, elapsed in [(":AMP:CH1:INP DC", 0.0), (":AMP:CH1:RANG 5V", 0.02), (":AMP:CH1:RANG?", 0.0)]:
+        pacing.before_send()
+        pacing.after_send(cmd)
+        clock.t += elapsed
+    # La consulta no impone separación: el siguiente comando sale ya
+    pacing.before_send()
+    pacing.after_send(":MEAS:START")
+    pacing.before_send()
+
+    assert clock.sleeps == [0.05, 0.03, 0.5]
+    assert pacing.stats()["commands"] == 4
+
+
+def test_pacing_command_classes():
+    pacing = PacingPolicy(setter_gap=0.01, gaps={":TRANS:": 0.0, ":TRANS:SOUR": 0.2})
+    assert pacing.gap_for(":AMP:CH1:TYP?") == 0.0
+    assert pacing.gap_for(b":AMP:CH1:RANG 5V\r\n") == 0.01
+    assert pacing.gap_for(':FILE:CD "\\MEM\\LOG\\"') == 0.01
+    assert pacing.gap_for(":trans:sour DISK,\"A.GBD\"") == 0.2
+    assert pacing.gap_for(":TRANS:OUTP:DATA 1,10") == 0.0
+    assert PacingPolicy.fixed(0.1).gap_for("*IDN?") == 0.1
@@ -0,0 +1,152 @@
+import time
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from graphtec.io.realtime import GraphtecRealtime
+from graphtec.io.stream import RealtimeStream
+
+
+class FakeAmp:
+    def __init__(self, channels):
+        self.channels = channels
+        self.config_version = 1
+
+    def get_channels(self):
+        return self.channels
+
+
+def _device(channels, payload: bytes):
+    frame = b"#6%06d" % len(payload) + payload
+    measure = SimpleNamespace(read_one_measurement=lambda: frame)
+    return SimpleNamespace(amp=FakeAmp(channels), measure=measure)
+
+
+VT_CHANNELS = {
+    1: {"type": "VT", "input": "DC_V", "range": "5V"},
+    2: {"type": "VT", "input": "TC-K", "range": "TCK"},
+    3: {"type": "VT", "input": "OFF", "range": "NONE"},
+    4: {"type": "VT", "input": "DC_V", "range": "20MV"},
+}
+TH_CHANNELS = {ch: {"type": "TH", "input": "", "range": ""} for ch in range(1, 5)}
+
+
+def test_realtime_compiled_layout_matches_interpreted():
+    payload = struct.pack(">4h", 2000, 251, 0, 0x7ffc)
+    rt = GraphtecRealtime(_device(VT_CHANNELS, payload))
+
+    parsed = rt.read()
+    assert parsed == rt.decode_interpreted(payload, VT_CHANNELS)
+    assert parsed["CH1_V"] == 0.5
+    assert parsed["CH2_Temp_TC-K"] == 25.1
+    assert parsed["CH4_V_Flag"] == "OverFS"
+
+
+def test_realtime_th_frame_with_and_without_trailer():
+    body = struct.pack(">h5H", 0, 215, 9000, 1050, 1, 2)
+    for payload in (body, body + struct.pack(">3H", 1, 0, 7)):
+        rt = GraphtecRealtime(_device(TH_CHANNELS, payload))
+        parsed = rt.read()
+        assert parsed == rt.decode_interpreted(payload, TH_CHANNELS)
+        assert parsed["CH1_Humidity_%"] == 45.0
+    assert parsed["CH1_Status"] == 7
+
+
+def test_realtime_layout_recompiled_on_config_change():
+    payload = struct.pack(">4h", 2000, 251, 0, 0)
+    device = _device(dict(VT_CHANNELS), payload)
+    rt = GraphtecRealtime(device)
+
+    first = rt.layout()
+    assert rt.layout() is first
+
+    device.amp.channels[1] = {"type": "VT", "input": "DC_V", "range": "10V"}
+    device.amp.config_version += 1
+    assert rt.layout() is not first
+    assert rt.read()["CH1_V"] == 1.0
+
+
+def test_realtime_layout_keys_explicit_channels_by_signature():
+    payload = struct.pack(">4h", 2000, 251, 0, 0)
+    device = _device(dict(VT_CHANNELS), payload)
+    rt = GraphtecRealtime(device)
+
+    first = rt.layout()
+    other = {**VT_CHANNELS, 1: {"type": "VT", "input": "DC_V", "range": "10V"}}
+    assert rt.layout(other) is not first
+    assert rt.decode_payload(payload, other)["CH1_V"] == 1.0
+    assert rt.decode_payload(payload)["CH1_V"] == 0.5
+
+
+def test_realtime_truncated_frame_falls_back():
+    payload = struct.pack(">h", 2000)
+    rt = GraphtecRealtime(_device(VT_CHANNELS, payload))
+    assert rt.read() == {"CH1_V": 0.5}
+
+
+# ------------------------------------------------------------
+# RealtimeStream
+# ------------------------------------------------------------
+RAW_CHANNELS = {ch: {"type": "XX", "input": "", "range": ""} for ch in range(1, 5)}
+
+
+def _counting_device(limit=None):
+    """Cada trama lleva el número de muestra en los cuatro canales."""
+    state = {"n": 0}
+
+    def read_one():
+        if limit is not None and state["n"] >= limit:
+            time.sleep(0.01)
+            return b""
+        state["n"] += 1
+        payload = struct.pack(">4h", *([state["n"]] * 4))
+        return b"#6%06d" % len(payload) + payload
+
+    measure = SimpleNamespace(read_one_measurement=read_one)
+    return SimpleNamespace(amp=FakeAmp(RAW_CHANNELS), measure=measure)
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_stream_ring_buffer_wraps_and_drain_counts_dropped():
+    np = pytest.importorskip("numpy")
+    stream = RealtimeStream(GraphtecRealtime(_counting_device(limit=12)), capacity=5)
+    with stream:
+        _wait_for(lambda: stream.count >= 12)
+    assert stream.columns == ["CH1_raw", "CH2_raw", "CH3_raw", "CH4_raw"]
+
+    ts, values = stream.drain()
+    assert values[:, 0].tolist() == [8, 9, 10, 11, 12]
+    assert np.all(np.diff(ts) >= 0)
+    assert stream.dropped == 7
+    assert stream.drain()[1].shape == (0, 4)
+
+    t, last = stream.latest()
+    assert t == ts[-1] and last.tolist() == [12] * 4
+    assert stream.window(3600)[1].shape == (5, 4)
+    assert stream.window(-1)[1].shape == (0, 4)
+
+
+def test_stream_keeps_running_after_read_errors():
+    pytest.importorskip("numpy")
+    device = _counting_device(limit=3)
+    ok = device.measure.read_one_measurement
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise TimeoutError("sin respuesta")
+        return ok()
+
+    device.measure.read_one_measurement = flaky
+    with RealtimeStream(GraphtecRealtime(device), capacity=100, error_backoff=0.0) as stream:
+        _wait_for(lambda: stream.count >= 3)
+    assert stream.errors == 1
+    assert stream.drain()[1][:, 0].tolist() == [1, 2, 3]
@@ -0,0 +1,55 @@
+from graphtec.io.scheduler import FixedRateScheduler
+
+
+class FakeClock:
+    """Reloj simulado: sleep() y las consultas avanzan el tiempo."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock, interval=1.0):
+    return FixedRateScheduler(interval, clock=clock, wall=lambda: 1000.0 + clock.now, sleep=clock.sleep)
+
+
+def test_scheduler_deadlines_do_not_drift_with_latency():
+    clock = FakeClock()
+    sched = _scheduler(clock)
+
+    def query():
+        clock.now += 0.2  # latencia fija del enlace
+        return "ok"
+
+    samples = list(sched.run(query, count=50))
+    stamps = [ts for ts, _ in samples]
+
+    # El punto medio de cada consulta cae sobre su plazo (salvo la primera)
+    assert stamps[-1] - 1000.0 == 100.0 + 49 * 1.0
+    assert abs(stamps[1] - stamps[0] - 1.0) < 0.2
+    assert all(abs(b - a - 1.0) < 1e-9 for a, b in zip(stamps[1:], stamps[2:]))
+    assert sched.stats()["missed"] == 0
+    assert abs(sched.stats()["latency_s"] - 0.2) < 1e-9
+
+
+def test_scheduler_skips_and_counts_missed_slots():
+    clock = FakeClock()
+    sched = _scheduler(clock, interval=0.5)
+    delays = iter([0.01, 1.7, 0.01, 0.01])
+
+    def query():
+        clock.now += next(delays)
+
+    list(sched.run(query, count=4))
+    stats = sched.stats()
+    assert stats["missed"] == 2  # huecos 2 y 3; el 4 se lanza tarde pero dentro de plazo
+    assert sched.slot == 6
+    assert abs(stats["latency_max_s"] - 1.7) < 1e-9
+    assert stats["jitter_max_s"] > 0.5
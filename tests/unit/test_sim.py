@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from graphtec.connection.pacing import PacingPolicy
+from graphtec.connection.serial_connection import SerialConnection
+from graphtec.connection.wlan_connection import WLANConnection
+from graphtec.io.capture import GraphtecCapture
+from graphtec.io.layout import compile_frame_layout
+from graphtec.sim import Fault, GL100Simulator, SimConnection, SimFile, SimPty, SimTCPServer, write_gbd
+
+
+PATH = "\\MEM\\LOG\\SIM.GBD"
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _connect(sim, **kw) -> SimConnection:
+    conn = SimConnection(sim, pacing=PacingPolicy(setter_gap=0), **kw)
+    conn.open()
+    return conn
+
+
+def test_sim_download_with_faults_matches_file(tmp_path):
+    f = SimFile(counts=3000, special_every=7)
+    sim = GL100Simulator(files={PATH: f})
+    faults = [Fault("corrupt", skip=1), Fault("drop", skip=2), Fault("noise", skip=3)]
+    conn = _connect(sim, faults=faults, timeout=0.2)
+    cap = GraphtecCapture(conn, chunk_samples=500)
+
+    assert cap.list_files() == ["SIM.GBD"]
+    out = cap.download(PATH, str(tmp_path), formats=())
+
+    assert out["samples"] == 3000
+    assert cap.last_stats["retries"] == 2
+    assert conn.link.stats()["faults"] == 3
+    with open(out["bin"], "rb") as fh:
+        assert fh.read() == f.rows(0, 3000)
+
+
+def test_sim_growing_file_sync(tmp_path):
+    clock = FakeClock()
+    sim = GL100Simulator(files={PATH: SimFile(counts=100, growth=10.0, clock=clock)})
+    cap = GraphtecCapture(_connect(sim), chunk_samples=64)
+
+    assert cap.sync(PATH, str(tmp_path))["samples"] == 100
+    clock.t = 5.0
+    out = cap.sync(PATH, str(tmp_path))
+    assert (out["samples"], out["new_samples"]) == (150, 50)
+
+
+def test_sim_tcp_endpoint_serves_getters_and_frames():
+    sim = GL100Simulator()
+    with SimTCPServer(sim, latency=0.001) as server:
+        conn = WLANConnection(*server.address, timeout=2)
+        conn.open()
+        try:
+            assert conn.query(":AMP:CH2:INP?") == b":AMP:CH2:INP TC-K\r\n"
+            conn.send(":AMP:CH4:INP DC_V")
+            assert conn.query(":AMP:CH4:INP?") == b":AMP:CH4:INP DC_V\r\n"
+            frame = conn.query(":MEAS:OUTP:ONE?")
+            assert conn.query(":STAT:ERR?") == b":STAT:ERR NONE\r\n"
+        finally:
+            conn.close()
+
+    assert len(frame) == 8 + compile_frame_layout(sim.channels).full.size
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="requiere pty POSIX")
+def test_sim_pty_endpoint(tmp_path):
+    sim = GL100Simulator(files={PATH: SimFile(counts=200)})
+    with SimPty(sim, baudrate=1_000_000) as pty:
+        conn = SerialConnection(port=pty.port, timeout=2, pacing=PacingPolicy(setter_gap=0))
+        conn.open()
+        try:
+            out = GraphtecCapture(conn, chunk_samples=100).download(PATH, str(tmp_path), formats=())
+        finally:
+            conn.close()
+    assert out["samples"] == 200
+
+
+@pytest.mark.parametrize("module", ["4VT", "TH", "LXUV", "DPA-AC"])
+def test_write_gbd_matches_build_gbd_file(tmp_path, module):
+    path = str(tmp_path / "SIM.GBD")
+    info = write_gbd(path, module=module, counts=1000, special_every=7, chunk_samples=300)
+
+    f = SimFile.for_module(module, counts=1000, special_every=7)
+    cap = GraphtecCapture(None)
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    assert raw == cap._build_gbd_file(f.header(), f.rows(0, 1000), f.header_siz)
+    assert info == {"counts": 1000, "header_siz": 2048, "bytes": len(raw)}
+
+    meta = cap._parse_header(raw[:info["header_siz"]].decode("ascii"))
+    assert (meta["module"], meta["counts"], meta["header_siz"]) == ("GS-" + module, 1000, 2048)
+    assert meta["order"] == f.order
+    assert set(meta["amp_info"]) == set(f.amp)
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_retry_discards_late_remainder_of_truncated_block(tmp_path, pipeline):
+    f = SimFile(counts=600)
+    sim = GL100Simulator(files={PATH: f})
+    late = Fault("late", keep=0.3, delay=0.3)
+    conn = _connect(sim, faults=[late], timeout=0.15)
+    cap = GraphtecCapture(conn, chunk_samples=300, pipeline=pipeline)
+
+    # Lo que llega tarde incluye '#' (0x23): no debe tomarse como inicio de bloque
+    block_data = f.rows(0, 300)
+    assert b"#" in block_data[int((len(block_data) + 12) * 0.3):]
+
+    out = cap.download(PATH, str(tmp_path), formats=())
+    assert out["samples"] == 600
+    with open(out["bin"], "rb") as fh:
+        assert fh.read() == f.rows(0, 600)
@@ -0,0 +1,71 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from graphtec.connection.pacing import PacingPolicy
+from graphtec.connection.trace import RECEIVED, SENT, RecordingConnection, ReplayConnection, load_trace
+from graphtec.core.exceptions import CommandError
+from graphtec.io.capture import GraphtecCapture
+from graphtec.io.realtime import ChannelSnapshot, GraphtecRealtime
+from graphtec.sim import Fault, GL100Simulator, SimConnection, SimFile
+from tests.mocks.mock_connection import MockConnection
+
+
+PATH = "\\MEM\\LOG\\REC.GBD"
+
+
+def _realtime(conn, channels):
+    measure = SimpleNamespace(read_one_measurement=lambda: conn.query(":MEAS:OUTP:ONE?"))
+    return GraphtecRealtime(SimpleNamespace(connection=conn, amp=ChannelSnapshot(channels), measure=measure))
+
+
+def test_record_and_replay_download_and_realtime(tmp_path):
+    sim = GL100Simulator(files={PATH: SimFile(counts=2000, special_every=11)})
+    conn = SimConnection(sim, latency=0.01, faults=[Fault("late", delay=0.02)], pacing=PacingPolicy(setter_gap=0))
+    conn.open()
+    trace = str(tmp_path / "rec.gltrace")
+
+    with RecordingConnection(conn, trace) as rec:
+        t0 = time.monotonic()
+        out = GraphtecCapture(rec, chunk_samples=500).download(PATH, str(tmp_path / "live"), formats=("csv",))
+        live_s = time.monotonic() - t0
+        live_rt = [_realtime(rec, sim.channels).read() for _ in range(3)]
+
+    meta, records = load_trace(trace)
+    assert meta["transport"] == "SimConnection"
+    assert records[0].kind == SENT and records[0].data == b':TRANS:SOUR DISK,"\\MEM\\LOG\\REC.GBD"\r\n'
+    # El bloque que llegó tarde quedó grabado en dos trozos
+    assert sum(r.kind == RECEIVED for r in records) > sum(r.kind == SENT and r.data.endswith(b"?\r\n") for r in records)
+
+    for speed in (0.0, 1.0):
+        replay = ReplayConnection(trace, speed=speed, strict=True)
+        replay.open()
+        t0 = time.monotonic()
+        again = GraphtecCapture(replay, chunk_samples=500).download(
+            PATH, str(tmp_path / f"replay{speed}"), formats=("csv",)
+        )
+        elapsed = time.monotonic() - t0
+        assert [_realtime(replay, sim.channels).read() for _ in range(3)] == live_rt
+        for key in ("bin", "csv"):
+            with open(out[key], "rb") as a, open(again[key], "rb") as b:
+                assert a.read() == b.read()
+        assert replay.stats()["mismatches"] == 0
+        if speed:
+            assert elapsed >= live_s * 0.5
+        else:
+            assert elapsed < live_s
+
+
+def test_record_plain_connection_and_strict_replay(tmp_path):
+    mock = MockConnection(responses={"*IDN?": b"GRAPHTEC,GL100\r\n"})
+    mock.open()
+    trace = str(tmp_path / "idn.gltrace")
+    with RecordingConnection(mock, trace) as rec:
+        assert rec.query("*IDN?") == b"GRAPHTEC,GL100\r\n"
+
+    replay = ReplayConnection(trace, strict=True)
+    replay.open()
+    assert replay.query("*IDN?") == b"GRAPHTEC,GL100\r\n"
+    with pytest.raises(CommandError):
+        replay.send(":MEAS:START")
@@ -0,0 +1,79 @@
+import socket
+import struct
+import threading
+
+from graphtec.connection.wlan_connection import WLANConnection
+from graphtec.io.capture import GraphtecCapture
+
+
+HEADER = (
+    "$Header\r\n"
+    "HeaderSiz  = 2048\r\n"
+    "$$Data\r\n"
+    "Order      = CH1, CH2, Logic\r\n"
+    "Counts     = 3000\r\n"
+    "Sample     = 1s\r\n"
+    "Start      = 2024-01-01, 00:00:00\r\n"
+    "$Amp\r\n"
+    "CH1        = VT   , DC   ,       5V, Off   ,    Off,      +0\r\n"
+    "CH2        = VT   , TEMP ,      TCK, Off   ,    Off,      +0\r\n"
+    "UnitOrder  = 4VT\r\n"
+    "$EndHeader\r\n"
+)
+DATA = b"".join(struct.pack(">3h", i % 2000, 251, i & 0x23) for i in range(3000))
+
+
+def _reply(cmd: str, state: dict):
+    if cmd == "*IDN?":
+        return b"GRAPHTEC,GL100,0,1.00\r\n"
+    if cmd == ":TRANS:OPEN?":
+        return b"\x00\x00\x00"
+    if cmd == ":TRANS:OUTP:HEAD?":
+        head = HEADER.encode("ascii")
+        return b"#6%06d" % len(head) + head
+    if cmd.startswith(":TRANS:OUTP:DATA "):
+        state["range"] = [int(x) for x in cmd.split()[-1].split(",")]
+        return None
+    if cmd == ":TRANS:OUTP:DATA?":
+        first, last = state["range"]
+        data = DATA[(first - 1) * 6:last * 6]
+        return b"#6%06d" % len(data) + b"\x00\x00" + data + struct.pack(">H", sum(data) & 0xFFFF)
+    if cmd == ":TRANS:CLOSE?":
+        return b"OK\r\n"
+    return None
+
+
+def _serve(server: socket.socket) -> None:
+    conn, _ = server.accept()
+    state, buf = {}, b""
+    with conn:
+        while True:
+            data = conn.recv(4096)
+            if not data:
+                return
+            buf += data
+            while b"\r\n" in buf:
+                line, buf = buf.split(b"\r\n", 1)
+                resp = _reply(line.decode(), state)
+                # Varios segmentos TCP por respuesta
+                for i in range(0, len(resp or b""), 1000):
+                    conn.sendall(resp[i:i + 1000])
+
+
+def test_wlan_downloads_multi_segment_blocks(tmp_path):
+    server = socket.create_server(("127.0.0.1", 0))
+    threading.Thread(target=_serve, args=(server,), daemon=True).start()
+
+    conn = WLANConnection("127.0.0.1", server.getsockname()[1], timeout=2)
+    conn.open()
+    try:
+        assert conn.query("*IDN?") == b"GRAPHTEC,GL100,0,1.00\r\n"
+        out = GraphtecCapture(conn, chunk_samples=1000).download("\\MEM\\LOG\\A.GBD", str(tmp_path), formats=())
+        assert conn.reader.stats()["reads"] < 100
+    finally:
+        conn.close()
+        server.close()
+
+    assert out["samples"] == 3000
+    with open(out["bin"], "rb") as f:
+        assert f.read() == DATA